@@ -1,4 +1,52 @@
-from .client import RadioBrowser
+from importlib import import_module
+
 from .errors import *
 
 __version__ = "0.2.6"
+
+# The submodules are imported on first use, so `import aioradios` does not pay
+# for aiohttp, sqlite3 and the other dependencies of the parts not used.
+_EXPORTS = {
+    'RadioBrowser': 'client',
+    'ResponseCache': 'cache',
+    'MirrorPool': 'mirrors',
+    'Station': 'station',
+    'StationIndex': 'index',
+    'FuzzyIndex': 'fuzzy',
+    'StationSnapshot': 'snapshot',
+    'write_snapshot': 'snapshot',
+    'StreamProber': 'prober',
+    'ProbeResult': 'prober',
+    'StationColumns': 'columns',
+    'ChangeFeed': 'changes',
+    'apply_change': 'changes',
+    'Crawler': 'crawler',
+    'facet_queries': 'crawler',
+    'catalog_queries': 'crawler',
+    'TransportConfig': 'transport',
+    'close_shared_connectors': 'transport',
+    'Scheduler': 'scheduler',
+    'INTERACTIVE': 'scheduler',
+    'NORMAL': 'scheduler',
+    'BACKGROUND': 'scheduler',
+    'RetryPolicy': 'retry',
+    'Metrics': 'metrics',
+    'DecodePool': 'offload',
+    'AdaptiveTimeouts': 'timeouts',
+    'LatencyTracker': 'latency',
+}
+
+__all__ = list(_EXPORTS) + ['Error', 'noHostFound', 'UnsupportedFormat', 'NotInitialized', 'RequiredMissing']
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -21,47 +21,132 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-import aiohttp
 import asyncio
+import json
+import time
 from random import choice
-from aiodns import DNSResolver
-from typing import List
+from typing import List, Optional
 import socket
 
 from .errors import noHostFound
+from .files import _atomic_write
 
-async def get_radiobrowser_base_urls() -> List[str]:
+# How long a discovered mirror list stays valid, in seconds.
+CACHE_TTL = 3600
+# How long a single reverse lookup may take before the ip is skipped.
+LOOKUP_TIMEOUT = 2.0
+
+_cache = {'urls': None, 'timestamp': 0.0, 'discovery': None}
+
+
+async def _lookup_ips(loop) -> List[str]:
+    ips = await loop.getaddrinfo('all.api.radio-browser.info',
+                             80, family=0, type=0, proto=socket.IPPROTO_TCP)
+
+    return [ip_tupple[4][0] for ip_tupple in ips]
+
+async def _reverse_lookup(resolver, ip: str, timeout: float) -> Optional[str]:
+    from aiodns.error import DNSError
+
+    try:
+        host_addr = await asyncio.wait_for(resolver.gethostbyaddr(ip), timeout)
+    except (asyncio.TimeoutError, DNSError):
+        return None
+
+    return host_addr.name
+
+def _read_cache_file(path: str, ttl: float):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None, 0.0
+
+    if not isinstance(data, dict) or time.time() - data.get('timestamp', 0) >= ttl:
+        return None, 0.0
+
+    return data.get('urls') or None, data['timestamp']
+
+def _write_cache_file(path: str, urls: List[str], timestamp: float):
+    try:
+        with _atomic_write(path) as tmp, open(tmp, 'w') as f:
+            json.dump({'timestamp': timestamp, 'urls': urls}, f)
+    except OSError:
+        pass
+
+def clear_cache():
     """
-    Get all base urls of all currently available radiobrowser servers
+    Forget the mirror list cached in memory.
+    """
+    _cache['urls'] = None
+    _cache['timestamp'] = 0.0
+    _cache['discovery'] = None
+
+async def discover_radiobrowser_base_urls(resolver=None, lookup_timeout: float = LOOKUP_TIMEOUT) -> List[str]:
+    """
+    Discover the base urls of all radiobrowser servers, bypassing every cache.
+
+    The reverse lookups run concurrently, an ip whose lookup fails or takes
+    longer than `lookup_timeout` seconds is skipped.
 
     Returns: 
     List[str]: a list of string URLS
     """
     loop = asyncio.get_event_loop()
-   
-    resolver = DNSResolver(loop=loop)
-    hosts = []
+
+    if resolver is None:
+        # aiodns is only needed for the discovery, not for importing the package
+        from aiodns import DNSResolver
+        resolver = DNSResolver(loop=loop)
 
     # get all hosts from DNS
-    ips = await loop.getaddrinfo('all.api.radio-browser.info',
-                             80, family=0, type=0, proto=socket.IPPROTO_TCP)
-    
-    for ip_tupple in ips:
-        ip = ip_tupple[4][0]
-
-        host_addr = await resolver.gethostbyaddr(ip)
-     
-        if host_addr.name not in hosts:
-            hosts.append(host_addr.name)
-
-   
-    hosts.sort()
-    
+    ips = await _lookup_ips(loop)
+
+    names = await asyncio.gather(*(_reverse_lookup(resolver, ip, lookup_timeout) for ip in ips))
+
+    hosts = sorted({name for name in names if name})
+
     return list(map(lambda x: "https://" + x, hosts))
 
-async def pick_url():
+async def get_radiobrowser_base_urls(ttl: float = CACHE_TTL, cache_file: Optional[str] = None,
+                                     resolver=None, lookup_timeout: float = LOOKUP_TIMEOUT) -> List[str]:
+    """
+    Get all base urls of all currently available radiobrowser servers
+
+    The list is cached in memory for `ttl` seconds. If `cache_file` is given
+    the list is also stored there, so other processes and restarts can skip
+    the discovery until it expires. Concurrent callers share one discovery.
+
+    Returns: 
+    List[str]: a list of string URLS
+    """
+    now = time.time()
+
+    if _cache['urls'] and now - _cache['timestamp'] < ttl:
+        return list(_cache['urls'])
+
+    urls, timestamp = _read_cache_file(cache_file, ttl) if cache_file else (None, now)
+
+    if urls is None:
+        timestamp = now
+        discovery = _cache['discovery']
+        if discovery is None or discovery.done() or discovery.get_loop() is not asyncio.get_running_loop():
+            discovery = _cache['discovery'] = asyncio.ensure_future(
+                discover_radiobrowser_base_urls(resolver=resolver, lookup_timeout=lookup_timeout))
+        urls = await asyncio.shield(discovery)
+
+        if urls and cache_file:
+            _write_cache_file(cache_file, urls, timestamp)
+
+    if urls:
+        _cache['urls'] = list(urls)
+        _cache['timestamp'] = timestamp
+
+    return list(urls)
+
+async def pick_url(**kwargs):
 
-    urls = await get_radiobrowser_base_urls()
+    urls = await get_radiobrowser_base_urls(**kwargs)
 
     if len(urls) == 0:
         raise noHostFound("No hosts found.")
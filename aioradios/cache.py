@@ -0,0 +1,164 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Catalog listings change rarely, everything else is not cached unless configured.
+DEFAULT_TTLS = {
+    'countries': 3600,
+    'countrycodes': 3600,
+    'codecs': 3600,
+    'states': 3600,
+    'languages': 3600,
+    'tags': 3600,
+}
+
+
+def request_key(fmt: str, endpoint: str, params: dict) -> Tuple:
+    """
+    Identify a request by its format, endpoint and normalized params.
+    """
+    items = tuple(sorted((str(k), str(v)) for k, v in params.items() if v is not None))
+    return (fmt.lower(), endpoint, items)
+
+
+class CacheEntry:
+    __slots__ = ('value', 'size', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, value, size: int, expires: float, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires
+
+
+class ResponseCache:
+    """
+    A TTL/LRU cache for decoded API responses.
+
+    Entries are keyed on the format, endpoint and normalized params. The TTL
+    is looked up by the first segment of the endpoint (e.g. 'tags' for
+    'tags/jazz'), endpoints with a TTL of 0 are never cached. Stale entries
+    that carry an ETag or Last-Modified header are revalidated with a
+    conditional request instead of being fetched again.
+
+    Cached values are shared between callers and should not be mutated.
+
+    ...
+
+    Attributes
+    ----------
+    ttls : dict
+        TTL in seconds per endpoint.
+    default_ttl : float
+        TTL for endpoints missing from `ttls`.
+    max_entries : int
+        Maximum number of cached responses.
+    max_bytes : int
+        Maximum summed size of the cached response bodies.
+    hits, misses, revalidations, evictions : int
+        Counters of cache activity.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 0,
+                 max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Tuple, CacheEntry]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    key = staticmethod(request_key)
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint.split('/', 1)[0], self.default_ttl)
+
+    def get(self, key: Tuple) -> Optional[CacheEntry]:
+        """
+        Look up an entry, fresh or stale. Only fresh entries count as a hit.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.fresh(time.monotonic()):
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def put(self, key: Tuple, value, size: int, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        ttl = self.ttl_for(key[1])
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        self.discard(key)
+        self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl, etag, last_modified)
+        self.size += size
+
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def revalidated(self, key: Tuple, entry: CacheEntry):
+        """
+        Mark a stale entry as fresh again after the server answered 304.
+        """
+        entry.expires = time.monotonic() + self.ttl_for(key[1])
+        self.revalidations += 1
+
+    def discard(self, key: Tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,195 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterable, MutableMapping, Optional
+
+from .errors import UnsupportedFormat
+from .files import _atomic_write
+
+# Seconds between two polls of `ChangeFeed.watch`.
+POLL_INTERVAL = 60.0
+
+INSERT = 'insert'
+UPDATE = 'update'
+UNCHANGED = 'unchanged'
+
+
+def _changed_at(station) -> str:
+    return station.get('lastchangetime_iso8601') or station.get('lastchangetime') or ''
+
+
+def latest_change(stations: Iterable) -> Optional[str]:
+    """
+    The changeuuid of the most recently changed station, a checkpoint for
+    a feed that continues after a full download.
+    """
+    latest, latest_time = None, ''
+    for station in stations:
+        changed = _changed_at(station)
+        if latest is None or changed > latest_time:
+            latest, latest_time = station.get('changeuuid'), changed
+    return latest
+
+
+def apply_change(stations: MutableMapping, station) -> str:
+    """
+    Apply one changed station to a collection mapping stationuuid to the
+    station. Returns 'insert', 'update', or 'unchanged' if the collection
+    already holds this change or a later one, e.g. when a feed is replayed.
+    """
+    uuid = station.get('stationuuid')
+    current = stations.get(uuid)
+    if current is None:
+        stations[uuid] = station
+        return INSERT
+    if current.get('changeuuid') == station.get('changeuuid'):
+        return UNCHANGED
+    changed, held = _changed_at(station), _changed_at(current)
+    if changed and held and changed < held:
+        return UNCHANGED
+    stations[uuid] = station
+    return UPDATE
+
+
+class ChangeFeed:
+    """
+    The stations changed since a checkpoint, from the stations/changed
+    endpoint of the server.
+
+    The checkpoint is the changeuuid of the last change handled. It advances
+    when the consumer asks for the next change and is saved to
+    `checkpoint_file` after every page and when the iterator is closed, so
+    the next run continues where this one stopped; a change the consumer
+    stopped at is delivered again, `apply_change` skips it. Without a
+    checkpoint the feed starts with the oldest change the server keeps;
+    after a full download start it with `mark(stations)` instead.
+
+    The server reports no deleted stations, they stay in a synced
+    collection until the next full download.
+
+    Example:
+    ```
+    feed = rb.change_feed('changes.json')
+    stations = {station['stationuuid']: station for station in await rb.stations()}
+    if feed.checkpoint is None:
+        feed.mark(stations.values())
+    counts = await feed.sync(stations)
+    ```
+
+    ...
+
+    Attributes
+    ----------
+    checkpoint : str
+        The changeuuid of the last change handled, None for none yet.
+    checkpoint_time : float
+        `time.time()` when the checkpoint last advanced.
+    """
+
+    def __init__(self, client, checkpoint_file: Optional[str] = None, checkpoint: Optional[str] = None,
+                 page_size: int = 1000):
+        self.client = client
+        self.checkpoint_file = checkpoint_file
+        self.page_size = page_size
+        self.checkpoint = checkpoint
+        self.checkpoint_time = 0.0
+        if checkpoint is None and checkpoint_file is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.checkpoint_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.checkpoint = data.get('lastchangeuuid')
+            self.checkpoint_time = data.get('timestamp', 0.0)
+
+    def save(self):
+        """
+        Write the checkpoint to `checkpoint_file`, if set.
+        """
+        if self.checkpoint_file is None:
+            return
+        with _atomic_write(self.checkpoint_file) as tmp, open(tmp, 'w') as f:
+            json.dump({'lastchangeuuid': self.checkpoint, 'timestamp': self.checkpoint_time}, f)
+
+    def mark(self, stations: Iterable):
+        """
+        Continue after the latest change among `stations`, e.g. a full download.
+        """
+        checkpoint = latest_change(stations)
+        if checkpoint is not None:
+            self.checkpoint = checkpoint
+            self.checkpoint_time = time.time()
+            self.save()
+
+    async def changes(self) -> AsyncIterator:
+        """
+        Yield the stations changed since the checkpoint, oldest change first,
+        until the server has no more. A station changed several times is
+        yielded once per change.
+        """
+        if self.client.http.fmt.lower() != 'json' or self.client.http.raw:
+            raise UnsupportedFormat("The change feed needs the json format without raw mode")
+
+        while True:
+            params = {'limit': self.page_size}
+            if self.checkpoint is not None:
+                params['lastchangeuuid'] = self.checkpoint
+            page = await self.client.http.request('stations/changed', params=params)
+
+            try:
+                for station in page:
+                    yield self.client._record(station)
+                    self.checkpoint = station['changeuuid']
+                    self.checkpoint_time = time.time()
+            finally:
+                self.save()
+
+            if len(page) < self.page_size:
+                return
+
+    async def watch(self, interval: float = POLL_INTERVAL) -> AsyncIterator:
+        """
+        Like `changes`, but polls the server again every `interval` seconds
+        once it has no more changes, forever.
+        """
+        while True:
+            async for station in self.changes():
+                yield station
+            await asyncio.sleep(interval)
+
+    async def sync(self, stations: MutableMapping) -> dict:
+        """
+        Apply all changes since the checkpoint to `stations`, a mapping of
+        stationuuid to station. Returns the number of inserts and updates.
+        """
+        counts = {INSERT: 0, UPDATE: 0, UNCHANGED: 0}
+        async for station in self.changes():
+            counts[apply_change(stations, station)] += 1
+        return counts
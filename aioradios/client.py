@@ -22,16 +22,39 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 import asyncio
-from typing import List
+import os
+from collections import deque
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, List, Mapping, Optional
+from urllib.parse import quote
 
 from .http import HTTP
-from .errors import NotInitialized, RequiredMissing
+from .station import Station
+from .index import StationIndex
+from .errors import RequiredMissing, UnsupportedFormat
+from .timeouts import with_timeout
 
+if TYPE_CHECKING:
+    # imported where used, they are not needed for the plain API calls
+    from .snapshot import StationSnapshot
+    from .columns import StationColumns
+    from .changes import ChangeFeed
+    from .crawler import Crawler
+    from .fuzzy import FuzzyIndex
+
+
+# Maximum length of the url-encoded uuids parameter of a bulk lookup request.
+MAX_UUID_QUERY = 1800
 
 
 class RadioBrowser:
     """
     The radio-browser class. Used for all requests.
+    Can be used as `async with RadioBrowser() as rb:`, which initializes and closes it.
+
+    Every API call takes a keyword-only `timeout` in seconds for the whole call,
+    including the mirror discovery on the first one, and raises asyncio.TimeoutError
+    when it expires, e.g. `await rb.search(name='jazz', timeout=5)`. The iterating
+    calls, such as `iter_stations`, apply it to each item instead.
 
     ...
 
@@ -41,9 +64,24 @@ class RadioBrowser:
         The aiohttp session to use for the requests.
     fmt: str
         The format to return, could be xml or json.
+    mirror_cache_file: str
+        A file to persist the discovered mirror list in.
+    mirror_pool: bool
+        Route requests to the fastest healthy mirror instead of a random one.
+    cache: ResponseCache
+        The cache for responses of rarely changing endpoints.
+    typed: bool
+        Return stations as `Station` records instead of dicts.
+    index: StationIndex
+        The local index answering the station searches, None to query the server.
+    timeout: float
+        The timeout of the calls that do not pass one, None for no timeout.
     """
 
-    def __init__(self, session=None, fmt='json'):
+    def __init__(self, session=None, fmt='json', mirror_cache_file=None, mirror_pool=False, cache=None,
+                 typed=False, coalesce=False, transport=None, share_connector=False, scheduler=None,
+                 retry=None, metrics=None, decoder='auto', raw=False, parse_xml=False, mirrors=None, timeout=None,
+                 adaptive_timeouts=None, offload=None):
         """
         Parameters
         ----------
@@ -51,17 +89,205 @@ class RadioBrowser:
             The aiohttp session to use for the requests. If None a new session is automatically created.
         fmt: str, optional
             The format to return, could be xml or json.
+        mirror_cache_file: str, optional
+            A file to persist the discovered mirror list in, so other processes
+            and restarts skip the DNS discovery until it expires. (Default is None)
+        mirror_pool: bool, optional
+            Probe every mirror on init and route each request to the healthy mirror
+            with the best latency and error rate. Failing mirrors are taken out of
+            rotation until a trial request after their cooldown succeeds, and all
+            mirrors are measured again every few minutes. (Default is False)
+        cache: ResponseCache or bool, optional
+            Cache responses in memory, e.g. the countries, codecs, languages and
+            tags listings. Pass True for a cache with the default TTLs. (Default is None)
+        typed: bool, optional
+            Return stations as compact `Station` records instead of dicts. Does not
+            apply to the raw text returned by the non-streaming xml calls. (Default is False)
+        coalesce: bool, optional
+            Share one request between concurrent identical calls, e.g. many coroutines
+            calling `tags()` at once. Counters are in `http.coalesce_stats`. (Default is False)
+        transport: TransportConfig, optional
+            Connection pool, timeout and compression settings for the session created
+            here. Responses are gzip, deflate or brotli compressed by default, the bytes
+            received and decoded are counted in `http.transfer`. (Default is None)
+        share_connector: bool, optional
+            Use one connection pool for all RadioBrowser instances of the event loop
+            with the same transport settings. (Default is False)
+        scheduler: Scheduler or bool, optional
+            Rate limit and prioritize the outgoing requests, searches go before
+            full station listings. Also drops repeated votes for a station within
+            10 minutes locally. Pass True for the default limits. (Default is None)
+        retry: RetryPolicy or bool, optional
+            Retry failed requests on other mirrors with backoff, and optionally hedge
+            slow ones. Pass True for two retries without hedging. Votes are never
+            retried. (Default is None)
+        metrics: Metrics, optional
+            Collect latency, size and status metrics per endpoint and mirror, and call
+            its hooks around every request. (Default is None)
+        decoder: str or callable, optional
+            The JSON decoder: 'orjson', 'ujson', 'json', 'auto' for the fastest one
+            installed, or a callable taking the response body. (Default is 'auto')
+        raw: bool, optional
+            Return the undecoded response body as bytes, e.g. to cache or forward it.
+            (Default is False)
+        parse_xml: bool, optional
+            Parse xml responses into the same list of dicts as json ones instead of
+            returning the text. (Default is False)
+        mirrors: str or list, optional
+            A base url, e.g. 'https://de1.api.radio-browser.info', or a list of them
+            to use instead of discovering the mirrors through DNS. (Default is None)
+        timeout: float, optional
+            The timeout in seconds of every call that does not pass its own `timeout`,
+            for the whole call, or for each item of the iterating calls. None waits
+            as long as the session timeouts allow.
+            (Default is None)
+        adaptive_timeouts: AdaptiveTimeouts or bool, optional
+            Time out each request after a multiple of the recent latencies of its
+            endpoint instead of the fixed session timeout, so a hung mirror fails
+            fast, e.g. to be retried elsewhere with `retry`. Pass True for the
+            3 x p99 default. (Default is None)
+        offload: DecodePool, str or bool, optional
+            Decode large response bodies, and build their `Station` records, in a
+            'thread' or 'process' pool so the event loop keeps running meanwhile,
+            e.g. during a full `stations()` download. True is a thread pool for
+            bodies of 512 KiB and more. (Default is None)
         """
-        self.http = HTTP(fmt, session=session)
+        self.http = HTTP(fmt, session=session, mirror_cache_file=mirror_cache_file, mirror_pool=mirror_pool,
+                         cache=cache, coalesce=coalesce, transport=transport, share_connector=share_connector,
+                         scheduler=scheduler, retry=retry, metrics=metrics, decoder=decoder, raw=raw,
+                         parse_xml=parse_xml, mirrors=mirrors, timeouts=adaptive_timeouts,
+                         records=Station.from_dict if typed else None, offload=offload)
+        self.typed = typed
+        self.index = None
+        self.timeout = timeout
         self.__intialized = False
 
+    @with_timeout
     async def init(self):
         """
-        Initialize the ClientSession.
+        Initialize the ClientSession and find the mirrors. Optional, the first
+        call does it, concurrent first calls share one initialization.
         """
-        await self.http.init()
+        await self.http.ready()
         self.__intialized = True
 
+    async def close(self):
+        """
+        Close the ClientSession, unless it was passed in.
+        """
+        await self.http.close()
+        self.__intialized = False
+
+    async def __aenter__(self):
+        await self.init()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @with_timeout
+    async def load_index(self, stations=None) -> StationIndex:
+        """
+        Build a local `StationIndex` from the full station list. Once loaded,
+        `search`, `search_by_url` and `search_by_uuid` are answered from it
+        without the network. Set `index` to None to query the server again.
+
+        Parameters
+        ----------
+        stations : list, optional
+            The stations to index. If None the full list is downloaded. (Default is None)
+        """
+        if not self.__intialized:
+            await self.init()
+
+        if stations is None:
+            stations = [station async for station in self.stream_stations(limit=10000000)]
+
+        self.index = StationIndex(stations)
+        return self.index
+
+    @with_timeout
+    async def load_fuzzy_index(self, stations=None, **kwargs) -> 'FuzzyIndex':
+        """
+        Build a `FuzzyIndex` for typo-tolerant search as you type over the
+        station names and tags, see `FuzzyIndex` for the keyword arguments.
+
+        Parameters
+        ----------
+        stations : list, optional
+            The stations to index. If None the stations of the loaded `index` are
+            used, or the full list is downloaded. (Default is None)
+        """
+        from .fuzzy import FuzzyIndex
+
+        if stations is None:
+            if self.index is not None:
+                stations = self.index.stations
+            else:
+                stations = [station async for station in self.stream_stations(limit=10000000)]
+        return FuzzyIndex(stations, **kwargs)
+
+    @with_timeout
+    async def snapshot(self, path: str, max_age: Optional[float] = None) -> 'StationSnapshot':
+        """
+        Open the station snapshot at `path`, downloading the full station list
+        into it first if it is missing or older than `max_age` seconds. Other
+        processes can open the same file with `StationSnapshot(path)`.
+
+        Parameters
+        ----------
+        path : str
+            The snapshot file.
+        max_age : float, optional
+            Seconds after which the snapshot is refreshed, None to never refresh
+            an existing one. (Default is None)
+        """
+        from .snapshot import StationSnapshot, write_snapshot
+
+        if os.path.exists(path):
+            snapshot = StationSnapshot(path, typed=self.typed, decoder=self.http.decoder)
+            if max_age is None or snapshot.age <= max_age:
+                return snapshot
+            snapshot.close()
+
+        if not self.__intialized:
+            await self.init()
+
+        stations = [station async for station in self.stream_stations(limit=10000000)]
+        await asyncio.get_event_loop().run_in_executor(None, write_snapshot, path, stations)
+        return StationSnapshot(path, typed=self.typed, decoder=self.http.decoder)
+
+    def change_feed(self, checkpoint_file: Optional[str] = None, checkpoint: Optional[str] = None,
+                    page_size: int = 1000) -> 'ChangeFeed':
+        """
+        A `ChangeFeed` of the stations changed since a checkpoint, to keep a
+        local copy fresh without downloading every station again.
+        Only the json format is supported.
+
+        Parameters
+        ----------
+        checkpoint_file : str, optional
+            A file the checkpoint is loaded from and saved to, so the next run
+            continues where this one stopped. (Default is None)
+        checkpoint : str, optional
+            The changeuuid to continue after, instead of the saved one. (Default is None)
+        page_size : int, optional
+            Number of changes fetched per request. (Default is 1000)
+        """
+        from .changes import ChangeFeed
+
+        return ChangeFeed(self, checkpoint_file=checkpoint_file, checkpoint=checkpoint, page_size=page_size)
+
+    def crawler(self, **kwargs) -> 'Crawler':
+        """
+        A `Crawler` running bulk station queries over all discovered mirrors,
+        see `Crawler` for the parameters. Only the json format is supported.
+        """
+        from .crawler import Crawler
+
+        return Crawler(self, **kwargs)
+
+    @with_timeout
     async def countries(self, search=None, orderby: str = 'name', reverse: bool = False, hidebroken: bool = False) -> List[dict]:
         """
         Get the available country list.
@@ -76,14 +302,9 @@ class RadioBrowser:
             reverse the result list if set to true (Default is False)
         hidebroken : bool, optional
             Do not count broken stations (Default is False)
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
 
         reverse = str(reverse).lower()
         hidebroken = str(hidebroken).lower()
@@ -99,6 +320,7 @@ class RadioBrowser:
         else:
             return await self.http.request("countries/", params=params)
 
+    @with_timeout
     async def countryCodes(self, search=None, orderby: str = 'name', reverse: bool = False, hidebroken: bool = False) -> List[dict]:
         """
         Get the available country code list.
@@ -113,14 +335,9 @@ class RadioBrowser:
             reverse the result list if set to true (Default is False)
         hidebroken : bool, optional
             Do not count broken stations (Default is False)
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
 
         reverse = str(reverse).lower()
         hidebroken = str(hidebroken).lower()
@@ -136,6 +353,7 @@ class RadioBrowser:
         else:
             return await self.http.request("countrycodes/", params=params)
 
+    @with_timeout
     async def codecs(self, search=None, orderby: str = 'name', reverse: bool = False, hidebroken: bool = False) -> List[dict]:
         """
         Get the available codec list.
@@ -150,14 +368,9 @@ class RadioBrowser:
             reverse the result list if set to true (Default is False)
         hidebroken : bool, optional
             Do not count broken stations (Default is False)
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
 
         reverse = str(reverse).lower()
         hidebroken = str(hidebroken).lower()
@@ -173,6 +386,7 @@ class RadioBrowser:
         else:
             return await self.http.request("codecs/", params=params)
 
+    @with_timeout
     async def states(self, search=None, orderby: str = 'name', reverse: bool = False, hidebroken: bool = False, country=None) -> List[dict]:
         """
         Get the available state list.
@@ -189,14 +403,9 @@ class RadioBrowser:
             Do not count broken stations (Default is False)
         country : str, optional
             filter states by country name (Default is None)
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
 
         if country and not search:
             raise RequiredMissing("To filter by country, you have to provide a search keyword.")
@@ -219,6 +428,7 @@ class RadioBrowser:
             return await self.http.request("codecs/", params=params)
 
 
+    @with_timeout
     async def languages(self, search=None, orderby: str = 'name', reverse: bool = False, hidebroken: bool = False) -> List[dict]:
         """
         Get the available language list.
@@ -233,14 +443,9 @@ class RadioBrowser:
             reverse the result list if set to true (Default is False)
         hidebroken : bool, optional
             Do not count broken stations (Default is False)
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
 
         reverse = str(reverse).lower()
         hidebroken = str(hidebroken).lower()
@@ -257,6 +462,7 @@ class RadioBrowser:
             return await self.http.request("languages/", params=params)
 
 
+    @with_timeout
     async def tags(self, search=None, orderby: str = 'name', reverse: bool = False, hidebroken: bool = False) -> List[dict]:
         """
         Get the available tag list.
@@ -271,14 +477,9 @@ class RadioBrowser:
             reverse the result list if set to true (Default is False)
         hidebroken : bool, optional
             Do not count broken stations (Default is False)
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
 
         reverse = str(reverse).lower()
         hidebroken = str(hidebroken).lower()
@@ -294,6 +495,7 @@ class RadioBrowser:
         else:
             return await self.http.request("tags/", params=params)
 
+    @with_timeout
     async def stations(self, orderby: str = 'name', reverse: bool = False, offset=0, limit = 100000) -> List[dict]:
         """
         Get a full list of all stations.
@@ -308,14 +510,9 @@ class RadioBrowser:
             Starting value of the result list from the database. For example, if you want to do paging on the server side. (default: 0)
         limit : int, optional
             Number of returned datarows (stations) starting with offset (default 100000)
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
 
         reverse = str(reverse).lower()
 
@@ -328,9 +525,77 @@ class RadioBrowser:
         }
 
 
-        return await self.http.request("stations/", params=params) 
+        return self._records(await self.http.request("stations/", params=params))
+
+    @with_timeout
+    async def stream_stations(self, orderby: str = 'name', reverse: bool = False, offset=0, limit = 100000) -> AsyncIterator[dict]:
+        """
+        Get a full list of all stations, decoding the response while it arrives.
+        The stations are yielded one by one as dicts, in the xml format the
+        dicts hold the attributes of the station elements.
+
+        Parameters
+        ----------
+        orderby : str, optional
+            Name of the attribute the result list will be sorted by. (Default is 'name')
+        reverse : bool, optional
+            reverse the result list if set to true (Default is False)
+        offset : int, optional 
+            Starting value of the result list from the database. (default: 0)
+        limit : int, optional
+            Number of returned datarows (stations) starting with offset (default 100000)
+        """
+        if not self.__intialized:
+            await self.init()
+
+        params = {
+            'order': orderby,
+            'reverse': str(reverse).lower(),
+            'offset': offset,
+            'limit': limit
+        }
+
+        async for station in self.http.stream("stations/", params=params):
+            yield self._record(station)
+
+    @with_timeout
+    async def iter_stations(self, orderby: str = 'name', reverse: bool = False, offset=0, limit=None,
+                            page_size: int = 1000, prefetch: int = 1) -> AsyncIterator[dict]:
+        """
+        Iterate over all stations page by page.
+        The next pages are fetched in the background while the current one is consumed.
+        Only the json format is supported.
+
+        Parameters
+        ----------
+        orderby : str, optional
+            Name of the attribute the result list will be sorted by. (Default is 'name')
+        reverse : bool, optional
+            reverse the result list if set to true (Default is False)
+        offset : int, optional
+            Starting value of the result list from the database. (default: 0)
+        limit : int, optional
+            Maximum number of stations to yield, None for all of them. (default: None)
+        page_size : int, optional
+            Number of stations requested per page. (default: 1000)
+        prefetch : int, optional
+            Number of pages requested ahead of the one being consumed. (default: 1)
+
+        Raises
+        ------
+        UnsupportedFormat
+            If the format is not json or raw bodies are returned
+        """
+        params = {
+            'order': orderby,
+            'reverse': str(reverse).lower()
+        }
+
+        async for station in self._paginate("stations/", params, offset, limit, page_size, prefetch):
+            yield station
 
 
+    @with_timeout
     async def search(self, **kwargs) -> List[dict]:
         """
         Advanced search.
@@ -393,21 +658,138 @@ class RadioBrowser:
         print(result[0])
 
         > {'changeuuid': '9629d8d7-0601-11e8-ae97-52543be04c81', 'stationuuid': '9629d8d4-0601-11e8-ae97-52543be04c81', 'name': 'Radio Record'...
+        """
+        if not self.__intialized:
+            await self.init()
+
+        if self.index is not None:
+            return self.index.search(**kwargs)
+
+        return self._records(await self.http.request('stations/search', params = self._search_params(kwargs)))
+
+    @with_timeout
+    async def stream_search(self, **kwargs) -> AsyncIterator[dict]:
+        """
+        Advanced search, decoding the response while it arrives.
+        Takes the same parameters as `search` and yields the stations one by one.
+        """
+        if not self.__intialized:
+            await self.init()
+
+        async for station in self.http.stream('stations/search', params = self._search_params(kwargs)):
+            yield self._record(station)
+
+    @with_timeout
+    async def station_columns(self, **kwargs) -> 'StationColumns':
+        """
+        Stream stations into a column-oriented `StationColumns` for aggregate
+        reports, without building the list of dicts first. Takes the parameters
+        of `search`, without any all stations are exported.
+        """
+        if not self.__intialized:
+            await self.init()
+
+        from .columns import StationColumns
+
+        if kwargs:
+            stations = self.http.stream('stations/search', params=self._search_params(kwargs))
+        else:
+            stations = self.http.stream('stations/', params={'limit': 10000000})
+        return await StationColumns.from_stream(stations)
+
+    @with_timeout
+    async def iter_search(self, page_size: int = 1000, prefetch: int = 1, **kwargs) -> AsyncIterator[dict]:
+        """
+        Advanced search, iterating over the result page by page.
+        The next pages are fetched in the background while the current one is consumed.
+        Only the json format is supported.
+
+        Parameters
+        ----------
+        page_size : int, optional
+            Number of stations requested per page. (default: 1000)
+        prefetch : int, optional
+            Number of pages requested ahead of the one being consumed. (default: 1)
+        **kwargs
+            The parameters of `search`. `offset` and `limit` apply to the whole iteration.
 
         Raises
         ------
-        NotInitialized
-            If not initialized
+        UnsupportedFormat
+            If the format is not json or raw bodies are returned
         """
-        if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+        params = self._search_params(kwargs)
+        offset = params.pop('offset', 0)
+        limit = params.pop('limit', None)
+
+        async for station in self._paginate('stations/search', params, offset, limit, page_size, prefetch):
+            yield station
+
+    def _record(self, station):
+        return Station.from_dict(station) if self.typed and not isinstance(station, Station) else station
+
+    def _records(self, result):
+        # request results are converted by the http layer already
+        if self.typed and isinstance(result, list) and result and not isinstance(result[0], Station):
+            return [Station.from_dict(station) for station in result]
+        return result
+
+    @staticmethod
+    def _search_params(kwargs) -> dict:
         di = dict(kwargs)
         for key, value in di.items():
             if isinstance(value, bool):
                 di[key] = str(value).lower() 
+        return di
 
-        return await self.http.request('stations/search', params = di)
-
+    async def _paginate(self, endpoint, params, offset, limit, page_size, prefetch):
+        if not self.__intialized:
+            await self.init()
+
+        if self.http.fmt.lower() != 'json' or self.http.raw:
+            raise UnsupportedFormat("Paginated iteration only supports the decoded json format")
+
+        end = None if limit is None else offset + limit
+        next_offset = offset
+        pending = deque()
+
+        def schedule():
+            nonlocal next_offset
+            size = page_size if end is None else min(page_size, end - next_offset)
+            if size <= 0:
+                return False
+
+            page_params = dict(params, offset=next_offset, limit=size)
+            pending.append((asyncio.ensure_future(self.http.request(endpoint, params=page_params)), size))
+            next_offset += size
+            return True
+
+        more = True
+        try:
+            while True:
+                while more and len(pending) <= prefetch:
+                    more = schedule()
+
+                if not pending:
+                    return
+
+                task, size = pending.popleft()
+                page = await task
+                if len(page) < size:
+                    # last page reached, whatever was prefetched beyond it is empty
+                    more = False
+                    for task, _ in pending:
+                        task.cancel()
+                    pending.clear()
+
+                for station in page:
+                    yield self._record(station)
+                del page
+        finally:
+            for task, _ in pending:
+                task.cancel()
+
+    @with_timeout
     async def search_by_url(self, url):
         """
         A list of radio stations that have an exact URL match.
@@ -416,17 +798,16 @@ class RadioBrowser:
         ----------
         url : str
             URL of station
-
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
+            await self.init()
+
+        if self.index is not None:
+            return self.index.by_url_match(url)
 
-        return await self.http.request('stations/byurl', params={'url':url})
+        return self._records(await self.http.request('stations/byurl', params={'url':url}))
 
+    @with_timeout
     async def search_by_uuid(self, uuids):
         """
         A list of radio stations that have an exact UUID match.
@@ -435,33 +816,117 @@ class RadioBrowser:
         ----------
         uuids : str
             comma-separated list of UUIDs
+        """
+        if not self.__intialized:
+            await self.init()
+
+        if self.index is not None:
+            return self.index.by_uuids(uuids)
+
+        return self._records(await self.http.request('stations/byuuid', params={'uuids':uuids}))
+
+    @with_timeout
+    async def search_by_uuids(self, uuids: Iterable[str], known: Optional[Mapping] = None,
+                              concurrency: int = 4) -> Dict[str, dict]:
+        """
+        Look up many stations by UUID.
+        Duplicates are removed and the UUIDs are split into chunks that keep
+        the request URL short, the chunks are fetched concurrently.
+        Only the json format is supported.
+
+        Parameters
+        ----------
+        uuids : Iterable[str]
+            The UUIDs to look up.
+        known : Mapping, optional
+            Stations by UUID that are already at hand, these are not requested again.
+            The loaded `index` is used as well. (Default is None)
+        concurrency : int, optional
+            Maximum number of chunks requested at once. (Default is 4)
+
+        Returns
+        -------
+        Dict[str, dict]
+            The found stations by UUID, in the order of `uuids`. Unknown UUIDs are missing.
 
         Raises
         ------
-        NotInitialized
-            If not initialized
+        UnsupportedFormat
+            If the format is not json or raw bodies are returned
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
-
-        return await self.http.request('stations/byuuid', params={'uuids':uuids})
-
+            await self.init()
+
+        if self.http.fmt.lower() != 'json' or self.http.raw:
+            raise UnsupportedFormat("Bulk UUID lookups only support the decoded json format")
+
+        unique = list(dict.fromkeys(uuids))
+        found = {}
+        missing = []
+        for uuid in unique:
+            station = None
+            if known is not None:
+                station = known.get(uuid)
+            if station is None and self.index is not None:
+                station = self.index.by_uuid.get(uuid)
+
+            if station is not None:
+                found[uuid] = station
+            else:
+                missing.append(uuid)
+
+        chunks = []
+        length = MAX_UUID_QUERY
+        for uuid in missing:
+            size = len(quote(uuid, safe='')) + 3
+            if length + size > MAX_UUID_QUERY:
+                chunks.append([])
+                length = 0
+            chunks[-1].append(uuid)
+            length += size
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await self.http.request('stations/byuuid', params={'uuids': ','.join(chunk)})
+
+        for result in await asyncio.gather(*(fetch(chunk) for chunk in chunks)):
+            for station in self._records(result):
+                found[station['stationuuid']] = station
+
+        result = {}
+        for uuid in unique:
+            station = found.get(uuid) or found.get(uuid.lower())
+            if station is not None:
+                result[uuid] = station
+        return result
+
+    @with_timeout
     async def vote_for_station(self, uuid):
         """
         Increase the vote count for the station by one. 
         Can only be done by the same IP address for one station every 10 minutes. 
         If it works, the changed station will be returned as result
+        With a scheduler, a repeated vote within 10 minutes is not sent and
+        the server's error is returned right away.
 
         Parameters
         ----------
         uuid : str
             The station uuid to vote for.
-        
-        Raises
-        ------
-        NotInitialized
-            If not initialized
         """
         if not self.__intialized:
-            raise NotInitialized("Please initialize the RadioBrowser.")
-        return await self.http.request('vote/'+uuid)
+            await self.init()
+
+        scheduler = self.http.scheduler
+        if scheduler is not None and not scheduler.allow_vote(uuid):
+            return {'ok': False, 'message': "VoteError 'you are voting for the same station too often'"}
+
+        try:
+            return await self.http.request('vote/'+uuid)
+        except BaseException:
+            # a failed vote may be sent again right away
+            if scheduler is not None:
+                scheduler.forget_vote(uuid)
+            raise
@@ -0,0 +1,272 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import compress
+from operator import itemgetter
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Sequence
+
+from .station import _to_int
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUMERIC_COLUMNS = ('bitrate', 'votes', 'clickcount', 'clicktrend', 'lastcheckok', 'hls')
+CATEGORICAL_COLUMNS = ('country', 'countrycode', 'state', 'language', 'codec')
+TEXT_COLUMNS = ('stationuuid', 'name')
+
+
+class StationColumns:
+    """
+    A column-oriented copy of a station result for aggregate reports.
+
+    Numeric fields are kept in `array.array` columns, country, codec,
+    language and the other low cardinality fields as integer codes into a
+    list of categories. The aggregations run over the columns instead of
+    the dicts, and use numpy when it is installed.
+
+    Example:
+    ```
+    columns = await rb.station_columns()
+    columns.value_counts('codec')
+    columns.where(codec='MP3', bitrate_min=128).sum_by('country', 'votes')
+    ```
+
+    ...
+
+    Attributes
+    ----------
+    numeric : dict
+        The numeric columns by field, `array('q')`.
+    codes : dict
+        The category codes by field, `array('l')`.
+    categories : dict
+        The categories of each categorical field, indexed by code.
+    text : dict
+        The stationuuid and name columns as lists.
+    """
+
+    def __init__(self):
+        self.numeric: Dict[str, array] = {field: array('q') for field in NUMERIC_COLUMNS}
+        self.codes: Dict[str, array] = {field: array('l') for field in CATEGORICAL_COLUMNS}
+        self.categories: Dict[str, List[str]] = {field: [] for field in CATEGORICAL_COLUMNS}
+        self.text: Dict[str, List[str]] = {field: [] for field in TEXT_COLUMNS}
+        self._lookup: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_COLUMNS}
+
+    def __len__(self):
+        return len(self.text['stationuuid'])
+
+    def append(self, station):
+        """
+        Add one station, a dict or a `Station` record.
+        """
+        get = station.get
+        for field, column in self.numeric.items():
+            value = get(field)
+            column.append(value if type(value) is int else _to_int(value))
+
+        for field, column in self.codes.items():
+            value = get(field) or ''
+            lookup = self._lookup[field]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+                self.categories[field].append(value)
+            column.append(code)
+
+        for field, column in self.text.items():
+            column.append(get(field))
+
+    def extend(self, stations: Iterable):
+        for station in stations:
+            self.append(station)
+
+    @classmethod
+    def from_stations(cls, stations: Iterable) -> 'StationColumns':
+        columns = cls()
+        columns.extend(stations)
+        return columns
+
+    @classmethod
+    async def from_stream(cls, stations: AsyncIterable) -> 'StationColumns':
+        """
+        Build the columns from an async iterator of stations, e.g.
+        `RadioBrowser.stream_stations()`, one station at a time.
+        """
+        columns = cls()
+        async for station in stations:
+            columns.append(station)
+        return columns
+
+    def column(self, field: str) -> Sequence:
+        """
+        The column of `field`; for a categorical field the values, not the codes.
+        """
+        if field in self.numeric:
+            return self.numeric[field]
+        if field in self.codes:
+            categories = self.categories[field]
+            return [categories[code] for code in self.codes[field]]
+        return self.text[field]
+
+    def to_numpy(self) -> Dict[str, object]:
+        """
+        The numeric columns and category codes as numpy arrays sharing the memory of the columns.
+        """
+        if numpy is None:
+            raise ImportError("to_numpy requires numpy")
+        arrays = {field: numpy.frombuffer(column, dtype=numpy.int64) for field, column in self.numeric.items()}
+        arrays.update({field: numpy.frombuffer(column, dtype=numpy.dtype('l')) for field, column in self.codes.items()})
+        return arrays
+
+    def _condition(self, key: str, value):
+        """
+        The column a condition tests and the test for one value of it.
+        """
+        if key in self.codes:
+            values = {value} if isinstance(value, str) else set(value)
+            lookup = self._lookup[key]
+            wanted = {lookup[v] for v in values if v in lookup}
+            if len(wanted) == 1:
+                code, = wanted
+                return self.codes[key], code.__eq__
+            return self.codes[key], wanted.__contains__
+        if key.endswith(('_min', '_max')) and key[:-4] in self.numeric:
+            bound = _to_int(value)
+            return self.numeric[key[:-4]], bound.__le__ if key.endswith('_min') else bound.__ge__
+        raise KeyError(key)
+
+    def where(self, **conditions) -> 'StationColumns':
+        """
+        The stations matching all conditions: `<categorical>=value` or a set
+        of values (case-sensitive), `<numeric>_min=` and `<numeric>_max=`.
+        """
+        if numpy is not None and conditions:
+            mask = numpy.ones(len(self), dtype=bool)
+            for key, value in conditions.items():
+                column, accept = self._condition(key, value)
+                values = numpy.frombuffer(column, dtype=numpy.dtype(column.typecode))
+                if key in self.codes:
+                    mask &= numpy.isin(values, [code for code in range(len(self.categories[key])) if accept(code)])
+                else:
+                    bound = _to_int(value)
+                    mask &= (values >= bound) if key.endswith('_min') else (values <= bound)
+            return self.take(numpy.flatnonzero(mask).tolist())
+
+        rows = None
+        for key, value in conditions.items():
+            column, accept = self._condition(key, value)
+            if rows is None:
+                rows = list(compress(range(len(column)), map(accept, column)))
+            else:
+                rows = [row for row in rows if accept(column[row])]
+        return self.take(range(len(self)) if rows is None else rows)
+
+    def take(self, rows: Iterable[int]) -> 'StationColumns':
+        """
+        A new StationColumns with the given rows, sharing the categories.
+        """
+        rows = list(rows)
+        if len(rows) > 1:
+            pick = itemgetter(*rows)
+        else:
+            pick = lambda column: tuple(column[row] for row in rows)
+        subset = StationColumns()
+        subset.categories = self.categories
+        subset._lookup = self._lookup
+        for field, column in self.numeric.items():
+            subset.numeric[field] = array('q', pick(column))
+        for field, column in self.codes.items():
+            subset.codes[field] = array('l', pick(column))
+        for field, column in self.text.items():
+            subset.text[field] = list(pick(column))
+        return subset
+
+    def _counts(self, field: str, weights: Optional[array] = None) -> List:
+        codes = self.codes[field]
+        size = len(self.categories[field])
+        if numpy is not None:
+            codes = numpy.frombuffer(codes, dtype=numpy.dtype('l'))
+            if weights is not None:
+                weights = numpy.frombuffer(weights, dtype=numpy.int64)
+            return numpy.bincount(codes, weights=weights, minlength=size).tolist()
+
+        if weights is None:
+            counts = Counter(codes)
+            return [counts.get(code, 0) for code in range(size)]
+        sums = [0] * size
+        for code, weight in zip(codes, weights):
+            sums[code] += weight
+        return sums
+
+    def value_counts(self, field: str) -> Dict[str, int]:
+        """
+        Number of stations per value of a categorical field, largest first.
+        """
+        counts = self._counts(field)
+        return dict(sorted(((category, int(count)) for category, count in zip(self.categories[field], counts) if count),
+                           key=lambda item: -item[1]))
+
+    def share(self, field: str) -> Dict[str, float]:
+        """
+        Fraction of the stations per value of a categorical field, e.g. the codec share.
+        """
+        total = len(self) or 1
+        return {category: count / total for category, count in self.value_counts(field).items()}
+
+    def sum_by(self, field: str, value: str) -> Dict[str, int]:
+        """
+        Sum of a numeric field per value of a categorical field, e.g. votes by country.
+        """
+        counts = self._counts(field)
+        sums = self._counts(field, self.numeric[value])
+        return {category: int(total) for category, count, total in zip(self.categories[field], counts, sums) if count}
+
+    def mean_by(self, field: str, value: str) -> Dict[str, float]:
+        """
+        Mean of a numeric field per value of a categorical field.
+        """
+        counts = self._counts(field)
+        sums = self._counts(field, self.numeric[value])
+        return {category: total / count for category, count, total in zip(self.categories[field], counts, sums) if count}
+
+    def histogram(self, field: str, edges: Sequence[int]) -> List[int]:
+        """
+        Number of stations per bin of a numeric field, e.g. the bitrate
+        distribution. Bin i holds edges[i-1] <= value < edges[i], the first
+        and last bins are open-ended, so there are len(edges) + 1 bins.
+        """
+        column = self.numeric[field]
+        if numpy is not None:
+            bins = numpy.searchsorted(numpy.asarray(edges), numpy.frombuffer(column, dtype=numpy.int64), side='right')
+            return numpy.bincount(bins, minlength=len(edges) + 1).tolist()
+
+        counts = Counter(column)
+        bins = [0] * (len(edges) + 1)
+        for value, count in counts.items():
+            bins[bisect_right(edges, value)] += count
+        return bins
@@ -0,0 +1,84 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+ENCODINGS = ('gzip', 'deflate', 'br') if brotli is not None else ('gzip', 'deflate')
+ACCEPT_ENCODING = ', '.join(ENCODINGS)
+
+
+class Decompressor:
+    """
+    Incrementally decompresses a gzip, deflate or brotli encoded body.
+    The identity encoding passes the data through.
+    """
+
+    def __init__(self, encoding: Optional[str]):
+        self.encoding = (encoding or 'identity').strip().lower()
+        self._first = True
+
+        if self.encoding == 'gzip':
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == 'deflate':
+            self._obj = None
+        elif self.encoding == 'br':
+            if brotli is None:
+                raise ValueError("brotli encoded response, but neither brotli nor brotlicffi is installed")
+            self._obj = brotli.Decompressor()
+        elif self.encoding == 'identity':
+            self._obj = None
+        else:
+            raise ValueError(f"Unsupported content encoding {encoding!r}")
+
+    def feed(self, data: bytes) -> bytes:
+        if self.encoding == 'identity' or not data:
+            return data
+
+        if self.encoding == 'deflate' and self._obj is None:
+            # 'deflate' is zlib wrapped per the spec, but some servers send raw deflate
+            zlib_header = (data[0] & 0x0F) == 8 and (len(data) < 2 or (data[0] << 8 | data[1]) % 31 == 0)
+            wbits = zlib.MAX_WBITS if zlib_header else -zlib.MAX_WBITS
+            self._obj = zlib.decompressobj(wbits)
+
+        if self.encoding == 'br':
+            return self._obj.process(data) if hasattr(self._obj, 'process') else self._obj.decompress(data)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding in ('gzip', 'deflate') and self._obj is not None:
+            return self._obj.flush()
+        return b''
+
+
+def decompress(data: bytes, encoding: Optional[str]) -> bytes:
+    decompressor = Decompressor(encoding)
+    return decompressor.feed(data) + decompressor.flush()
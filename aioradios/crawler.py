@@ -0,0 +1,289 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .cache import request_key
+from .errors import UnsupportedFormat
+from .files import _atomic_write
+
+# A query is an endpoint and its params, e.g. ('stations/search', {'countrycode': 'DE'}).
+Query = Tuple[str, dict]
+
+# Seconds a worker waits after passing on a page that already failed on its mirror.
+SKIP_DELAY = 0.05
+
+# Catalog listing and search parameter per facet.
+FACETS = {
+    'countries': 'country',
+    'languages': 'language',
+    'tags': 'tag',
+}
+
+
+async def facet_queries(client, facets: Iterable[str] = ('countries', 'languages', 'tags')) -> List[Query]:
+    """
+    One exact-match search per value of each facet, e.g. every country.
+    """
+    queries = []
+    for facet in facets:
+        field = FACETS[facet]
+        for item in await client.http.request(facet):
+            if item.get('name'):
+                queries.append(('stations/search', {field: item['name'], f'{field}_exact': 'true'}))
+    return queries
+
+
+def catalog_queries(count: int, page_size: int = 1000) -> List[Query]:
+    """
+    The full station list split into pages of `page_size` up to `count`
+    stations, e.g. the station count of the stats endpoint, and an open
+    query for whatever was added beyond it.
+    """
+    queries = [('stations/', {'order': 'stationuuid', 'offset': offset, 'limit': page_size})
+               for offset in range(0, count, page_size)]
+    queries.append(('stations/', {'order': 'stationuuid', 'offset': max(count, 0)}))
+    return queries
+
+
+def _query_key(query: Query) -> str:
+    endpoint, params = query
+    return json.dumps(request_key('json', endpoint, params)[1:])
+
+
+class Crawler:
+    """
+    Runs a set of station queries spread over all mirrors, with at most
+    `concurrency` requests per mirror at once, and yields every station
+    once, however many queries return it.
+
+    A query with a `limit` param is fetched in one request, others page by
+    page of `page_size`. A failed page goes back into the shared queue for
+    the mirrors it did not fail on yet, once it failed on all of them it is
+    retried anywhere after `retry_delay` seconds, doubling with every
+    failure, until it failed `attempts` times. With `state_file` the
+    finished queries, the offset reached by each unfinished one and the
+    stations seen so far are saved every `save_every` pages, off the event
+    loop, and when the crawl stops. A crawl with the same file skips them
+    and continues each query from its offset, so an interrupted crawl can
+    be resumed. `on_progress` is called with `stats()` every
+    `report_interval` seconds.
+
+    Example:
+    ```
+    crawler = Crawler(rb, state_file='crawl.json', on_progress=print)
+    async with aclosing(crawler.crawl(await facet_queries(rb))) as stations:
+        async for station in stations:
+            ...
+    ```
+
+    ...
+
+    Attributes
+    ----------
+    seen : set
+        The stationuuids yielded, including those of earlier runs.
+    completed : set
+        Keys of the finished queries, including those of earlier runs.
+    offsets : dict
+        Offset of the next page per query key of the paged queries not finished yet.
+    failed : dict
+        Error per query key of the queries that failed `attempts` times.
+    """
+
+    def __init__(self, client, concurrency: int = 4, page_size: int = 1000, attempts: int = 3,
+                 state_file: Optional[str] = None, save_every: int = 50, report_interval: float = 5.0,
+                 on_progress: Optional[Callable[[dict], None]] = None, retry_delay: float = 1.0):
+        self.client = client
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+        self.state_file = state_file
+        self.save_every = save_every
+        self.report_interval = report_interval
+        self.on_progress = on_progress
+        self.seen = set()
+        self.completed = set()
+        self.offsets: Dict[str, int] = {}
+        self.failed: Dict[str, str] = {}
+        self._requests: Dict[str, int] = {}
+        self._counts = {'queries': 0, 'pages': 0, 'stations': 0, 'duplicates': 0}
+        self._start = None
+        if state_file is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.state_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.seen = set(data.get('seen', ()))
+        self.completed = set(data.get('completed', ()))
+        self.offsets = dict(data.get('offsets', {}))
+
+    def _state(self) -> dict:
+        # copies only, sorting and writing them is left to _write
+        return {'completed': list(self.completed), 'offsets': dict(self.offsets), 'seen': list(self.seen)}
+
+    def _write(self, state: dict):
+        state['completed'].sort()
+        state['seen'].sort()
+        with _atomic_write(self.state_file) as tmp, open(tmp, 'w') as f:
+            json.dump(state, f)
+
+    def save(self):
+        """
+        Write the finished queries, the offsets of the unfinished ones and the
+        seen stations to `state_file`, if set.
+        """
+        if self.state_file is not None:
+            self._write(self._state())
+
+    async def _save(self):
+        if self.state_file is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._write, self._state())
+
+    def stats(self) -> dict:
+        elapsed = time.perf_counter() - self._start if self._start is not None else 0.0
+        return dict(self._counts, unique=len(self.seen), failed=len(self.failed), elapsed=elapsed,
+                    stations_per_second=self._counts['stations'] / elapsed if elapsed else 0.0,
+                    requests=dict(self._requests))
+
+    def _retry(self, pages: asyncio.Queue, mirrors: List[str], mirror: str, key: str, query: Query, offset: int,
+               failures: int, failed_on: FrozenSet[str]):
+        failed_on = failed_on | {mirror}
+        page = (key, query, offset, failures + 1, failed_on)
+        if not failed_on.issuperset(mirrors):
+            pages.put_nowait(page)
+        else:
+            # failed everywhere, give the mirrors some time
+            asyncio.get_event_loop().call_later(self.retry_delay * 2 ** failures, pages.put_nowait, page)
+
+    async def _worker(self, mirror: str, mirrors: List[str], pages: asyncio.Queue, results: asyncio.Queue):
+        while True:
+            key, (endpoint, params), offset, failures, failed_on = await pages.get()
+            try:
+                if mirror in failed_on and not failed_on.issuperset(mirrors):
+                    # left for another mirror
+                    pages.put_nowait((key, (endpoint, params), offset, failures, failed_on))
+                    await asyncio.sleep(SKIP_DELAY)
+                    continue
+
+                page_params = dict(params)
+                paged = 'limit' not in params
+                if paged:
+                    page_params.update(offset=offset, limit=self.page_size)
+                self._requests[mirror] = self._requests.get(mirror, 0) + 1
+                try:
+                    page = await self.client.http.request(endpoint, params=page_params, route=mirror)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if failures + 1 < self.attempts:
+                        self._retry(pages, mirrors, mirror, key, (endpoint, params), offset, failures, failed_on)
+                    else:
+                        await results.put((key, None, e, offset))
+                    continue
+
+                more = paged and len(page) == self.page_size
+                if more:
+                    pages.put_nowait((key, (endpoint, params), offset + self.page_size, 0, frozenset()))
+                await results.put((key, page, more, offset + self.page_size))
+            finally:
+                pages.task_done()
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.on_progress(self.stats())
+
+    async def crawl(self, queries: Iterable[Query]) -> AsyncIterator:
+        """
+        Yield the stations of all queries that did not finish in an earlier
+        run, each stationuuid once.
+        """
+        if self.client.http.fmt.lower() != 'json' or self.client.http.raw:
+            raise UnsupportedFormat("The crawler needs the json format without raw mode")
+
+        await self.client.http.ready()
+        mirrors = list(self.client.http.mirrors) or [self.client.http.route]
+        pages: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue(maxsize=len(mirrors) * self.concurrency * 2)
+
+        pending = set()
+        for query in queries:
+            key = _query_key(query)
+            if key not in self.completed and key not in pending:
+                pending.add(key)
+                endpoint, params = query
+                offset = self.offsets.get(key, int(params.get('offset', 0)))
+                pages.put_nowait((key, (endpoint, dict(params)), offset, 0, frozenset()))
+
+        self._start = time.perf_counter()
+        tasks = [asyncio.ensure_future(self._worker(mirror, mirrors, pages, results))
+                 for _ in range(self.concurrency) for mirror in mirrors]
+        if self.on_progress is not None:
+            tasks.append(asyncio.ensure_future(self._report()))
+
+        try:
+            since_save = 0
+            while pending:
+                key, page, more, next_offset = await results.get()
+                if page is None:
+                    pending.discard(key)
+                    self.failed[key] = repr(more)
+                    continue
+
+                self._counts['pages'] += 1
+                for station in page:
+                    uuid = station.get('stationuuid')
+                    self._counts['stations'] += 1
+                    if uuid in self.seen:
+                        self._counts['duplicates'] += 1
+                        continue
+                    self.seen.add(uuid)
+                    yield self.client._record(station)
+
+                if more:
+                    self.offsets[key] = next_offset
+                else:
+                    pending.discard(key)
+                    self.offsets.pop(key, None)
+                    self.completed.add(key)
+                    self._counts['queries'] += 1
+                since_save += 1
+                if since_save >= self.save_every:
+                    await self._save()
+                    since_save = 0
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._save()
+            if self.on_progress is not None:
+                self.on_progress(self.stats())
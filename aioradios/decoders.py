@@ -0,0 +1,101 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import json
+from typing import Callable, Dict, List, Mapping, Union
+from xml.etree.ElementTree import fromstring
+
+from .errors import UnsupportedFormat
+from .station import INT_FIELDS, _to_int
+
+# Preferred JSON backends, the first one installed is used by 'auto'.
+JSON_BACKENDS = ('orjson', 'ujson', 'json')
+
+# Attributes the JSON results hold as numbers or booleans, XML has them as strings.
+XML_INT_FIELDS = INT_FIELDS | {'stationcount'}
+XML_FLOAT_FIELDS = frozenset(('geo_lat', 'geo_long'))
+XML_BOOL_FIELDS = frozenset(('has_extended_info',))
+
+
+def _load_backend(name: str) -> Callable[[bytes], object]:
+    if name == 'json':
+        return json.loads
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'ujson':
+        import ujson
+        return ujson.loads
+    raise UnsupportedFormat(f"Unknown JSON decoder {name!r}")
+
+
+def available_backends() -> List[str]:
+    available = []
+    for name in JSON_BACKENDS:
+        try:
+            _load_backend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def json_decoder(decoder: Union[str, Callable[[bytes], object]] = 'auto') -> Callable[[bytes], object]:
+    """
+    Resolve a JSON decoder: a backend name, 'auto' for the fastest installed
+    one, or any callable taking the response body.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder == 'auto':
+        return _load_backend(available_backends()[0])
+    return _load_backend(decoder)
+
+
+def _xml_value(key: str, value: str):
+    try:
+        if key in XML_INT_FIELDS:
+            return _to_int(value)
+        if key in XML_FLOAT_FIELDS:
+            return float(value) if value else None
+    except ValueError:
+        return value
+    if key in XML_BOOL_FIELDS:
+        return value.lower() == 'true'
+    return value
+
+
+def xml_item(attrib: Mapping[str, str]) -> dict:
+    """
+    The attributes of an XML result element with the values JSON has as
+    numbers or booleans converted, e.g. `bitrate` and `votes` to ints.
+    """
+    return {key: _xml_value(key, value) for key, value in attrib.items()}
+
+
+def decode_xml(body: bytes) -> List[Dict[str, object]]:
+    """
+    Parse a radio-browser XML result into the structure of the JSON result,
+    a list with the attributes of every element below the root.
+    """
+    return [xml_item(element.attrib) for element in fromstring(body)]
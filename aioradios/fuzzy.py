@@ -0,0 +1,318 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from heapq import heappop, heappush, heapreplace, nlargest
+from math import log1p
+from operator import itemgetter
+from typing import Dict, Iterable, List, Tuple
+
+from .station import split_tags, _to_int
+
+# Score of a term that only starts with the query word, relative to an exact match.
+PREFIX_SCORE = 0.8
+# Score of a term within the allowed edits of the query word, times 1 - edits / (length + 1).
+FUZZY_SCORE = 0.7
+
+_WORD = re.compile(r'\w+')
+_EMPTY = array('I')
+
+
+def normalize(text) -> str:
+    """
+    Casefold `text` and strip its accents, 'Café' and 'cafe' match.
+    """
+    if not isinstance(text, str):
+        return ''
+    text = text.casefold()
+    if text.isascii():
+        return text
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+def words(text) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+def max_edits(word: str) -> int:
+    # typos tolerated in a query word: none up to 2 characters, 1 up to 5, else 2
+    return 0 if len(word) < 3 else 1 if len(word) < 6 else 2
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edits (insert, delete, replace, swap two neighbours) turning `a` into `b`,
+    `limit` + 1 once it is known to be more than `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            if j > 1 and i > 1 and char == b[j - 2] and a[i - 2] == other:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+def trigrams(word: str) -> set:
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    A typo-tolerant index over the station names and tags, for search as you
+    type without a request per keystroke.
+
+    The words of the names and tags form a sorted vocabulary with a trigram
+    index over it. A query word matches the vocabulary words that equal it,
+    start with it (the last word of the query, while it is still typed) or
+    are within one typo of it, two for words of 6 characters and more, so
+    'jaz', 'jazz' and 'jzaz' all find the jazz stations. Stations have to
+    match every query word, tags count `tag_weight` of the name, and the
+    scores are boosted by `popularity` times the log-scaled votes and
+    clickcount.
+
+    The stations of each word are kept in the order of popularity, a query
+    walks them from the top until no further station can make it into the
+    results, or after `max_candidates` stations once it has `limit` results.
+
+    Example:
+    ```
+    fuzzy = await rb.load_fuzzy_index()
+    fuzzy.search('radio paradis', limit=10)
+    ```
+    """
+
+    def __init__(self, stations: Iterable, tag_weight: float = 0.6, popularity: float = 0.5,
+                 max_expansions: int = 64, max_candidates: int = 200):
+        self.stations = list(stations)
+        self.tag_weight = tag_weight
+        self.max_candidates = max_candidates
+        self.max_expansions = max_expansions
+
+        popular = [log1p(max(_to_int(station.get('votes')), 0) + max(_to_int(station.get('clickcount')), 0))
+                   for station in self.stations]
+        top = max(popular, default=0.0) or 1.0
+        self.boost = array('d', (1.0 + popularity * value / top for value in popular))
+
+        names: Dict[str, List[int]] = {}
+        tags: Dict[str, List[int]] = {}
+        station_names, station_tags = [], []
+        for pos, station in enumerate(self.stations):
+            name_words = set(words(station.get('name')))
+            for word in name_words:
+                names.setdefault(word, []).append(pos)
+            tag_words = {word for tag in split_tags(station.get('tags')) for word in words(tag)}
+            for word in tag_words:
+                tags.setdefault(word, []).append(pos)
+            station_names.append(name_words)
+            station_tags.append(tag_words)
+
+        # postings are ordered by popularity, the best stations of a word come first
+        boost = self.boost.__getitem__
+        self.terms: List[str] = sorted(names.keys() | tags.keys())
+        self._names = [self._postings(names.get(term), boost) for term in self.terms]
+        self._tags = [self._postings(tags.get(term), boost) for term in self.terms]
+        self._ids = {term: tid for tid, term in enumerate(self.terms)}
+
+        # the words of each station, flat with offsets
+        self._name_terms, self._name_offsets = self._flatten(station_names, self._ids)
+        self._tag_terms, self._tag_offsets = self._flatten(station_tags, self._ids)
+
+        grams: Dict[str, List[int]] = {}
+        for tid, term in enumerate(self.terms):
+            for gram in trigrams(term):
+                grams.setdefault(gram, []).append(tid)
+        self._grams = {gram: array('I', tids) for gram, tids in grams.items()}
+        self._expanded: Dict[Tuple[str, bool], List[Tuple[int, float]]] = {}
+
+    @staticmethod
+    def _postings(positions, boost):
+        if not positions:
+            return _EMPTY
+        return array('I', sorted(positions, key=boost, reverse=True))
+
+    @staticmethod
+    def _flatten(groups, ids):
+        terms, offsets = array('I'), array('I', [0])
+        for group in groups:
+            terms.extend(ids[word] for word in group)
+            offsets.append(len(terms))
+        return terms, offsets
+
+    def __len__(self):
+        return len(self.stations)
+
+    def expand(self, word: str, prefix: bool = False) -> List[Tuple[int, float]]:
+        """
+        The vocabulary words matching a normalized query word as (term id, score),
+        best first.
+        """
+        key = (word, prefix)
+        found = self._expanded.get(key)
+        if found is not None:
+            return found
+
+        scores: Dict[int, float] = {}
+        tid = self._ids.get(word)
+        if tid is not None:
+            scores[tid] = 1.0
+
+        if prefix:
+            terms = self.terms
+            start = bisect_left(terms, word)
+            end = bisect_left(terms, word + '\uffff', start)
+            if end - start > self.max_expansions:
+                # the words with the most stations are the likely completions
+                size = lambda tid: len(self._names[tid]) + len(self._tags[tid])
+                completions = nlargest(self.max_expansions, range(start, end), key=size)
+            else:
+                completions = range(start, end)
+            for tid in completions:
+                scores.setdefault(tid, PREFIX_SCORE * (0.5 + 0.5 * len(word) / len(terms[tid])))
+
+        edits = max_edits(word)
+        if edits:
+            # a word within `edits` edits shares all but 4 trigrams per edit (a swap) with the query word
+            query = trigrams(word)
+            needed = max(1, len(query) - 4 * edits)
+            shared: Dict[int, int] = {}
+            for gram in query:
+                for tid in self._grams.get(gram, ()):
+                    shared[tid] = shared.get(tid, 0) + 1
+            terms = self.terms
+            for tid, count in shared.items():
+                if count < needed or tid in scores or abs(len(terms[tid]) - len(word)) > edits:
+                    continue
+                distance = edit_distance(word, terms[tid], edits)
+                if distance <= edits:
+                    scores[tid] = FUZZY_SCORE * (1.0 - distance / (len(word) + 1))
+
+        found = nlargest(self.max_expansions, scores.items(), key=itemgetter(1))
+        if len(self._expanded) > 4096:
+            self._expanded.clear()
+        self._expanded[key] = found
+        return found
+
+    def _score(self, pos: int, expansions: Dict[int, float]) -> float:
+        # the best score of one query word for a station, 0 if it does not match
+        best = 0.0
+        get = expansions.get
+        for tid in self._name_terms[self._name_offsets[pos]:self._name_offsets[pos + 1]]:
+            score = get(tid, 0.0)
+            if score > best:
+                best = score
+        for tid in self._tag_terms[self._tag_offsets[pos]:self._tag_offsets[pos + 1]]:
+            score = get(tid, 0.0) * self.tag_weight
+            if score > best:
+                best = score
+        return best
+
+    def scored(self, query: str, limit: int = 10, prefix: bool = True) -> List[Tuple[float, object]]:
+        """
+        Like `search`, but returns (score, station) tuples.
+        """
+        query_words = words(query)
+        last = len(query_words) - 1
+        expanded = [self.expand(word, prefix and i == last) for i, word in enumerate(query_words)]
+        # words matching nothing are dropped instead of emptying the result
+        expanded = [found for found in expanded if found]
+        if not expanded or limit <= 0:
+            return []
+
+        # walk the stations of the word with the fewest postings, taking the next station
+        # of the list with the highest bound until none can beat the best `limit` found
+        size = lambda found: sum(len(self._names[tid]) + len(self._tags[tid]) for tid, _ in found)
+        expanded.sort(key=size)
+        scores = [dict(found) for found in expanded]
+        rest = sum(found[0][1] for found in expanded[1:])
+        boost = self.boost
+
+        lists = []
+        for tid, score in expanded[0]:
+            for positions, weight in ((self._names[tid], score), (self._tags[tid], score * self.tag_weight)):
+                if positions:
+                    lists.append((-(weight + rest) * boost[positions[0]], len(lists), positions, weight + rest, 0))
+        lists.sort()
+
+        best, seen = [], set()
+        while lists:
+            bound, number, positions, weight, i = lists[0]
+            if len(best) == limit and (best[0][0] >= -bound or len(seen) >= self.max_candidates):
+                break
+            pos = positions[i]
+            if i + 1 < len(positions):
+                heapreplace(lists, (-weight * boost[positions[i + 1]], number, positions, weight, i + 1))
+            else:
+                heappop(lists)
+            if pos in seen:
+                continue
+            seen.add(pos)
+
+            total = 0.0
+            for word_scores in scores:
+                score = self._score(pos, word_scores)
+                if not score:
+                    break
+                total += score
+            else:
+                # ties go to the station listed first
+                item = (total * boost[pos], -pos)
+                if len(best) < limit:
+                    heappush(best, item)
+                elif item > best[0]:
+                    heapreplace(best, item)
+
+        stations = self.stations
+        return [(score, stations[-negated]) for score, negated in sorted(best, reverse=True)]
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> List:
+        """
+        The best matching stations for a free text query, e.g. 'radio paradis'.
+
+        Parameters
+        ----------
+        query : str
+            Words of the station name or tags, typos are tolerated.
+        limit : int, optional
+            The maximum number of stations. (Default is 10)
+        prefix : bool, optional
+            Complete the last word, for search as you type. (Default is True)
+        """
+        return [station for _, station in self.scored(query, limit, prefix)]
+
+    def complete(self, text: str, limit: int = 10) -> List[str]:
+        """
+        Vocabulary words completing or resembling the last word of `text`, best first.
+        """
+        query_words = words(text)
+        if not query_words:
+            return []
+        return [self.terms[tid] for tid, _ in self.expand(query_words[-1], True)[:limit]]
@@ -22,25 +22,130 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from random import choice
+
 import aiohttp
 from . import base_url
-from .errors import UnsupportedFormat
+from .errors import UnsupportedFormat, noHostFound
+from .mirrors import MirrorPool
+from .cache import ResponseCache, request_key
+from .stream import CHUNK_SIZE, make_parser
+from .transport import TransportConfig, shared_connector
+from .scheduler import Scheduler
+from .retry import RetryPolicy, is_retryable
+from .timeouts import AdaptiveTimeouts
+from .decoders import decode_xml, json_decoder
+from .compression import ACCEPT_ENCODING, Decompressor, decompress
+from .offload import DecodePool, to_records
+
+def endpoint_group(endpoint: str) -> str:
+    """
+    The endpoint without its search term, e.g. 'tags' for 'tags/jazz' and
+    'stations/search' for 'stations/search'.
+    """
+    parts = endpoint.strip('/').split('/')
+    if parts[0] == 'stations' and len(parts) > 1:
+        return '/'.join(parts[:2])
+    return parts[0]
+
+@asynccontextmanager
+async def _no_slot():
+    yield
 
 class HTTP:
-    def __init__(self, fmt, session = None):
-        self.session = aiohttp.ClientSession() if not session else session
+    def __init__(self, fmt, session = None, mirror_cache_file = None, mirror_pool = False, cache = None,
+                 coalesce = False, transport = None, share_connector = False, scheduler = None, retry = None,
+                 metrics = None, decoder = 'auto', raw = False, parse_xml = False, mirrors = None,
+                 timeouts = None, records = None, offload = None):
+        self.session = session
+        self.owns_session = session is None
+        self.transport = transport or TransportConfig()
+        self.share_connector = share_connector
         self.fmt = fmt
+        self.mirror_cache_file = mirror_cache_file
+        self.use_mirror_pool = mirror_pool
+        self.pool = None
+        self.cache = ResponseCache() if cache is True else cache if cache is not False else None
+        self.coalesce = coalesce
+        self.coalesce_stats = {'upstream': 0, 'coalesced': 0}
+        self._inflight = {}
+        self.scheduler = Scheduler() if scheduler is True else scheduler if scheduler is not False else None
+        self.retry = RetryPolicy() if retry is True else retry if retry is not False else None
+        self.timeouts = AdaptiveTimeouts() if timeouts is True else timeouts if timeouts is not False else None
+        if self.retry is not None and self.timeouts is not None:
+            # one window of latencies for the hedge delays and the timeouts
+            self.timeouts.latencies = self.retry.latencies
+        self.explicit_mirrors = [mirrors] if isinstance(mirrors, str) else list(mirrors or [])
+        self.mirrors = []
+        self._ready = None
+        self.metrics = metrics
+        self.decoder = json_decoder(decoder)
+        self.raw = raw
+        self.parse_xml = parse_xml
+        self.transfer = {'wire_bytes': 0, 'decoded_bytes': 0}
+        # applied to every station of the stations/ endpoints, e.g. Station.from_dict
+        self.records = records
+        if offload is True or isinstance(offload, str):
+            offload = DecodePool() if offload is True else DecodePool(offload)
+        self.offload = offload or None
     
+    def _open(self):
+        if self.owns_session and (self.session is None or self.session.closed):
+            connector = shared_connector(self.transport) if self.share_connector else None
+            trace_configs = self.metrics.trace_configs if self.metrics is not None else None
+            self.session = self.transport.session(connector, trace_configs)
+
+    async def close(self):
+        """
+        Close the session if it was created here. A shared connector stays open.
+        """
+        self._ready = None
+        self.mirrors = []
+        if self.pool is not None:
+            self.pool.close()
+        if self.offload is not None:
+            self.offload.close()
+        if self.owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def ready(self):
+        """
+        Run `init` once, shared by all concurrent callers. A failed init is
+        tried again by the next caller.
+        """
+        if self._ready is None or (self._ready.done() and (self._ready.cancelled() or self._ready.exception())):
+            self._ready = asyncio.ensure_future(self.init())
+        await asyncio.shield(self._ready)
+
     async def init(self):
-        self.route = await base_url.pick_url()
+        self._open()
+
+        if self.explicit_mirrors:
+            urls = [url.rstrip('/') for url in self.explicit_mirrors]
+        else:
+            urls = await base_url.get_radiobrowser_base_urls(cache_file=self.mirror_cache_file)
+        if not urls:
+            raise noHostFound("No hosts found.")
+        self.mirrors = urls
+
+        if self.use_mirror_pool:
+            self.pool = MirrorPool(urls)
+            await self.pool.probe(self.session, self.fmt.lower())
+            self.route = self.pool.best().url
+        else:
+            self.route = choice(urls)
 
-    async def request(self, endpoint: str, params = {}):
+    async def request(self, endpoint: str, params = {}, route = None):
         """
         A function to make a request to the API
 
         params:
         :endpoint: - the endpoint to request
         :fmt: - The return format. Can be JSON and XML
+        :route: - send the request to this mirror, retries may still go to others
         """
  
         POSSIBLE_FORMATS = ('xml', 'json')
@@ -48,10 +153,347 @@ class HTTP:
         if self.fmt.lower() not in POSSIBLE_FORMATS:
             raise UnsupportedFormat("Only xml and json formats are supported")
 
+        if not self.mirrors:
+            await self.ready()
+
+        headers = self._headers()
+
+        key = entry = None
+        if self.cache is not None and self.cache.ttl_for(endpoint) > 0:
+            key = self.cache.key(self.fmt, endpoint, params)
+            entry = self.cache.get(key)
+
+            if entry is not None:
+                if entry.fresh(time.monotonic()):
+                    if self.metrics is not None:
+                        self.metrics.cache_hit(endpoint_group(endpoint))
+                    return entry.value
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+
+        if self.coalesce:
+            return await self._coalesced(key or request_key(self.fmt, endpoint, params),
+                                         lambda: self._fetch(endpoint, params, headers, key, entry, route))
+
+        return await self._fetch(endpoint, params, headers, key, entry, route)
+
+    async def _coalesced(self, key, fetch):
+        """
+        Share one in-flight request between all concurrent callers with the same key.
+        The request is only cancelled when every caller waiting for it got cancelled.
+        """
+        flight = self._inflight.get(key)
+        if flight is None or flight[0].cancelled():
+            task = asyncio.ensure_future(fetch())
+            flight = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda t: self._land(key, t))
+            self.coalesce_stats['upstream'] += 1
+        else:
+            self.coalesce_stats['coalesced'] += 1
+            if self.metrics is not None:
+                self.metrics.coalesced_call(endpoint_group(key[1]))
+
+        task = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and flight[1] == 1:
+                # later callers start a new request instead of joining the cancelled one
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                task.cancel()
+            raise
+        finally:
+            flight[1] -= 1
+
+    def _land(self, key, task):
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # retrieved by the waiters, this keeps asyncio quiet when all of them left
+            task.exception()
+
+    async def _fetch(self, endpoint, params, headers, key = None, entry = None, route = None):
+        retry = self.retry if self.retry is not None and not endpoint.startswith('vote/') else None
+        if retry is None:
+            return await self._attempt(route or self._pick_route(()), endpoint, params, headers, key, entry)
+
+        tried = []
+        for attempt in range(retry.retries + 1):
+            route = route if attempt == 0 and route else self._pick_route(tried)
+            tried.append(route)
+            try:
+                return await self._hedged(retry, route, tried, endpoint, params, headers, key, entry)
+            except Exception as e:
+                if attempt == retry.retries or not is_retryable(e):
+                    raise
+                delay = retry.delay(attempt, e)
+            await asyncio.sleep(delay)
+
+    async def _hedged(self, retry, route, tried, endpoint, params, headers, key, entry):
+        """
+        Send the request to `route`, and to a second mirror as well if the
+        first one takes longer than the learned hedging delay.
+        """
+        delay = retry.hedge_delay(endpoint_group(endpoint))
+        if delay is None or len(self.mirrors) < 2:
+            return await self._attempt(route, endpoint, params, headers, key, entry)
+
+        tasks = [asyncio.ensure_future(self._attempt(route, endpoint, params, headers, key, entry))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                hedge_route = self._pick_route(tried)
+                tried.append(hedge_route)
+                retry.hedged += 1
+                tasks.append(asyncio.ensure_future(self._attempt(hedge_route, endpoint, params, headers, key, entry)))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            retry.hedges_won += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _pick_route(self, tried):
+        """
+        The best mirror that was not tried yet for this request.
+        """
+        if self.pool is not None:
+            self.pool.refresh(self.session, self.fmt.lower())
+            ranked = self.pool.ranked()
+            for mirror in ranked:
+                if mirror.url not in tried:
+                    return mirror.url
+            return ranked[0].url
+
+        if self.route not in tried:
+            return self.route
+        untried = [url for url in self.mirrors if url not in tried]
+        return choice(untried) if untried else self.route
+
+    async def _attempt(self, route, endpoint, params, headers, key, entry):
+        start = time.perf_counter()
+        try:
+            result = await self._get(route, endpoint, params, headers, key, entry)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if self.pool is not None:
+                self.pool.record_failure(route)
+            raise
+
+        elapsed = time.perf_counter() - start
+        if self.pool is not None:
+            self.pool.record_success(route, elapsed)
+            self.route = route
+        if self.retry is not None:
+            self.retry.record(endpoint_group(endpoint), elapsed)
+        elif self.timeouts is not None:
+            self.timeouts.record(endpoint_group(endpoint), elapsed)
+        return result
+
+    async def stream(self, endpoint: str, params = {}):
+        """
+        Like `request`, but decodes the response incrementally while it
+        arrives and yields the items of the result list one by one.
+
+        params:
+        :endpoint: - the endpoint to request
+        """
+        if self.fmt.lower() not in ('xml', 'json'):
+            raise UnsupportedFormat("Only xml and json formats are supported")
+
+        if not self.mirrors:
+            await self.ready()
+
+        headers = self._headers()
+        if self.pool is not None:
+            self.pool.refresh(self.session, self.fmt.lower())
+        route = self.route if self.pool is None else self.pool.best().url
+        parser = make_parser(self.fmt)
+        info = None
+        if self.metrics is not None:
+            info = {'endpoint': endpoint_group(endpoint), 'mirror': route, 'params': params}
+            self.metrics.request_started(info)
+
+        try:
+            async with self._slot(route, endpoint):
+                start = time.perf_counter()
+                size = wire_size = 0
+                decode_time = 0.0
+                async with self.session.get(f"{route}/{self.fmt}/{endpoint}", params=params, headers = headers) as resp:
+                    if resp.status >= 500 or resp.status == 429:
+                        resp.raise_for_status()
+
+                    decompressor = self._decompressor(resp)
+                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                        wire_size += len(chunk)
+                        decode_start = time.perf_counter()
+                        chunk = decompressor.feed(chunk)
+                        size += len(chunk)
+                        items = parser.feed(chunk)
+                        decode_time += time.perf_counter() - decode_start
+                        for item in items:
+                            yield item
+
+                    tail = decompressor.flush()
+                    size += len(tail)
+                    for item in parser.feed(tail) + parser.close():
+                        yield item
+                    status = resp.status
+                    self.transfer['wire_bytes'] += wire_size
+                    self.transfer['decoded_bytes'] += size
+                elapsed = time.perf_counter() - start
+        except BaseException as e:
+            if self.pool is not None and isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                self.pool.record_failure(route)
+            if info is not None:
+                info['error'] = e
+                self.metrics.request_ended(info)
+            raise
+
+        if self.pool is not None:
+            self.pool.record_success(route, elapsed)
+        if info is not None:
+            # includes the time the consumer spent between the items
+            info.update(status=status, size=size, wire_size=wire_size, network_time=elapsed - decode_time,
+                        decode_time=decode_time, error=None)
+            self.metrics.request_ended(info)
+
+    def _headers(self):
         headers = {"content-type": f"application/{self.fmt}", "User-Agent": "aioradios/dev"}
+        if self.owns_session:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING if self.transport.compression else "identity"
+        return headers
+
+    def _decompressor(self, resp):
+        """
+        A decompressor for the body of `resp`, passing it through if aiohttp
+        already decompresses it.
+        """
+        if not self.owns_session and getattr(self.session, "auto_decompress", True):
+            return Decompressor(None)
+        return Decompressor(resp.headers.get("Content-Encoding"))
+
+    async def _read_body(self, resp):
+        """
+        The body as it arrived, the number of bytes it took on the wire and the
+        content encoding it still has to be decompressed from.
+        """
+        encoding = self._decompressor(resp).encoding
+        data = await resp.read()
+        if encoding == 'identity':
+            # aiohttp may have decompressed it, then only Content-Length knows the wire size
+            wire_size = resp.content_length if resp.headers.get("Content-Encoding") and resp.content_length else len(data)
+        else:
+            wire_size = len(data)
+
+        self.transfer['wire_bytes'] += wire_size
+        return data, wire_size, encoding
+
+    def _body_decoder(self, resp):
+        """
+        The function decoding the body of `resp` into a result list, None if it
+        is returned as it is.
+        """
+        if self.raw:
+            return None
+
+        if self.fmt.lower() == 'json':
+            if 'json' not in resp.content_type:
+                raise aiohttp.ContentTypeError(resp.request_info, resp.history, status=resp.status,
+                                               message=f"Attempt to decode JSON with unexpected mimetype: {resp.content_type}",
+                                               headers=resp.headers)
+            return self.decoder
+
+        return decode_xml if self.parse_xml else None
+
+    def _decode(self, resp, body, records = None):
+        decode = self._body_decoder(resp)
+        if decode is None:
+            return body if self.raw else body.decode(resp.get_encoding())
+        return to_records(decode(body), records)
+
+    def _timeout(self, limit):
+        """
+        The session timeout with the total replaced by the adaptive `limit`.
+        """
+        if limit is None:
+            return {}
+        # ClientSession.timeout is public since aiohttp 3.7
+        base = getattr(self.session, 'timeout', None) or getattr(self.session, '_timeout', None)
+        if not isinstance(base, aiohttp.ClientTimeout):
+            base = self.transport.timeout()
+        return {'timeout': aiohttp.ClientTimeout(total=limit, connect=base.connect, sock_read=base.sock_read,
+                                                 sock_connect=base.sock_connect)}
+
+    def _slot(self, route, endpoint):
+        if self.scheduler is None:
+            return _no_slot()
+        return self.scheduler.slot(route, self.scheduler.priority_for(endpoint))
+
+    async def _get(self, route, endpoint, params, headers, key = None, entry = None):
+        info = None
+        if self.metrics is not None:
+            info = {'endpoint': endpoint_group(endpoint), 'mirror': route, 'params': params}
+            self.metrics.request_started(info)
+
+        limit = self.timeouts.timeout_for(endpoint_group(endpoint)) if self.timeouts is not None else None
+        try:
+            async with self._slot(route, endpoint):
+                start = time.perf_counter()
+                async with self.session.get(f"{route}/{self.fmt}/{endpoint}", params=params, headers = headers,
+                                            **self._timeout(limit)) as resp:
+                    if resp.status == 304 and entry is not None:
+                        self.cache.revalidated(key, entry)
+                        result, size, wire_size = entry.value, 0, 0
+                        network_time, decode_time = time.perf_counter() - start, 0.0
+                    else:
+                        if resp.status >= 500 or resp.status == 429:
+                            resp.raise_for_status()
+
+                        data, wire_size, encoding = await self._read_body(resp)
+                        decode_start = time.perf_counter()
+                        records = self.records if endpoint.startswith('stations') else None
+                        decode = self._body_decoder(resp)
+                        if self.offload is not None and self.offload.wants(data, encoding):
+                            # decompressed in the pool too, inflating a dump would block the loop
+                            result, size = await self.offload.decode_body(decode, data, encoding, records,
+                                                                          sliced=self.fmt.lower() == 'json')
+                            if decode is None and not self.raw:
+                                result = result.decode(resp.get_encoding())
+                        else:
+                            body = decompress(data, encoding)
+                            size = len(body)
+                            result = self._decode(resp, body, records)
+                        self.transfer['decoded_bytes'] += size
+                        decode_time = time.perf_counter() - decode_start
+                        network_time = decode_start - start
+
+                        if key is not None and resp.status == 200:
+                            self.cache.put(key, result, size, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                    status = resp.status
+        except BaseException as e:
+            if isinstance(e, asyncio.TimeoutError) and self.timeouts is not None:
+                self.timeouts.timed_out(endpoint_group(endpoint), limit)
+            if info is not None:
+                info['error'] = e
+                self.metrics.request_ended(info)
+            raise
 
-        async with self.session.get(f"{self.route}/{self.fmt}/{endpoint}", params=params, headers = headers) as resp:
-            if self.fmt.lower() == 'json':
-                return await resp.json()
-            elif self.fmt.lower() == 'xml':
-                return await resp.text()
\ No newline at end of file
+        if info is not None:
+            info.update(status=status, size=size, wire_size=wire_size, network_time=network_time,
+                        decode_time=decode_time, error=None)
+            self.metrics.request_ended(info)
+        return result
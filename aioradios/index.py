@@ -0,0 +1,270 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+from .station import split_tags, _to_int
+
+# Fields matched by substring unless `<field>_exact` is set.
+TEXT_FIELDS = ('name', 'country', 'state', 'language')
+# Fields with an exact-match index.
+FACET_FIELDS = ('name', 'country', 'countrycode', 'state', 'language', 'codec')
+# Name searches with more matches than this filter the names lazily.
+NAME_MATCH_CAP = 256
+# Numeric fields with a presorted array.
+NUMERIC_FIELDS = ('bitrate', 'votes', 'clickcount')
+
+
+def _text(value) -> str:
+    return value.casefold() if isinstance(value, str) else ''
+
+def _flag(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() == 'true'
+    return bool(value)
+
+def _sort_key(station, order: str):
+    value = station.get(order)
+    if isinstance(value, tuple):
+        value = ','.join(value)
+    if isinstance(value, str):
+        return (1, value.casefold())
+    return (0, value) if isinstance(value, (int, float)) else (-1, 0)
+
+
+class StationIndex:
+    """
+    An in-memory index over a full station list, answering the station
+    searches locally.
+
+    The stations are kept as given (dicts or `Station` records) and returned
+    as they are, the results follow the semantics of the radio-browser
+    server: case-insensitive substring matches unless the `_exact` flag is
+    set, exact matches for countrycode, codec and tag_list.
+
+    Example:
+    ```
+    index = StationIndex(await rb.stations())
+    index.search(tag='jazz', countrycode='DE', order='votes', reverse=True, limit=10)
+    ```
+    """
+
+    def __init__(self, stations: Iterable):
+        self.stations = list(stations)
+        self.by_uuid: Dict[str, object] = {}
+        self.by_url: Dict[str, List[int]] = {}
+        self.facets: Dict[str, Dict[str, List[int]]] = {field: {} for field in FACET_FIELDS}
+        self.by_tag: Dict[str, List[int]] = {}
+        self._names: List[str] = []
+        self._ok: List[bool] = []
+        self._tags: List[tuple] = []
+        self._numbers: Dict[str, List[int]] = {field: [] for field in NUMERIC_FIELDS}
+        self._sorted: Dict[str, tuple] = {}
+        self._rank: Dict[str, List[int]] = {}
+
+        for pos, station in enumerate(self.stations):
+            uuid = station.get('stationuuid')
+            if uuid:
+                self.by_uuid[uuid] = station
+
+            for key in ('url', 'url_resolved'):
+                url = station.get(key)
+                if url:
+                    positions = self.by_url.setdefault(url, [])
+                    if not positions or positions[-1] != pos:
+                        positions.append(pos)
+
+            for field in FACET_FIELDS:
+                self.facets[field].setdefault(_text(station.get(field)), []).append(pos)
+
+            tags = tuple(tag.casefold() for tag in split_tags(station.get('tags')))
+            self._tags.append(tags)
+            for tag in tags:
+                self.by_tag.setdefault(tag, []).append(pos)
+
+            self._names.append(_text(station.get('name')))
+            self._ok.append(_to_int(station.get('lastcheckok')) != 0)
+            for field in NUMERIC_FIELDS:
+                self._numbers[field].append(_to_int(station.get(field)))
+
+        for field in NUMERIC_FIELDS:
+            self._index_order(field, self._numbers[field].__getitem__)
+        self._index_order('name', self._names.__getitem__)
+
+        # all names in one string, rare substrings are found with str.find
+        self._name_blob = '\n'.join(self._names) + '\n'
+        self._name_starts = []
+        start = 0
+        for name in self._names:
+            self._name_starts.append(start)
+            start += len(name) + 1
+
+    def _index_order(self, field, key):
+        order = sorted(range(len(self.stations)), key=key)
+        rank = [0] * len(order)
+        for i, pos in enumerate(order):
+            rank[pos] = i
+
+        self._sorted[field] = (order, [key(pos) for pos in order])
+        self._rank[field] = rank
+
+    def __len__(self):
+        return len(self.stations)
+
+    def by_uuids(self, uuids) -> List:
+        """
+        Stations with an exact UUID match, `uuids` is a list or a comma-separated string.
+        """
+        if isinstance(uuids, str):
+            uuids = uuids.split(',')
+        found = (self.by_uuid.get(uuid.strip()) for uuid in uuids)
+        return [station for station in found if station is not None]
+
+    def by_url_match(self, url: str) -> List:
+        """
+        Stations whose url or url_resolved is exactly `url`.
+        """
+        return [self.stations[pos] for pos in self.by_url.get(url, ())]
+
+    def _name_matches(self, value: str, cap: int) -> Optional[List[int]]:
+        """
+        Positions of the names containing `value`, None if there are more than `cap`.
+        """
+        blob, starts, names = self._name_blob, self._name_starts, self._names
+        positions = []
+        found = blob.find(value)
+        while found != -1:
+            if len(positions) == cap:
+                return None
+            pos = bisect_right(starts, found) - 1
+            positions.append(pos)
+            found = blob.find(value, starts[pos] + len(names[pos]) + 1)
+        return positions
+
+    def _range(self, field: str, low: Optional[int], high: Optional[int]) -> List[int]:
+        order, values = self._sorted[field]
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return order[start:end]
+
+    def search(self, **kwargs) -> List:
+        """
+        Advanced search, takes the parameters of `RadioBrowser.search`.
+        """
+        matches = []
+        filters = []
+
+        for field in TEXT_FIELDS:
+            value = kwargs.get(field)
+            if not value:
+                continue
+            value = _text(value)
+
+            if _flag(kwargs.get(f'{field}_exact')):
+                matches.append(self.facets[field].get(value, ()))
+            elif field == 'name':
+                # common substrings are cheaper to test lazily while walking the result order
+                positions = None if '\n' in value else self._name_matches(value, NAME_MATCH_CAP)
+                if positions is None:
+                    names = self._names
+                    filters.append(lambda pos, value=value: value in names[pos])
+                else:
+                    matches.append(positions)
+            else:
+                found = [positions for key, positions in self.facets[field].items() if value in key]
+                matches.append([pos for positions in found for pos in positions])
+
+        for field in ('countrycode', 'codec'):
+            if kwargs.get(field):
+                matches.append(self.facets[field].get(_text(kwargs[field]), ()))
+
+        tag = kwargs.get('tag')
+        if tag:
+            tag = _text(tag)
+            if _flag(kwargs.get('tag_exact')):
+                matches.append(self.by_tag.get(tag, ()))
+            else:
+                found = [positions for key, positions in self.by_tag.items() if tag in key]
+                matches.append([pos for positions in found for pos in positions])
+
+        if kwargs.get('tag_list'):
+            for tag in kwargs['tag_list'].split(','):
+                if tag.strip():
+                    matches.append(self.by_tag.get(_text(tag.strip()), ()))
+
+        candidates = None
+        if matches:
+            matches.sort(key=len)
+            candidates = set(matches[0])
+            for positions in matches[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(positions)
+
+        low, high = kwargs.get('bitrate_min'), kwargs.get('bitrate_max')
+        if low is not None or high is not None:
+            low = -1 if low is None else _to_int(low)
+            high = float('inf') if high is None else _to_int(high)
+            if candidates is None:
+                candidates = set(self._range('bitrate', low, high))
+            else:
+                bitrates = self._numbers['bitrate']
+                candidates = {pos for pos in candidates if low <= bitrates[pos] <= high}
+
+        offset = _to_int(kwargs.get('offset', 0))
+        limit = _to_int(kwargs.get('limit', 100000))
+        order = kwargs.get('order', 'name')
+        reverse = _flag(kwargs.get('reverse', False))
+
+        if order in self._sorted and (candidates is None or self._dense(candidates, offset + limit)):
+            positions = self._sorted[order][0]
+            positions = reversed(positions) if reverse else positions
+            if candidates is not None:
+                positions = filter(candidates.__contains__, positions)
+        else:
+            # ties keep their index order, reversed along with the rest like the presorted orders
+            positions = range(len(self.stations)) if candidates is None else sorted(candidates)
+            if order in self._rank:
+                positions = sorted(positions, key=self._rank[order].__getitem__, reverse=reverse)
+            else:
+                stations = self.stations
+                positions = sorted(positions, key=lambda pos: _sort_key(stations[pos], order))
+                if reverse:
+                    positions.reverse()
+
+        if _flag(kwargs.get('hidebroken')):
+            filters.append(self._ok.__getitem__)
+        for accept in filters:
+            positions = filter(accept, positions)
+
+        stations = self.stations
+        return [stations[pos] for pos in islice(positions, offset, offset + limit)]
+
+    def _dense(self, candidates: set, needed: int) -> bool:
+        # walking the presorted order until `needed` candidates turned up is
+        # cheaper than sorting the candidates
+        expected = needed * len(self.stations) / max(len(candidates), 1)
+        return expected < len(candidates) * max(len(candidates).bit_length(), 1)
+
@@ -0,0 +1,72 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class LatencyTracker:
+    """
+    The recent latencies of every endpoint group, e.g. 'tags' or
+    'stations/search'. A client shares one between the hedging of its
+    `RetryPolicy` and its `AdaptiveTimeouts`.
+
+    ...
+
+    Attributes
+    ----------
+    window : int
+        Number of recent latencies kept per endpoint group.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._sorted: Dict[str, List[float]] = {}
+
+    def record(self, group: str, latency: float):
+        samples = self._samples.get(group)
+        if samples is None:
+            samples = self._samples[group] = deque(maxlen=self.window)
+        samples.append(latency)
+        self._sorted.pop(group, None)
+
+    def count(self, group: str) -> int:
+        samples = self._samples.get(group)
+        return len(samples) if samples is not None else 0
+
+    def groups(self) -> List[str]:
+        return list(self._samples)
+
+    def percentile(self, group: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        The nearest-rank `percentile` (e.g. 0.99) of the recent latencies of
+        the group, None with fewer than `min_samples` of them.
+        """
+        if self.count(group) < max(min_samples, 1):
+            return None
+
+        ordered = self._sorted.get(group)
+        if ordered is None:
+            ordered = self._sorted[group] = sorted(self._samples[group])
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
@@ -0,0 +1,205 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 8192, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the style of Prometheus.
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the `q` quantile.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def snapshot(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+        }
+
+
+def _labels(**labels) -> str:
+    return ','.join('%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"')) for key, value in labels.items())
+
+
+class Metrics:
+    """
+    Per-endpoint and per-mirror request metrics, and hooks called around
+    every request.
+
+    The hooks get a dict with the endpoint, mirror and params when a request
+    starts, and additionally the status, size, wire_size, network_time,
+    decode_time and error when it ends. `size` is the decompressed size of
+    the body and `wire_size` the size it had on the wire. Every started
+    request ends, a cancelled one, e.g. by a timeout, a lost hedge or a
+    stream closed early, with the CancelledError or GeneratorExit as its
+    error. `trace_configs` are added to the session created by the client,
+    for hooking into aiohttp itself.
+
+    Example:
+    ```
+    metrics = Metrics()
+    rb = RadioBrowser(metrics=metrics)
+    ...
+    print(metrics.prometheus())
+    ```
+    """
+
+    def __init__(self, trace_configs: Optional[List[aiohttp.TraceConfig]] = None):
+        self.trace_configs = list(trace_configs or [])
+        self.on_request_start: List[Callable[[dict], None]] = []
+        self.on_request_end: List[Callable[[dict], None]] = []
+        self.latency: Dict[str, Histogram] = defaultdict(Histogram)
+        self.mirror_latency: Dict[str, Histogram] = defaultdict(Histogram)
+        self.decode_time: Dict[str, Histogram] = defaultdict(Histogram)
+        self.size: Dict[str, Histogram] = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.statuses: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.cache_hits: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+        self.wire_bytes: Dict[str, int] = defaultdict(int)
+        self.decoded_bytes: Dict[str, int] = defaultdict(int)
+
+    def request_started(self, info: dict):
+        for hook in self.on_request_start:
+            hook(info)
+
+    def request_ended(self, info: dict):
+        endpoint, mirror = info['endpoint'], info['mirror']
+
+        if info.get('error') is not None:
+            self.errors[(endpoint, mirror)] += 1
+        else:
+            self.latency[endpoint].observe(info['network_time'] + info['decode_time'])
+            self.mirror_latency[mirror].observe(info['network_time'])
+            self.decode_time[endpoint].observe(info['decode_time'])
+            self.size[endpoint].observe(info['size'])
+            self.wire_bytes[endpoint] += info.get('wire_size', info['size'])
+            self.decoded_bytes[endpoint] += info['size']
+            self.statuses[(endpoint, info['status'])] += 1
+
+        for hook in self.on_request_end:
+            hook(info)
+
+    def cache_hit(self, endpoint: str):
+        self.cache_hits[endpoint] += 1
+
+    def coalesced_call(self, endpoint: str):
+        self.coalesced[endpoint] += 1
+
+    def snapshot(self) -> dict:
+        endpoints = {}
+        for endpoint in set(self.latency) | set(self.cache_hits) | set(self.coalesced) | {e for e, _ in self.errors}:
+            requests = self.latency[endpoint].count if endpoint in self.latency else 0
+            served = requests + self.cache_hits.get(endpoint, 0) + self.coalesced.get(endpoint, 0)
+            wire, decoded = self.wire_bytes.get(endpoint, 0), self.decoded_bytes.get(endpoint, 0)
+            endpoints[endpoint] = {
+                'latency': self.latency[endpoint].snapshot() if endpoint in self.latency else None,
+                'decode_time': self.decode_time[endpoint].snapshot() if endpoint in self.decode_time else None,
+                'size': self.size[endpoint].snapshot() if endpoint in self.size else None,
+                'wire_bytes': wire,
+                'decoded_bytes': decoded,
+                'compression_ratio': decoded / wire if wire else 1.0,
+                'statuses': {str(status): count for (e, status), count in self.statuses.items() if e == endpoint},
+                'errors': sum(count for (e, _), count in self.errors.items() if e == endpoint),
+                'cache_hit_rate': self.cache_hits.get(endpoint, 0) / served if served else 0.0,
+                'coalesced_rate': self.coalesced.get(endpoint, 0) / served if served else 0.0,
+            }
+
+        return {
+            'endpoints': endpoints,
+            'mirrors': {mirror: histogram.snapshot() for mirror, histogram in self.mirror_latency.items()},
+        }
+
+    def prometheus(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def histograms(name, help, label, histograms):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for value, histogram in sorted(histograms.items()):
+                seen = 0
+                for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                    seen += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{{{_labels(**{label: value})},le=\"{le}\"}} {seen}")
+                lines.append(f"{name}_sum{{{_labels(**{label: value})}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{_labels(**{label: value})}}} {histogram.count}")
+
+        def counters(name, help, labels, values):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} counter")
+            for key, count in sorted(values.items()):
+                key = key if isinstance(key, tuple) else (key,)
+                lines.append(f"{name}{{{_labels(**dict(zip(labels, key)))}}} {count}")
+
+        histograms('aioradios_request_duration_seconds', 'Request latency including decoding.', 'endpoint', self.latency)
+        histograms('aioradios_mirror_request_duration_seconds', 'Network time per mirror.', 'mirror', self.mirror_latency)
+        histograms('aioradios_decode_duration_seconds', 'Time spent decoding responses.', 'endpoint', self.decode_time)
+        histograms('aioradios_response_size_bytes', 'Decompressed size of the response bodies.', 'endpoint', self.size)
+        counters('aioradios_wire_bytes_total', 'Response body bytes received on the wire.', ('endpoint',), self.wire_bytes)
+        counters('aioradios_decoded_bytes_total', 'Response body bytes after decompression.', ('endpoint',), self.decoded_bytes)
+        counters('aioradios_responses_total', 'Responses by status.', ('endpoint', 'status'), self.statuses)
+        counters('aioradios_request_errors_total', 'Failed requests.', ('endpoint', 'mirror'), self.errors)
+        counters('aioradios_cache_hits_total', 'Calls answered from the response cache.', ('endpoint',), self.cache_hits)
+        counters('aioradios_coalesced_total', 'Calls that shared an in-flight request.', ('endpoint',), self.coalesced)
+
+        return '\n'.join(lines) + '\n'
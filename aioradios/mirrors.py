@@ -0,0 +1,198 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+
+class Mirror:
+    """
+    Health and latency bookkeeping for a single radio-browser mirror.
+
+    ...
+
+    Attributes
+    ----------
+    url : str
+        The base url of the mirror.
+    rtt : float
+        Exponentially weighted moving average of the response time in seconds,
+        None until the mirror answered once.
+    error_rate : float
+        Exponentially weighted moving average of failed requests, between 0 and 1.
+    failures : int
+        Number of consecutive failures.
+    ejected_until : float
+        Monotonic time until which the circuit breaker keeps the mirror out of
+        rotation, 0 while it is in rotation. Once it passed, the mirror is
+        half-open and gets a trial request.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.rtt = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self):
+        return f"<Mirror url={self.url!r} rtt={self.rtt} error_rate={self.error_rate:.3f} failures={self.failures}>"
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until == 0.0
+
+    def half_open(self, now: float) -> bool:
+        return 0.0 < self.ejected_until <= now
+
+    def score(self, default_rtt: float) -> float:
+        rtt = self.rtt if self.rtt is not None else default_rtt
+        return rtt * (1 + 10 * self.error_rate)
+
+
+class MirrorPool:
+    """
+    Ranks mirrors by measured latency and error rate and keeps failing ones
+    out of rotation with a circuit breaker.
+
+    After its cooldown an ejected mirror is half-open: `refresh` sends it a
+    single trial request, and it is back in rotation with a clean error
+    rate if that succeeds, or ejected for another cooldown if not. `refresh`
+    also measures all mirrors again every `reprobe_interval` seconds, so
+    the ranking follows mirrors that got slower or faster.
+
+    ...
+
+    Attributes
+    ----------
+    alpha : float
+        Weight of the newest sample in the moving averages.
+    failure_threshold : int
+        Consecutive failures after which a mirror gets ejected.
+    cooldown : float
+        Seconds an ejected mirror stays out of rotation before it gets another chance.
+    reprobe_interval : float
+        Seconds after which all mirrors are measured again, None to never.
+    """
+
+    def __init__(self, urls: List[str], alpha: float = 0.3, failure_threshold: int = 3, cooldown: float = 30.0,
+                 reprobe_interval: float = 300.0):
+        self.mirrors: Dict[str, Mirror] = {url: Mirror(url) for url in urls}
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.reprobe_interval = reprobe_interval
+        self.probed = time.monotonic()
+        self._refresh = None
+
+    def __len__(self):
+        return len(self.mirrors)
+
+    def record_success(self, url: str, rtt: float):
+        mirror = self.mirrors.get(url)
+        if mirror is None:
+            return
+
+        mirror.rtt = rtt if mirror.rtt is None else self.alpha * rtt + (1 - self.alpha) * mirror.rtt
+        # a re-admitted mirror starts over, its old errors would keep it at the end of the ranking
+        mirror.error_rate = 0.0 if mirror.ejected_until else (1 - self.alpha) * mirror.error_rate
+        mirror.failures = 0
+        mirror.ejected_until = 0.0
+
+    def record_failure(self, url: str):
+        mirror = self.mirrors.get(url)
+        if mirror is None:
+            return
+
+        mirror.error_rate = self.alpha + (1 - self.alpha) * mirror.error_rate
+        mirror.failures += 1
+
+        if mirror.failures >= self.failure_threshold:
+            mirror.ejected_until = time.monotonic() + self.cooldown
+
+    def ranked(self) -> List[Mirror]:
+        """
+        All mirrors, best first. Ejected mirrors come last, ordered by the
+        end of their cooldown.
+        """
+        now = time.monotonic()
+        known = [m.rtt for m in self.mirrors.values() if m.rtt is not None]
+        default_rtt = max(known) if known else 1.0
+
+        return sorted(self.mirrors.values(),
+                      key=lambda m: (not m.available(now), 0.0 if m.available(now) else m.ejected_until,
+                                     m.score(default_rtt)))
+
+    def best(self) -> Mirror:
+        """
+        The healthy mirror with the best score.
+        """
+        return self.ranked()[0]
+
+    async def _probe_one(self, session: aiohttp.ClientSession, url: str, fmt: str, timeout: float):
+        start = time.perf_counter()
+        try:
+            async with session.get(f"{url}/{fmt}/stats", timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                await resp.read()
+                ok = resp.status < 500
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            ok = False
+
+        if ok:
+            self.record_success(url, time.perf_counter() - start)
+        else:
+            self.record_failure(url)
+
+    async def probe(self, session: aiohttp.ClientSession, fmt: str = 'json', timeout: float = 5.0,
+                    urls: Optional[List[str]] = None):
+        """
+        Measure every mirror, or the given ones, concurrently.
+        """
+        if urls is None:
+            self.probed = time.monotonic()
+        await asyncio.gather(*(self._probe_one(session, url, fmt, timeout) for url in (urls or self.mirrors)))
+
+    def refresh(self, session: aiohttp.ClientSession, fmt: str = 'json'):
+        """
+        Probe the half-open mirrors in the background, or all mirrors but the
+        ejected ones once `reprobe_interval` passed. Does nothing while the
+        last refresh still runs.
+        """
+        if self._refresh is not None and not self._refresh.done():
+            return
+
+        now = time.monotonic()
+        if self.reprobe_interval is not None and now - self.probed >= self.reprobe_interval:
+            self.probed = now
+            urls = [m.url for m in self.mirrors.values() if m.ejected_until <= now]
+        else:
+            urls = [m.url for m in self.mirrors.values() if m.half_open(now)]
+        if urls:
+            self._refresh = asyncio.ensure_future(self.probe(session, fmt, urls=urls))
+
+    def close(self):
+        if self._refresh is not None and not self._refresh.done():
+            self._refresh.cancel()
+        self._refresh = None
@@ -0,0 +1,198 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import pickle
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, Union
+
+from .compression import decompress
+
+# Bodies from this size on are decoded off the event loop.
+OFFLOAD_THRESHOLD = 512 * 1024
+# Compressed bodies count this many times their size, about what gzip gets out of station lists.
+COMPRESSION_RATIO = 8
+# Bytes of a JSON array decoded per call in a thread, the event loop can run between calls.
+SLICE_SIZE = 1024 * 1024
+# Items pickled together when a process returns a decoded list.
+CHUNK_ITEMS = 2000
+
+_BETWEEN_OBJECTS = re.compile(rb'}\s*,\s*{')
+
+
+def to_records(result, records: Optional[Callable] = None):
+    """
+    Apply `records` to every item of a decoded list, e.g. `Station.from_dict`.
+    """
+    if records is None or not isinstance(result, list):
+        return result
+    return [records(item) for item in result]
+
+
+def decode_sliced(decode: Callable[[bytes], object], body: bytes, size: int = SLICE_SIZE):
+    """
+    Decode a JSON array of objects `size` bytes at a time. A decoder written
+    in C keeps the GIL for a whole call, in slices the other threads get it
+    between them. Falls back to one call when the body cannot be sliced.
+    """
+    body = body.strip()
+    if len(body) <= size or not (body.startswith(b'[{') and body.endswith(b'}]')):
+        return decode(body)
+
+    # a "},{" inside a string leaves that string unterminated in its slice,
+    # which fails to decode and falls back
+    items = []
+    start, end = 1, len(body) - 1
+    try:
+        while start < end:
+            found = _BETWEEN_OBJECTS.search(body, start + size, end)
+            cut = end if found is None else found.start() + 1
+            part = decode(b'[' + body[start:cut] + b']')
+            if not isinstance(part, list):
+                return decode(body)
+            items.extend(part)
+            start = end if found is None else found.end() - 1
+    except ValueError:
+        return decode(body)
+    return items
+
+
+def _decode_in_thread(decode, data, encoding, records, sliced):
+    body = decompress(data, encoding)
+    if decode is None:
+        return body, len(body)
+    result = decode_sliced(decode, body) if sliced else decode(body)
+    return to_records(result, records), len(body)
+
+def _decode_in_process(decode, data, encoding, records):
+    body = decompress(data, encoding)
+    if decode is None:
+        return body, len(body)
+    result = to_records(decode(body), records)
+    if not isinstance(result, list):
+        return result, len(body)
+    # unpickled chunk by chunk, so the event loop is not blocked by one long call
+    return _Chunks(pickle.dumps(result[i:i + CHUNK_ITEMS], pickle.HIGHEST_PROTOCOL)
+                   for i in range(0, len(result), CHUNK_ITEMS)), len(body)
+
+def _load_chunks(chunks) -> List:
+    items = []
+    for chunk in chunks:
+        items.extend(pickle.loads(chunk))
+    return items
+
+
+class _Chunks(list):
+    pass
+
+
+class DecodePool:
+    """
+    Decodes large response bodies, including the `Station` records of a
+    typed client, in a thread or process pool instead of the event loop.
+
+    A `stations/` dump takes about a second to decode and turn into records,
+    during which no other coroutine would run. With 'thread', JSON arrays are
+    decoded in slices so the event loop gets the GIL in between. With
+    'process', several bodies are decoded in parallel on multiple cores and
+    the result is unpickled in chunks in a thread, the decoder and the record
+    type have to be picklable (module level functions and classes are).
+    Compressed bodies are decompressed in the pool as well, a gzip'd dump
+    inflates to about ten times its size.
+
+    Example:
+    ```
+    rb = RadioBrowser(typed=True, offload='process')
+    stations = await rb.stations()
+    ```
+
+    ...
+
+    Attributes
+    ----------
+    threshold : int
+        Bodies from this size in bytes on are offloaded.
+    offloaded : int
+        Number of bodies decoded in the pool.
+    """
+
+    def __init__(self, executor: Union[str, Executor] = 'thread', threshold: int = OFFLOAD_THRESHOLD,
+                 max_workers: Optional[int] = None):
+        if not isinstance(executor, Executor) and executor not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor {executor!r}, use 'thread', 'process' or an Executor")
+        self.kind = executor if isinstance(executor, str) else \
+            'process' if isinstance(executor, ProcessPoolExecutor) else 'thread'
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.offloaded = 0
+        self._executor = executor if isinstance(executor, Executor) else None
+        self._owns_executor = self._executor is None
+
+    def wants(self, body: bytes, encoding: Optional[str] = None) -> bool:
+        """
+        Whether `body`, sent with the content `encoding`, is large enough to offload.
+        """
+        compressed = encoding not in (None, 'identity')
+        return len(body) * (COMPRESSION_RATIO if compressed else 1) >= self.threshold
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            pool = ProcessPoolExecutor if self.kind == 'process' else ThreadPoolExecutor
+            self._executor = pool(max_workers=self.max_workers)
+        return self._executor
+
+    async def decode(self, decode: Callable[[bytes], object], body: bytes, records: Optional[Callable] = None,
+                     sliced: bool = False):
+        """
+        `to_records(decode(body), records)` in the pool. `sliced` decodes a JSON
+        array in slices in a thread pool.
+        """
+        result, _ = await self.decode_body(decode, body, None, records, sliced)
+        return result
+
+    async def decode_body(self, decode: Optional[Callable[[bytes], object]], data: bytes, encoding: Optional[str],
+                          records: Optional[Callable] = None, sliced: bool = False) -> Tuple[object, int]:
+        """
+        Decompress `data` sent with the content `encoding` and decode it like
+        `decode`, all in the pool. Returns the result and the decompressed
+        size, a None `decode` returns the decompressed bytes.
+        """
+        loop = asyncio.get_event_loop()
+        self.offloaded += 1
+        if self.kind == 'thread':
+            return await loop.run_in_executor(self.executor, _decode_in_thread, decode, data, encoding, records, sliced)
+
+        result, size = await loop.run_in_executor(self.executor, _decode_in_process, decode, data, encoding, records)
+        if isinstance(result, _Chunks):
+            result = await loop.run_in_executor(None, _load_chunks, result)
+        return result, size
+
+    def close(self):
+        """
+        Shut the pool down if it was created here, it is created again when needed.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
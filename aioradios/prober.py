@@ -0,0 +1,274 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Content types of playable audio streams.
+AUDIO_TYPES = ('audio/', 'application/ogg', 'video/mp2t', 'application/octet-stream')
+PLAYLIST_TYPES = ('audio/x-scpls', 'audio/mpegurl', 'audio/x-mpegurl', 'application/pls+xml', 'video/x-ms-asf',
+                  'audio/x-ms-wax', 'application/xspf+xml')
+HLS_TYPES = ('application/vnd.apple.mpegurl', 'application/x-mpegurl')
+
+# Leading bytes of common audio containers and frames.
+AUDIO_MAGIC = (b'ID3', b'OggS', b'fLaC', b'RIFF', b'\x1a\x45\xdf\xa3')
+
+
+def _is_audio_frame(data: bytes) -> bool:
+    if data.startswith(AUDIO_MAGIC):
+        return True
+    # MPEG audio and ADTS AAC frames start with an 11/12 bit sync word
+    return len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0
+
+
+def classify(status: int, content_type: str, data: bytes) -> str:
+    """
+    Classify a stream response by status, content type and first bytes:
+    'audio', 'hls', 'playlist', 'html' or 'error'.
+    """
+    if status >= 400:
+        return 'error'
+    head = data.lstrip()[:64].lower()
+    if content_type in HLS_TYPES or (head.startswith(b'#extm3u') and b'#ext-x-' in data.lower()):
+        return 'hls'
+    if content_type in PLAYLIST_TYPES or head.startswith((b'#extm3u', b'[playlist]', b'<asx', b'<?xml')):
+        return 'playlist'
+    if content_type.startswith(AUDIO_TYPES) or _is_audio_frame(data):
+        return 'audio'
+    if content_type.startswith('text/html') or head.startswith((b'<!doctype', b'<html')):
+        return 'html'
+    return 'error'
+
+
+class ProbeResult:
+    """
+    The outcome of one stream check.
+
+    ...
+
+    Attributes
+    ----------
+    url : str
+        The probed url.
+    ok : bool
+        The url serves an audio stream, an HLS playlist or a playlist.
+    kind : str
+        'audio', 'hls', 'playlist', 'html' or 'error'.
+    status : int
+        HTTP status, None if there was no response.
+    content_type : str
+        The response content type.
+    final_url : str
+        The url after redirects.
+    icy : dict
+        The icy-* headers, e.g. icy-name, icy-genre, icy-br and icy-metaint.
+    bitrate : int
+        Bitrate from the icy-br header, None if not sent.
+    latency : float
+        Seconds until the first bytes were read.
+    error : str
+        Why the check failed, None if it got a response.
+    checked : float
+        `time.time()` of the check.
+    """
+
+    __slots__ = ('url', 'ok', 'kind', 'status', 'content_type', 'final_url', 'icy', 'bitrate', 'latency',
+                 'error', 'checked')
+
+    def __init__(self, url: str, kind: str, status: Optional[int] = None, content_type: str = '',
+                 final_url: Optional[str] = None, icy: Optional[Dict[str, str]] = None, latency: float = 0.0,
+                 error: Optional[str] = None):
+        self.url = url
+        self.kind = kind
+        self.ok = kind in ('audio', 'hls', 'playlist')
+        self.status = status
+        self.content_type = content_type
+        self.final_url = final_url or url
+        self.icy = icy or {}
+        bitrate = self.icy.get('icy-br', '').split(',')[0].strip()
+        self.bitrate = int(bitrate) if bitrate.isdigit() else None
+        self.latency = latency
+        self.error = error
+        self.checked = time.time()
+
+    def __repr__(self):
+        return f"<ProbeResult {self.kind} ok={self.ok} status={self.status} url={self.url!r}>"
+
+
+def station_url(station) -> Optional[str]:
+    return station.get('url_resolved') or station.get('url')
+
+
+class StreamProber:
+    """
+    Checks station stream urls concurrently: at most `concurrency` checks at
+    once and `per_host` per stream host. A check reads the status, headers
+    and the first `read_bytes` bytes, then drops the connection. Results are
+    cached for `ttl` seconds, failures for `failure_ttl` seconds, and
+    concurrent checks of one url share a request.
+
+    Example:
+    ```
+    async with StreamProber() as prober:
+        stations = await prober.healthy(await rb.search(tag='jazz'))
+    ```
+
+    ...
+
+    Attributes
+    ----------
+    hits, misses : int
+        Counters of the result cache.
+    """
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, concurrency: int = 32, per_host: int = 4,
+                 timeout: float = 5.0, read_bytes: int = 4096, ttl: float = 600, failure_ttl: float = 60,
+                 max_entries: int = 10000):
+        self.session = session
+        self.owns_session = session is None
+        self.per_host = per_host
+        self.timeout = timeout
+        self.read_bytes = read_bytes
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._concurrency = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._results: 'OrderedDict[str, ProbeResult]' = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def close(self):
+        """
+        Close the session if it was created here.
+        """
+        if self.owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def cached(self, url: str) -> Optional[ProbeResult]:
+        """
+        The cached result for `url`, None if there is none or it expired.
+        """
+        result = self._results.get(url)
+        if result is None:
+            return None
+        if time.time() - result.checked >= (self.ttl if result.ok else self.failure_ttl):
+            del self._results[url]
+            return None
+        self._results.move_to_end(url)
+        return result
+
+    def _store(self, result: ProbeResult):
+        self._results[result.url] = result
+        self._results.move_to_end(result.url)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def probe(self, url: str) -> ProbeResult:
+        """
+        Check one stream url, answered from the cache when possible.
+        """
+        result = self.cached(url)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+
+        future = self._inflight.get(url)
+        if future is None:
+            future = self._inflight[url] = asyncio.ensure_future(self._check(url))
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(future)
+
+    async def probe_stations(self, stations: Iterable) -> List[Optional[ProbeResult]]:
+        """
+        Check the streams of the stations (dicts or `Station` records) from any
+        RadioBrowser call. The results are in the order of the stations, None
+        for a station without url.
+        """
+        urls = [station_url(station) for station in stations]
+        checks = {url: self.probe(url) for url in set(urls) if url}
+        results = dict(zip(checks, await asyncio.gather(*checks.values())))
+        return [results.get(url) for url in urls]
+
+    async def healthy(self, stations: Iterable) -> List:
+        """
+        The stations whose stream checked out, in their order.
+        """
+        stations = list(stations)
+        results = await self.probe_stations(stations)
+        return [station for station, result in zip(stations, results) if result is not None and result.ok]
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def _check(self, url: str) -> ProbeResult:
+        if self.session is None or self.session.closed:
+            # the semaphores limit the connections
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+
+        async with self._host_limit(url), self._concurrency:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self._read(url, start), self.timeout)
+            except asyncio.TimeoutError:
+                result = ProbeResult(url, 'error', latency=time.perf_counter() - start, error='timeout')
+            except aiohttp.ClientResponseError as e:
+                latency = time.perf_counter() - start
+                if 'ICY 200' in str(e.message):
+                    # SHOUTcast v1 answers with 'ICY 200 OK', which aiohttp rejects as a bad status line
+                    result = ProbeResult(url, 'audio', 200, latency=latency)
+                else:
+                    result = ProbeResult(url, 'error', e.status, latency=latency, error=e.message)
+            except (aiohttp.ClientError, ValueError, OSError) as e:
+                result = ProbeResult(url, 'error', latency=time.perf_counter() - start,
+                                     error=str(e) or type(e).__name__)
+        self._store(result)
+        return result
+
+    async def _read(self, url: str, start: float) -> ProbeResult:
+        headers = {'Icy-MetaData': '1', 'User-Agent': 'aioradios/dev'}
+        async with self.session.get(url, headers=headers) as resp:
+            data = await resp.content.read(self.read_bytes) if resp.status < 400 else b''
+            latency = time.perf_counter() - start
+            icy = {key.lower(): value for key, value in resp.headers.items() if key.lower().startswith('icy-')}
+            kind = classify(resp.status, resp.content_type.lower(), data)
+            # an endless stream must not go back to the pool half read
+            resp.close()
+        return ProbeResult(url, kind, resp.status, resp.content_type, str(resp.url), icy, latency)
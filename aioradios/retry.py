@@ -0,0 +1,128 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import aiohttp
+
+from .latency import LatencyTracker
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed request may succeed on another try: connection
+    problems, timeouts, rate limits and server errors.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Seconds the Retry-After header of a 429 or 503 response asks to wait,
+    given in seconds or as a date, None without one.
+    """
+    if not isinstance(error, aiohttp.ClientResponseError) or error.status not in (429, 503) or not error.headers:
+        return None
+    value = error.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retries and hedging for idempotent requests.
+
+    A failed request is retried on another mirror after an exponential
+    backoff with full jitter, or as long as the Retry-After header of a
+    throttled mirror asks, up to `max_retry_after`. With hedging, a request that has not been
+    answered within the `hedge_percentile` of the recent latencies of its
+    endpoint is sent to a second mirror as well, the first answer wins.
+
+    ...
+
+    Attributes
+    ----------
+    retries : int
+        Number of retries after the first attempt.
+    backoff : float
+        Base delay in seconds before the first retry, doubled for every further one.
+    max_backoff : float
+        Upper bound of the delay before a retry.
+    max_retry_after : float
+        Upper bound of the delay a Retry-After header can ask for.
+    hedge_percentile : float
+        Latency percentile (e.g. 0.95) after which a hedged request is sent, None to disable hedging.
+    min_samples : int
+        Latency samples an endpoint needs before its requests get hedged.
+    latencies : LatencyTracker
+        The recent latencies per endpoint, keeping `window` of them.
+    """
+
+    def __init__(self, retries: int = 2, backoff: float = 0.1, max_backoff: float = 2.0,
+                 hedge_percentile: Optional[float] = None, min_samples: int = 20, window: int = 200,
+                 latencies: Optional[LatencyTracker] = None, max_retry_after: float = 30.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.latencies = latencies if latencies is not None else LatencyTracker(window)
+        self.hedged = 0
+        self.hedges_won = 0
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Seconds to wait before retry number `attempt`, counting from 0, after
+        the attempt failed with `error`.
+        """
+        backoff = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        after = retry_after(error) if error is not None else None
+        if after is None:
+            return backoff
+        return max(backoff, min(after, self.max_retry_after))
+
+    def record(self, group: str, latency: float):
+        self.latencies.record(group, latency)
+
+    def percentile(self, group: str, percentile: float) -> Optional[float]:
+        return self.latencies.percentile(group, percentile, self.min_samples)
+
+    def hedge_delay(self, group: str) -> Optional[float]:
+        if self.hedge_percentile is None:
+            return None
+        return self.percentile(group, self.hedge_percentile)
@@ -0,0 +1,204 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+# Priority classes, lower runs first.
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', NORMAL: 'normal', BACKGROUND: 'background'}
+
+ENDPOINT_PRIORITIES = {
+    'stations/search': INTERACTIVE,
+    'stations/byurl': INTERACTIVE,
+    'stations/byuuid': INTERACTIVE,
+    'vote': INTERACTIVE,
+    'stations/': BACKGROUND,
+    'stations/changed': BACKGROUND,
+}
+
+# The server accepts one vote per station and IP every 10 minutes.
+VOTE_INTERVAL = 600
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average and bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+
+class Scheduler:
+    """
+    Limits the outgoing requests: at most `concurrency` at once in total and
+    `rate` per second per mirror. Waiting requests are served by priority
+    class, so an interactive search overtakes a queued background crawl.
+
+    ...
+
+    Attributes
+    ----------
+    concurrency : int
+        Maximum number of requests running at once.
+    rate : float
+        Requests per second per mirror, None for no limit.
+    burst : float
+        Requests a mirror may get at once before `rate` applies.
+    """
+
+    def __init__(self, concurrency: int = 8, rate: Optional[float] = None, burst: Optional[float] = None,
+                 priorities: Optional[Dict[str, int]] = None):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 1.0)
+        self.priorities = dict(ENDPOINT_PRIORITIES if priorities is None else priorities)
+        self.active = 0
+        self.dropped_votes = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waiters = []
+        self._seq = itertools.count()
+        self._waits = {priority: [0, 0.0, 0.0] for priority in PRIORITY_NAMES}
+        self._votes: Dict[str, float] = {}
+
+    def priority_for(self, endpoint: str) -> int:
+        if endpoint in self.priorities:
+            return self.priorities[endpoint]
+        return self.priorities.get(endpoint.split('/', 1)[0], NORMAL)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    async def _acquire(self, priority: int):
+        if self.active < self.concurrency and not self.queued:
+            self.active += 1
+            return
+
+        waiter = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just before the cancellation
+                self._release()
+            raise
+
+    def _release(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, route: str, priority: int = NORMAL):
+        """
+        Wait for a turn to send a request to `route`.
+        """
+        start = time.monotonic()
+        await self._acquire(priority)
+        try:
+            if self.rate:
+                bucket = self._buckets.get(route)
+                if bucket is None:
+                    bucket = self._buckets[route] = TokenBucket(self.rate, self.burst)
+                await bucket.acquire()
+
+            waited = time.monotonic() - start
+            stats = self._waits.setdefault(priority, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+
+            yield
+        finally:
+            self._release()
+
+    def allow_vote(self, uuid: str) -> bool:
+        """
+        Whether a vote for the station would be accepted, recording it if so.
+        Call `forget_vote` if the vote then fails to reach the server.
+        """
+        now = time.monotonic()
+        if now - self._votes.get(uuid, -VOTE_INTERVAL) < VOTE_INTERVAL:
+            self.dropped_votes += 1
+            return False
+
+        self._votes[uuid] = now
+        if len(self._votes) > 10000:
+            self._votes = {key: at for key, at in self._votes.items() if now - at < VOTE_INTERVAL}
+        return True
+
+    def forget_vote(self, uuid: str):
+        """
+        Undo the record of `allow_vote` for a vote that was not delivered.
+        """
+        self._votes.pop(uuid, None)
+
+    def stats(self) -> dict:
+        queued = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, waiter in self._waiters:
+            if not waiter.done():
+                queued[PRIORITY_NAMES.get(priority, str(priority))] += 1
+
+        wait = {}
+        for priority, (count, total, longest) in self._waits.items():
+            wait[PRIORITY_NAMES.get(priority, str(priority))] = {
+                'count': count,
+                'mean': total / count if count else 0.0,
+                'max': longest,
+            }
+
+        return {
+            'active': self.active,
+            'queued': sum(queued.values()),
+            'queued_by_priority': queued,
+            'wait': wait,
+            'dropped_votes': self.dropped_votes,
+        }
@@ -0,0 +1,275 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import json
+import sqlite3
+import time
+from typing import Iterable, List, Optional
+
+from .decoders import json_decoder
+from .files import _atomic_write
+from .index import TEXT_FIELDS, _flag, _sort_key, _text
+from .station import Station, split_tags, _to_int
+
+SNAPSHOT_VERSION = 1
+
+# Casefolded copies of the fields the searches filter on.
+KEY_FIELDS = ('name', 'country', 'countrycode', 'state', 'language', 'codec')
+NUMBER_FIELDS = ('bitrate', 'votes', 'clickcount', 'lastcheckok')
+ORDER_COLUMNS = {field: f"{field}_key" for field in KEY_FIELDS}
+ORDER_COLUMNS.update({field: field for field in NUMBER_FIELDS})
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE stations (
+    id INTEGER PRIMARY KEY,
+    stationuuid TEXT,
+    url TEXT,
+    url_resolved TEXT,
+    %s,
+    %s,
+    data TEXT NOT NULL
+);
+CREATE TABLE tags (tag TEXT NOT NULL, station INTEGER NOT NULL);
+""" % (',\n    '.join(f"{field}_key TEXT" for field in KEY_FIELDS),
+       ',\n    '.join(f"{field} INTEGER" for field in NUMBER_FIELDS))
+
+_INDEXES = """
+CREATE INDEX stations_uuid ON stations (stationuuid);
+CREATE INDEX stations_url ON stations (url);
+CREATE INDEX stations_url_resolved ON stations (url_resolved);
+CREATE INDEX stations_name ON stations (name_key);
+CREATE INDEX stations_countrycode ON stations (countrycode_key);
+CREATE INDEX stations_codec ON stations (codec_key);
+CREATE INDEX stations_language ON stations (language_key);
+CREATE INDEX stations_country ON stations (country_key);
+CREATE INDEX stations_bitrate ON stations (bitrate);
+CREATE INDEX stations_votes ON stations (votes);
+CREATE INDEX stations_clickcount ON stations (clickcount);
+CREATE INDEX tags_tag ON tags (tag, station);
+ANALYZE;
+"""
+
+
+def _row(id: int, station: dict, dumps):
+    return ((id, station.get('stationuuid'), station.get('url'), station.get('url_resolved'))
+            + tuple(_text(station.get(field)) for field in KEY_FIELDS)
+            + tuple(_to_int(station.get(field)) for field in NUMBER_FIELDS)
+            + (dumps(station),))
+
+
+def write_snapshot(path: str, stations: Iterable, timestamp: Optional[float] = None) -> int:
+    """
+    Write the stations (dicts or `Station` records) to a snapshot file at
+    `path`, stamped with `timestamp` (default now). The file is built next
+    to `path` and moved over it at once, so readers never see a partial
+    snapshot. Returns the number of stations written.
+    """
+    dumps = json.dumps
+    timestamp = time.time() if timestamp is None else timestamp
+    with _atomic_write(path) as tmp:
+        db = sqlite3.connect(tmp)
+        try:
+            db.execute("PRAGMA journal_mode = OFF")
+            db.execute("PRAGMA synchronous = OFF")
+            db.executescript(_SCHEMA)
+
+            count = 0
+            rows, tags = [], []
+            columns = 4 + len(KEY_FIELDS) + len(NUMBER_FIELDS) + 1
+            insert = f"INSERT INTO stations VALUES ({', '.join('?' * columns)})"
+            for station in stations:
+                if isinstance(station, Station):
+                    station = station.to_dict()
+                count += 1
+                rows.append(_row(count, station, dumps))
+                tags.extend((tag.casefold(), count) for tag in set(split_tags(station.get('tags'))))
+                if len(rows) == 10000:
+                    db.executemany(insert, rows)
+                    rows.clear()
+            db.executemany(insert, rows)
+            db.executemany("INSERT INTO tags VALUES (?, ?)", tags)
+            db.executescript(_INDEXES)
+            db.executemany("INSERT INTO meta VALUES (?, ?)",
+                           [('version', SNAPSHOT_VERSION), ('timestamp', timestamp), ('count', count)])
+            db.commit()
+        finally:
+            db.close()
+    return count
+
+
+class StationSnapshot:
+    """
+    A read-only view of a station snapshot file, shared by any number of
+    processes.
+
+    Lookups by stationuuid and url and the common search filters run as
+    indexed SQLite queries, so opening a snapshot is all a new process
+    needs instead of downloading the full station list. `timestamp` is
+    when the snapshot was taken, refreshing it is up to the caller, e.g.
+    with `RadioBrowser.snapshot(path, max_age=...)`.
+
+    Example:
+    ```
+    with StationSnapshot('stations.db') as snapshot:
+        if snapshot.age < 3600:
+            snapshot.search(tag='jazz', countrycode='DE', order='votes', reverse=True, limit=10)
+    ```
+    """
+
+    def __init__(self, path: str, typed: bool = False, decoder='auto'):
+        self.path = path
+        self.typed = typed
+        self._loads = json_decoder(decoder)
+        # the file is only ever replaced, never changed in place
+        self._db = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        self.version = meta.get('version')
+        self.timestamp = meta['timestamp']
+        self.count = meta['count']
+
+    @property
+    def age(self) -> float:
+        """
+        Seconds since the snapshot was taken.
+        """
+        return time.time() - self.timestamp
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _records(self, rows) -> List:
+        loads = self._loads
+        if self.typed:
+            return [Station.from_dict(loads(data)) for data, in rows]
+        return [loads(data) for data, in rows]
+
+    def stations(self) -> List:
+        """
+        All stations, in the order they were written.
+        """
+        return self._records(self._db.execute("SELECT data FROM stations ORDER BY id"))
+
+    def by_uuid(self, uuid: str):
+        """
+        The station with the given stationuuid, None if there is none.
+        """
+        found = self._records(self._db.execute("SELECT data FROM stations WHERE stationuuid = ?", (uuid,)))
+        return found[0] if found else None
+
+    def by_uuids(self, uuids) -> List:
+        """
+        Stations with an exact UUID match, `uuids` is a list or a comma-separated string.
+        """
+        if isinstance(uuids, str):
+            uuids = uuids.split(',')
+        uuids = [uuid.strip() for uuid in uuids]
+        found = {}
+        # stay below the default limit of 999 parameters per query
+        for start in range(0, len(uuids), 900):
+            chunk = uuids[start:start + 900]
+            rows = self._db.execute(f"SELECT stationuuid, data FROM stations WHERE stationuuid IN "
+                                    f"({', '.join('?' * len(chunk))})", chunk)
+            for uuid, data in rows:
+                found.setdefault(uuid, data)
+        return self._records((found[uuid],) for uuid in uuids if uuid in found)
+
+    def by_url_match(self, url: str) -> List:
+        """
+        Stations whose url or url_resolved is exactly `url`.
+        """
+        return self._records(self._db.execute(
+            "SELECT data FROM stations WHERE url = ? OR url_resolved = ? ORDER BY id", (url, url)))
+
+    def search(self, **kwargs) -> List:
+        """
+        Advanced search, takes the parameters of `RadioBrowser.search` and
+        matches like `StationIndex.search`.
+        """
+        where, params = [], []
+
+        for field in TEXT_FIELDS:
+            value = kwargs.get(field)
+            if not value:
+                continue
+            if _flag(kwargs.get(f'{field}_exact')):
+                where.append(f"{field}_key = ?")
+            else:
+                where.append(f"instr({field}_key, ?) > 0")
+            params.append(_text(value))
+
+        for field in ('countrycode', 'codec'):
+            if kwargs.get(field):
+                where.append(f"{field}_key = ?")
+                params.append(_text(kwargs[field]))
+
+        tag = kwargs.get('tag')
+        if tag:
+            if _flag(kwargs.get('tag_exact')):
+                where.append("id IN (SELECT station FROM tags WHERE tag = ?)")
+            else:
+                where.append("id IN (SELECT station FROM tags WHERE instr(tag, ?) > 0)")
+            params.append(_text(tag))
+
+        if kwargs.get('tag_list'):
+            for tag in kwargs['tag_list'].split(','):
+                if tag.strip():
+                    where.append("id IN (SELECT station FROM tags WHERE tag = ?)")
+                    params.append(_text(tag.strip()))
+
+        if kwargs.get('bitrate_min') is not None:
+            where.append("bitrate >= ?")
+            params.append(_to_int(kwargs['bitrate_min']))
+        if kwargs.get('bitrate_max') is not None:
+            where.append("bitrate <= ?")
+            params.append(_to_int(kwargs['bitrate_max']))
+        if _flag(kwargs.get('hidebroken')):
+            where.append("lastcheckok != 0")
+
+        offset = _to_int(kwargs.get('offset', 0))
+        limit = _to_int(kwargs.get('limit', 100000))
+        order = kwargs.get('order', 'name')
+        direction = "DESC" if _flag(kwargs.get('reverse', False)) else "ASC"
+
+        query = "SELECT data FROM stations"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        if order in ORDER_COLUMNS:
+            query += f" ORDER BY {ORDER_COLUMNS[order]} {direction}, id {direction} LIMIT ? OFFSET ?"
+            return self._records(self._db.execute(query, params + [limit, offset]))
+
+        stations = self._records(self._db.execute(query + " ORDER BY id", params))
+        stations.sort(key=lambda station: _sort_key(station, order))
+        if direction == "DESC":
+            stations.reverse()
+        return stations[offset:offset + limit]
+
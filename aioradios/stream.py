@@ -0,0 +1,158 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import codecs
+import json
+from typing import List
+from xml.etree.ElementTree import XMLPullParser
+
+from .decoders import xml_item
+
+# Size of the chunks read from the response body.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+class JSONArrayParser:
+    """
+    Incrementally decodes a JSON array, returning its items as soon as they
+    are complete. Input that is not a JSON array raises a ValueError, at the
+    latest on `close`.
+
+    Example:
+    ```
+    parser = JSONArrayParser()
+    parser.feed(b'[{"name": "a"}, {"na')   # [{'name': 'a'}]
+    parser.feed(b'me": "b"}]')             # [{'name': 'b'}]
+    parser.close()
+    ```
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._started = False
+        self._done = False
+
+    def feed(self, data: bytes) -> List:
+        self._buf += self._text.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> List:
+        self._buf += self._text.decode(b'', final=True)
+        items = self._parse(final=True)
+
+        if not self._done:
+            raise ValueError("Incomplete JSON array")
+        return items
+
+    def _parse(self, final: bool) -> List:
+        buf = self._buf
+        pos = 0
+        items = []
+
+        while not self._done:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buf):
+                break
+
+            if not self._started:
+                if buf[pos] != '[':
+                    raise ValueError("Expected a JSON array")
+                self._started = True
+                pos += 1
+                continue
+
+            if buf[pos] == ']':
+                self._done = True
+                pos += 1
+                break
+
+            if buf[pos] == ',':
+                pos += 1
+                continue
+
+            try:
+                item, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+
+            # a number or literal is only complete once a delimiter follows it
+            if not final and not isinstance(item, (dict, list, str)) and (end == len(buf) or buf[end] not in _DELIMITERS):
+                break
+
+            items.append(item)
+            pos = end
+
+        self._buf = buf[pos:]
+        return items
+
+
+class XMLListParser:
+    """
+    Incrementally decodes a radio-browser XML result, returning the
+    attributes of every element below the root as a dict, like `decode_xml`.
+    Malformed XML raises an `xml.etree.ElementTree.ParseError`.
+    """
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=('start', 'end'))
+        self._root = None
+        self._depth = 0
+
+    def feed(self, data: bytes) -> List[dict]:
+        self._parser.feed(data)
+        return self._collect()
+
+    def close(self) -> List[dict]:
+        self._parser.close()
+        return self._collect()
+
+    def _collect(self) -> List[dict]:
+        items = []
+
+        for event, elem in self._parser.read_events():
+            if event == 'start':
+                if self._root is None:
+                    self._root = elem
+                self._depth += 1
+                continue
+
+            self._depth -= 1
+            if self._depth == 1:
+                items.append(xml_item(elem.attrib))
+                self._root.remove(elem)
+
+        return items
+
+
+def make_parser(fmt: str):
+    if fmt.lower() == 'json':
+        return JSONArrayParser()
+    return XMLListParser()
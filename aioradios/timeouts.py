@@ -0,0 +1,132 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+import functools
+import inspect
+from typing import Dict, Optional
+
+from .latency import LatencyTracker
+
+
+def with_timeout(method):
+    """
+    Give an API method a keyword-only `timeout` in seconds, defaulting to the
+    `timeout` of the client. It bounds the whole call, including the mirror
+    discovery, connecting and reading the body. An async generator gets it
+    for each item instead, the time the consumer spends between the items
+    does not count, so long crawls and dumps are not cut off. When it
+    expires the call is cancelled, which closes its connections, and
+    asyncio.TimeoutError is raised.
+    """
+    if inspect.isasyncgenfunction(method):
+        @functools.wraps(method)
+        async def generator(self, *args, timeout: Optional[float] = None, **kwargs):
+            timeout = self.timeout if timeout is None else timeout
+            iterator = method(self, *args, **kwargs)
+            if timeout is None:
+                async for item in iterator:
+                    yield item
+                return
+
+            try:
+                while True:
+                    try:
+                        item = await asyncio.wait_for(iterator.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        return
+                    yield item
+            finally:
+                await iterator.aclose()
+        return generator
+
+    @functools.wraps(method)
+    async def call(self, *args, timeout: Optional[float] = None, **kwargs):
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is None:
+            return await method(self, *args, **kwargs)
+        return await asyncio.wait_for(method(self, *args, **kwargs), timeout)
+    return call
+
+
+class AdaptiveTimeouts:
+    """
+    Per-endpoint request timeouts learned from the observed latencies: the
+    `percentile` of the recent latencies of an endpoint times `multiplier`,
+    kept between `min_timeout` and `max_timeout`. Endpoints with fewer than
+    `min_samples` latencies use `initial`, None for the session timeout.
+
+    A `tags` listing and a full `stations/` dump thus get limits that fit
+    them, and a hung mirror is given up on early, e.g. to retry elsewhere
+    with a `RetryPolicy`.
+
+    A request that timed out is recorded with the limit it ran into, as a
+    latency it took at least. When an endpoint gets slower than its limit,
+    these samples soon reach the percentile and the limit grows by
+    `multiplier`, instead of every request timing out from then on.
+
+    ...
+
+    Attributes
+    ----------
+    timeouts : int
+        Number of requests that timed out.
+    latencies : LatencyTracker
+        The recent latencies per endpoint, keeping `window` of them. A client
+        with a `RetryPolicy` as well uses the one of the policy.
+    """
+
+    def __init__(self, percentile: float = 0.99, multiplier: float = 3.0, min_timeout: float = 1.0,
+                 max_timeout: float = 300.0, initial: Optional[float] = None, min_samples: int = 20,
+                 window: int = 200, latencies: Optional[LatencyTracker] = None):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.initial = initial
+        self.min_samples = min_samples
+        self.timeouts = 0
+        self.latencies = latencies if latencies is not None else LatencyTracker(window)
+
+    def record(self, group: str, latency: float):
+        self.latencies.record(group, latency)
+
+    def timed_out(self, group: str, limit: Optional[float]):
+        """
+        Record a request to the endpoint group that ran into `limit`.
+        """
+        self.timeouts += 1
+        if limit is not None:
+            self.record(group, limit)
+
+    def timeout_for(self, group: str) -> Optional[float]:
+        """
+        The timeout in seconds for a request to the endpoint group.
+        """
+        observed = self.latencies.percentile(group, self.percentile, self.min_samples)
+        if observed is None:
+            return self.initial
+        return min(self.max_timeout, max(self.min_timeout, observed * self.multiplier))
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {group: self.timeout_for(group) for group in self.latencies.groups()}
@@ -0,0 +1,119 @@
+"""
+MIT License
+
+Copyright (c) 2020 P3qch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+
+class TransportConfig:
+    """
+    Connection pool and timeout settings for the aiohttp session.
+
+    ...
+
+    Attributes
+    ----------
+    limit : int
+        Maximum number of open connections, 0 for no limit.
+    limit_per_host : int
+        Maximum number of open connections to a single mirror, 0 for no limit.
+    keepalive_timeout : float
+        Seconds an idle connection is kept open for reuse.
+    ttl_dns_cache : float
+        Seconds a resolved mirror address is cached, None to cache forever.
+    total_timeout : float
+        Seconds a whole request may take, including reading the body. None for no limit.
+    connect_timeout : float
+        Seconds for getting a connection from the pool, including connecting.
+    sock_read_timeout : float
+        Seconds between two reads of the response body.
+    compression : bool
+        Ask the mirrors for gzip, deflate or (with brotli installed) br encoded
+        responses and decompress them in the client, which then knows the
+        wire size of every response. False asks for uncompressed responses.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30.0,
+                 ttl_dns_cache: Optional[float] = 300, total_timeout: Optional[float] = 300,
+                 connect_timeout: Optional[float] = 10.0, sock_read_timeout: Optional[float] = 60.0,
+                 compression: bool = True):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.total_timeout = total_timeout
+        self.connect_timeout = connect_timeout
+        self.sock_read_timeout = sock_read_timeout
+        self.compression = compression
+
+    def _key(self) -> Tuple:
+        return (self.limit, self.limit_per_host, self.keepalive_timeout, self.ttl_dns_cache)
+
+    def connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                    keepalive_timeout=self.keepalive_timeout,
+                                    ttl_dns_cache=self.ttl_dns_cache, use_dns_cache=True)
+
+    def timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=self.total_timeout, sock_connect=self.connect_timeout,
+                                     connect=self.connect_timeout, sock_read=self.sock_read_timeout)
+
+    def session(self, connector: Optional[aiohttp.TCPConnector] = None,
+                trace_configs: Optional[List[aiohttp.TraceConfig]] = None) -> aiohttp.ClientSession:
+        """
+        Create a session with these settings. A given connector is not closed with the session.
+        Responses are left compressed, see `compression`.
+        """
+        if connector is None:
+            return aiohttp.ClientSession(connector=self.connector(), timeout=self.timeout(),
+                                         trace_configs=trace_configs, auto_decompress=False)
+        return aiohttp.ClientSession(connector=connector, connector_owner=False, timeout=self.timeout(),
+                                     trace_configs=trace_configs, auto_decompress=False)
+
+
+_shared_connectors: Dict[Tuple, aiohttp.TCPConnector] = {}
+
+
+def shared_connector(config: Optional[TransportConfig] = None) -> aiohttp.TCPConnector:
+    """
+    The connector shared by all clients of the running event loop with the
+    same pool settings.
+    """
+    config = config or TransportConfig()
+    key = (id(asyncio.get_event_loop()),) + config._key()
+
+    connector = _shared_connectors.get(key)
+    if connector is None or connector.closed:
+        connector = _shared_connectors[key] = config.connector()
+    return connector
+
+
+async def close_shared_connectors():
+    """
+    Close the shared connectors of the running event loop.
+    """
+    loop_id = id(asyncio.get_event_loop())
+    for key in [key for key in _shared_connectors if key[0] == loop_id]:
+        await _shared_connectors.pop(key).close()
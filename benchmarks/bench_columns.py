@@ -0,0 +1,81 @@
+"""
+Aggregate reports over a full station dump: looping over the dicts against
+the columns of StationColumns, and the peak memory of building the columns
+from the stream against building them from the decoded list.
+
+    python -m benchmarks.bench_columns
+"""
+import asyncio
+import time
+import tracemalloc
+from bisect import bisect_right
+from collections import Counter, defaultdict
+
+from aioradios import RadioBrowser
+from aioradios.columns import StationColumns, numpy
+
+from .fixtures import load_stations
+from .server import ServerProcess, patch_discovery
+
+EDGES = (32, 64, 96, 128, 192, 256, 320)
+
+
+def dict_reports(stations):
+    bitrates = [0] * (len(EDGES) + 1)
+    votes, clicks = defaultdict(int), defaultdict(int)
+    codecs = Counter()
+    for station in stations:
+        bitrates[bisect_right(EDGES, int(station["bitrate"] or 0))] += 1
+        votes[station["country"]] += int(station["votes"] or 0)
+        clicks[station["country"]] += int(station["clickcount"] or 0)
+        codecs[station["codec"]] += 1
+    hq = sum(1 for station in stations if station["codec"] == "MP3" and int(station["bitrate"] or 0) >= 192)
+    return bitrates, votes, clicks, codecs, hq
+
+
+def column_reports(columns):
+    return (columns.histogram("bitrate", EDGES), columns.sum_by("country", "votes"),
+            columns.sum_by("country", "clickcount"), columns.share("codec"),
+            len(columns.where(codec="MP3", bitrate_min=192)))
+
+
+def timed(function, *args):
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def peak(build):
+    tracemalloc.start()
+    async with RadioBrowser() as client:
+        await build(client)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+async def main(url, stations):
+    patch_discovery(url)
+    columns = StationColumns.from_stations(stations)
+    print(f"{len(stations)} stations, numpy {'on' if numpy is not None else 'off'}")
+    print(f"build columns   {timed(StationColumns.from_stations, stations) * 1000:8.1f} ms")
+    print(f"reports: dicts  {timed(dict_reports, stations) * 1000:8.1f} ms")
+    print(f"reports: columns{timed(column_reports, columns) * 1000:8.1f} ms")
+
+    async def from_list(client):
+        StationColumns.from_stations(await client.stations(limit=10000000))
+
+    async def from_stream(client):
+        await client.station_columns()
+
+    print(f"peak memory, list then columns {await peak(from_list) / 2**20:7.1f} MiB")
+    print(f"peak memory, streamed columns  {await peak(from_stream) / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    stations = load_stations()
+    with ServerProcess(stations) as server:
+        asyncio.run(main(server.url, stations))
@@ -0,0 +1,47 @@
+"""
+Wire bytes and fetch time of a full station dump with and without
+compression, and the transfer time that saves on a slower link.
+
+    python -m benchmarks.bench_compression
+"""
+import asyncio
+import time
+
+from aioradios import RadioBrowser, TransportConfig
+
+from .fixtures import load_stations
+from .server import ServerProcess, patch_discovery
+
+ROUNDS = 3
+LINK_MBIT = 50
+
+
+async def fetch(compression, streamed):
+    best = float("inf")
+    async with RadioBrowser(transport=TransportConfig(compression=compression)) as client:
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            if streamed:
+                async for _ in client.stream_stations():
+                    pass
+            else:
+                await client.stations()
+            best = min(best, time.perf_counter() - start)
+        transfer = client.http.transfer
+    return best, transfer["wire_bytes"] // ROUNDS, transfer["decoded_bytes"] // ROUNDS
+
+
+async def main(url):
+    patch_discovery(url)
+    print(f"{'case':20} {'wire MiB':>9} {'body MiB':>9} {'local ms':>9} {f'@{LINK_MBIT}Mbit s':>10}")
+    for compression in (False, True):
+        for streamed in (False, True):
+            best, wire, decoded = await fetch(compression, streamed)
+            label = ("compressed" if compression else "identity") + (":stream" if streamed else ":request")
+            print(f"{label:20} {wire / 2**20:9.2f} {decoded / 2**20:9.2f} {best * 1000:9.1f}"
+                  f" {wire * 8 / (LINK_MBIT * 1e6) + best:10.2f}")
+
+
+if __name__ == "__main__":
+    with ServerProcess(load_stations(), compress=True) as server:
+        asyncio.run(main(server.url))
@@ -0,0 +1,49 @@
+"""
+A facet sweep (every country, language and tag) run serially against one
+mirror, against the Crawler spreading it over several mirrors.
+
+    python -m benchmarks.bench_crawler
+"""
+import asyncio
+import time
+from contextlib import ExitStack
+
+from aioradios import RadioBrowser, facet_queries
+
+from .fixtures import load_stations
+from .server import ServerProcess, patch_discovery
+
+MIRRORS = 3
+DELAY = 0.02
+
+
+async def main(urls):
+    patch_discovery(*urls)
+    async with RadioBrowser() as client:
+        queries = await facet_queries(client)
+
+        start = time.perf_counter()
+        seen = set()
+        for endpoint, params in queries:
+            for station in await client.search(**params):
+                seen.add(station["stationuuid"])
+        serial = time.perf_counter() - start
+        print(f"{len(queries)} queries, serial on one mirror: {serial:6.2f} s  {len(seen)} stations")
+
+        for concurrency in (1, 4):
+            crawler = client.crawler(concurrency=concurrency)
+            start = time.perf_counter()
+            count = 0
+            async for _ in crawler.crawl(queries):
+                count += 1
+            elapsed = time.perf_counter() - start
+            stats = crawler.stats()
+            print(f"crawler, {MIRRORS} mirrors x {concurrency}:      {elapsed:6.2f} s  {count} stations"
+                  f"  {stats['duplicates']} duplicates dropped  requests {sorted(stats['requests'].values())}")
+
+
+if __name__ == "__main__":
+    stations = load_stations(20000)
+    with ExitStack() as stack:
+        servers = [stack.enter_context(ServerProcess(stations, delay=DELAY)) for _ in range(MIRRORS)]
+        asyncio.run(main([server.url for server in servers]))
@@ -0,0 +1,52 @@
+"""
+Decode cost of a full station dump per JSON backend, and of the xml parser.
+
+    python -m benchmarks.bench_decoders
+"""
+import json
+import time
+
+from aioradios.decoders import available_backends, decode_xml, json_decoder
+from aioradios.stream import JSONArrayParser
+
+from .fixtures import load_stations
+from .server import _xml
+
+ROUNDS = 5
+
+
+def timed(decode, body):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = decode(body)
+        best = min(best, time.perf_counter() - start)
+    return best, len(result)
+
+
+def streamed(body):
+    parser = JSONArrayParser()
+    items = []
+    for i in range(0, len(body), 65536):
+        items.extend(parser.feed(body[i:i + 65536]))
+    return items + parser.close()
+
+
+def main():
+    stations = load_stations()
+    body = json.dumps(stations).encode()
+    xml = _xml("station", stations).encode()
+    print(f"{len(stations)} stations, json {len(body) / 2**20:.1f} MiB, xml {len(xml) / 2**20:.1f} MiB")
+
+    cases = [(f"json:{name}", json_decoder(name), body) for name in available_backends()]
+    cases.append(("json:streamed", streamed, body))
+    cases.append(("xml:ElementTree", decode_xml, xml))
+
+    for label, decode, data in cases:
+        best, count = timed(decode, data)
+        print(f"{label:18} {best * 1000:9.1f} ms  {best * 1e6 / count:7.2f} us/station"
+              f"  {len(data) / best / 2**20:7.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Cold vs warm start of the mirror discovery, using a fake resolver.
+
+    python -m benchmarks.bench_discovery
+"""
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from aioradios import base_url
+
+IPS = [f"10.0.0.{i}" for i in range(1, 7)]
+DELAY = 0.05
+
+
+class FakeResolver:
+    async def gethostbyaddr(self, ip):
+        await asyncio.sleep(DELAY)
+        return SimpleNamespace(name=f"mirror{ip.rsplit('.', 1)[1]}.api.radio-browser.info")
+
+
+async def fake_lookup_ips(loop):
+    await asyncio.sleep(DELAY)
+    return IPS
+
+
+async def timed(**kwargs):
+    start = time.perf_counter()
+    urls = await base_url.get_radiobrowser_base_urls(resolver=FakeResolver(), **kwargs)
+    return (time.perf_counter() - start) * 1000, len(urls)
+
+
+async def main():
+    base_url._lookup_ips = fake_lookup_ips
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "mirrors.json")
+
+        base_url.clear_cache()
+        print("serial baseline  %8.3f ms" % ((len(IPS) + 1) * DELAY * 1000))
+        print("cold start       %8.3f ms (%d mirrors)" % await timed(cache_file=cache_file))
+        print("warm (memory)    %8.3f ms (%d mirrors)" % await timed(cache_file=cache_file))
+
+        base_url.clear_cache()
+        print("warm (disk)      %8.3f ms (%d mirrors)" % await timed(cache_file=cache_file))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
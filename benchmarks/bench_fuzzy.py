@@ -0,0 +1,99 @@
+"""
+Search as you type over a full station dump with FuzzyIndex: build time and
+memory of the index, latency per keystroke and per typo'd query, and the
+recall of the typo'd queries, i.e. the share of their top 10 that the
+correctly spelled query finds too. The substring name search of
+StationIndex is the baseline. Set AIORADIOS_FIXTURE to a recorded
+`stations` dump to measure on real names.
+
+    python -m benchmarks.bench_fuzzy
+"""
+import random
+import time
+import tracemalloc
+
+from aioradios import FuzzyIndex, StationIndex
+from aioradios.fuzzy import words
+
+from .fixtures import load_stations
+
+QUERIES = 300
+LIMIT = 10
+
+
+def typo(word, rnd):
+    if len(word) < 4:
+        return word
+    i = rnd.randrange(1, len(word) - 1)
+    edit = rnd.choice(("drop", "swap", "replace", "insert"))
+    if edit == "drop":
+        return word[:i] + word[i + 1:]
+    if edit == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    letter = rnd.choice("abcdefghijklmnopqrstuvwxyz")
+    return word[:i] + letter + word[i + (edit == "replace"):]
+
+
+def sample_queries(stations, rnd):
+    names = [words(station.get("name")) for station in rnd.sample(stations, min(QUERIES, len(stations)))]
+    # the alphabetic words, station numbers are not typed
+    names = [[word for word in name if word.isalpha()][:2] for name in names]
+    return [" ".join(name) for name in names if name]
+
+
+def latencies(search, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def main():
+    stations = load_stations()
+    rnd = random.Random(1)
+
+    start = time.perf_counter()
+    fuzzy = FuzzyIndex(stations)
+    build = time.perf_counter() - start
+    tracemalloc.start()
+    copy = FuzzyIndex(stations)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copy
+    index = StationIndex(stations)
+    print(f"{len(stations)} stations, {len(fuzzy.terms)} words")
+    print(f"build           {build * 1000:8.1f} ms  {memory / 2**20:6.1f} MiB")
+
+    queries = sample_queries(stations, rnd)
+    keystrokes = [query[:i] for query in queries for i in range(1, len(query) + 1)]
+    typos = [" ".join(typo(word, rnd) for word in query.split()) for query in queries]
+
+    cases = [
+        ("fuzzy, keystrokes", lambda q: fuzzy.search(q, LIMIT), keystrokes),
+        ("fuzzy, full queries", lambda q: fuzzy.search(q, LIMIT, prefix=False), queries),
+        ("fuzzy, typos", lambda q: fuzzy.search(q, LIMIT, prefix=False), typos),
+        ("StationIndex name=, keystrokes", lambda q: index.search(name=q, order="votes", reverse=True, limit=LIMIT),
+         keystrokes),
+    ]
+    for label, search, inputs in cases:
+        # first run fills the expansion cache of the repeated words, the second one is measured
+        cold = latencies(search, inputs)
+        p50, p99 = latencies(search, inputs)
+        print(f"{label:32} p50 {p50:8.1f} us  p99 {p99:8.1f} us  (cold p50 {cold[0]:8.1f} us  p99 {cold[1]:8.1f} us)")
+
+    found = total = 0
+    for query, misspelled in zip(queries, typos):
+        expected = {station["stationuuid"] for station in fuzzy.search(query, LIMIT, prefix=False)}
+        got = {station["stationuuid"] for station in fuzzy.search(misspelled, LIMIT, prefix=False)}
+        found += len(expected & got)
+        total += len(expected)
+    substring = sum(1 for misspelled in typos if index.search(name=misspelled, limit=1))
+    print(f"recall@{LIMIT} of typo'd queries {found / max(total, 1):6.1%}, "
+          f"substring search finds any for {substring / max(len(typos), 1):6.1%}")
+
+
+if __name__ == "__main__":
+    main()
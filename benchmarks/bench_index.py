@@ -0,0 +1,65 @@
+"""
+Station searches answered by a local StationIndex vs the remote path.
+
+The remote side is a stand-in server in its own process that searches and
+encodes every request, once over loopback and once with `RTT` seconds
+added to every response, about the round trip to a public mirror. The
+loopback numbers are the floor of the remote path, the delayed ones what
+a client actually waits.
+
+    python -m benchmarks.bench_index
+"""
+import asyncio
+import time
+
+from aioradios import RadioBrowser
+
+from .fixtures import load_stations
+from .server import ServerProcess
+
+RTT = 0.03
+
+QUERIES = [
+    dict(name="jazz", limit=20),
+    dict(countrycode="DE", tag="rock", order="votes", reverse=True, limit=50),
+    dict(language="english", language_exact=True, bitrate_min=128, bitrate_max=192, order="clickcount", limit=100),
+    dict(tag_list="pop,hits", codec="MP3", offset=10, limit=10),
+]
+
+
+async def timed(call, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await call()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+async def main(stations, loopback_url, delayed_url):
+    async with RadioBrowser(mirrors=loopback_url) as rb, RadioBrowser(mirrors=delayed_url) as delayed:
+        start = time.perf_counter()
+        index = await rb.load_index(stations)
+        print(f"index build {(time.perf_counter() - start) * 1000:.1f} ms for {len(index)} stations")
+        print(f"{'query':60} {'local':>10} {'loopback':>11} {f'+{RTT * 1000:.0f} ms RTT':>13} {'speedup':>8}  same")
+
+        uuid = stations[len(stations) // 2]["stationuuid"]
+        cases = [(f"search({q})", lambda client, q=q: client.search(**q)) for q in QUERIES]
+        cases.append(("search_by_uuid", lambda client: client.search_by_uuid(uuid)))
+
+        for label, call in cases:
+            rb.index = index
+            local_result = await call(rb)
+            local = await timed(lambda: call(rb), 200)
+            rb.index = None
+            remote_result = await call(rb)
+            loopback = await timed(lambda: call(rb), 50)
+            remote = await timed(lambda: call(delayed), 10)
+            same = [s["stationuuid"] for s in local_result] == [s["stationuuid"] for s in remote_result]
+            print(f"{label[:60]:60} {local:7.1f} us {loopback:8.1f} us {remote / 1000:10.1f} ms "
+                  f"{remote / local:7.0f}x  {same}")
+
+
+if __name__ == "__main__":
+    stations = load_stations()
+    with ServerProcess(stations, memoize=False) as loopback, \
+            ServerProcess(stations, memoize=False, delay=RTT) as delayed:
+        asyncio.run(main(stations, loopback.url, delayed.url))
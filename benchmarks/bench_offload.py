@@ -0,0 +1,60 @@
+"""
+Event loop lag while full `stations/` dumps are decoded, with decoding on
+the event loop against DecodePool in a thread and in a process pool. A
+ticker coroutine sleeps 1 ms at a time and records how late it wakes up;
+the wall time of several concurrent dumps shows the parallel decoding.
+The stand-in compresses its responses like the mirrors do, so inflating
+the body is part of what blocks or does not block the event loop.
+
+    python -m benchmarks.bench_offload
+"""
+import asyncio
+import os
+import time
+
+from aioradios import DecodePool, RadioBrowser
+
+from .fixtures import load_stations
+from .server import ServerProcess, patch_discovery
+
+CONCURRENT = min(4, os.cpu_count() or 1)
+
+
+async def ticker(lags, stop):
+    loop = asyncio.get_event_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(0.001)
+        lags.append(loop.time() - start - 0.001)
+
+
+async def measure(rb, calls):
+    lags, stop = [], asyncio.Event()
+    tick = asyncio.ensure_future(ticker(lags, stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(rb.stations(limit=10000000) for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    lags.sort()
+    return elapsed, lags[int(len(lags) * 0.99)], lags[-1], len(results[0])
+
+
+async def main(url):
+    patch_discovery(url)
+    print(f"{'mode':8} {'typed':6} {'calls':>5} {'wall':>9} {'lag p99':>10} {'lag max':>10}")
+    for mode in (None, "thread", "process"):
+        for typed in (False, True):
+            offload = DecodePool(mode) if mode else None
+            async with RadioBrowser(typed=typed, offload=offload) as rb:
+                await rb.stations(limit=10000000)  # warm up the connection and the pool
+                for calls in sorted({1, CONCURRENT}):
+                    elapsed, p99, worst, count = await measure(rb, calls)
+                    print(f"{mode or 'loop':8} {str(typed):6} {calls:5} {elapsed * 1000:7.0f} ms "
+                          f"{p99 * 1000:7.1f} ms {worst * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    stations = load_stations()
+    with ServerProcess(stations, compress=True) as server:
+        asyncio.run(main(server.url))
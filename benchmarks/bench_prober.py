@@ -0,0 +1,42 @@
+"""
+Stream checks per second against local stand-in stream servers, and the
+cost of a repeated check answered from the result cache.
+
+    python -m benchmarks.bench_prober
+"""
+import asyncio
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+
+from aioradios import StreamProber
+
+from .streams import StreamServer, stream_stations
+
+HOSTS = 4
+STATIONS = 2000
+
+
+async def main():
+    async with AsyncExitStack() as stack:
+        servers = [await stack.enter_async_context(StreamServer(delay=0.02)) for _ in range(HOSTS)]
+        stations = stream_stations([server.url for server in servers], STATIONS, kinds=("audio", "hls", "html", "missing"))
+        stations += stream_stations([servers[0].url], 20, kinds=("slow",))
+
+        for concurrency, per_host in ((16, 4), (64, 16), (256, 64)):
+            async with StreamProber(concurrency=concurrency, per_host=per_host, timeout=1.0) as prober:
+                start = time.perf_counter()
+                results = await prober.probe_stations(stations)
+                elapsed = time.perf_counter() - start
+                kinds = Counter(result.kind for result in results)
+
+                start = time.perf_counter()
+                await prober.probe_stations(stations)
+                cached = time.perf_counter() - start
+
+            print(f"concurrency {concurrency:3} per host {per_host:2}: {len(stations) / elapsed:7.0f} checks/s"
+                  f"  cached {cached * 1e6 / len(stations):5.1f} us/check  {dict(kinds)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Tail latency with and without retries and hedged requests, against
+stand-in mirrors with latency spikes and failures.
+
+    python -m benchmarks.bench_retry
+"""
+import asyncio
+import time
+
+from aioradios import RadioBrowser, RetryPolicy
+
+from .fixtures import synthetic_stations
+from .server import StandInServer, patch_discovery
+
+REQUESTS = 1000
+CONCURRENCY = 10
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def run(label, retry):
+    rb = RadioBrowser(retry=retry)
+    await rb.init()
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await rb.search(name="radio", limit=5, offset=i % 50)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+    hedged = f"hedged {retry.hedged:4} won {retry.hedges_won:4}" if retry else ""
+    print(f"{label:22} p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  p99 {percentile(latencies, 0.99) * 1000:7.1f} ms"
+          f"  errors {errors:4}  {hedged}")
+    await rb.close()
+
+
+async def main():
+    stations = synthetic_stations(2000)
+    servers = [StandInServer(stations, delay=0.005, spike_rate=0.03, spike_delay=0.25, fail_rate=0.01, seed=i)
+               for i in range(3)]
+    for server in servers:
+        await server.start()
+    patch_discovery(*(server.url for server in servers))
+
+    await run("single attempt", None)
+    await run("retries", RetryPolicy(retries=2, backoff=0.01))
+    await run("retries + hedging p95", RetryPolicy(retries=2, backoff=0.01, hedge_percentile=0.95))
+
+    for server in servers:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Cold start of a worker: downloading the full station list against opening
+a snapshot written by another process, and the snapshot lookup latency.
+
+    python -m benchmarks.bench_snapshot
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from aioradios import RadioBrowser, StationSnapshot
+
+from .fixtures import load_stations
+from .server import ServerProcess, patch_discovery
+
+LOOKUPS = 1000
+
+
+async def download():
+    start = time.perf_counter()
+    async with RadioBrowser() as client:
+        stations = await client.stations(limit=10000000)
+    return time.perf_counter() - start, len(stations)
+
+
+async def main(url, stations):
+    patch_discovery(url)
+    elapsed, count = await download()
+    print(f"download {count} stations   {elapsed * 1000:9.1f} ms")
+
+    path = os.path.join(tempfile.mkdtemp(), "stations.db")
+    async with RadioBrowser() as client:
+        start = time.perf_counter()
+        (await client.snapshot(path)).close()
+        print(f"download + write snapshot {(time.perf_counter() - start) * 1000:9.1f} ms"
+              f"  {os.path.getsize(path) / 2**20:.1f} MiB")
+
+    start = time.perf_counter()
+    snapshot = StationSnapshot(path)
+    print(f"open snapshot             {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    rnd = random.Random(1)
+    picks = [rnd.choice(stations) for _ in range(LOOKUPS)]
+    cases = [
+        ("by_uuid", lambda s: snapshot.by_uuid(s["stationuuid"])),
+        ("by_url_match", lambda s: snapshot.by_url_match(s["url"])),
+        ("search countrycode", lambda s: snapshot.search(countrycode=s["countrycode"], order="votes",
+                                                         reverse=True, limit=20)),
+        ("search name", lambda s: snapshot.search(name=s["name"][:5], limit=20)),
+    ]
+    for label, lookup in cases:
+        start = time.perf_counter()
+        for station in picks:
+            lookup(station)
+        print(f"{label:25} {(time.perf_counter() - start) * 1e6 / LOOKUPS:9.1f} us")
+    snapshot.close()
+
+
+if __name__ == "__main__":
+    stations = load_stations()
+    with ServerProcess(stations) as server:
+        asyncio.run(main(server.url, stations))
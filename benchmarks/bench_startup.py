@@ -0,0 +1,64 @@
+"""
+Startup cost of a short-lived job, each run in a fresh interpreter: the
+package import, importing the client, and the time to the first response
+with an explicit mirror and with a mirror list cached on disk.
+
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .fixtures import synthetic_stations
+from .server import ServerProcess
+
+RUNS = 5
+
+CHILD = """
+import time
+start = time.perf_counter()
+import aioradios
+package = time.perf_counter()
+from aioradios import RadioBrowser
+client = time.perf_counter()
+import asyncio, json, sys
+
+async def main():
+    kwargs = {"mirrors": sys.argv[1]} if sys.argv[2] == "explicit" else {"mirror_cache_file": sys.argv[1]}
+    async with RadioBrowser(**kwargs) as rb:
+        await rb.codecs()
+
+asyncio.run(main())
+done = time.perf_counter()
+print(json.dumps({"import aioradios": package - start, "import RadioBrowser": client - package,
+                  "first response": done - client, "total": done - start}))
+"""
+
+
+def run(target, mode):
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    output = subprocess.run([sys.executable, "-c", CHILD, target, mode], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    with ServerProcess(synthetic_stations(1000)) as server, tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "mirrors.json")
+        with open(cache_file, "w") as f:
+            json.dump({"timestamp": time.time(), "urls": [server.url]}, f)
+
+        for label, target, mode in (("explicit mirror", server.url, "explicit"),
+                                    ("cached mirror list", cache_file, "cached")):
+            runs = [run(target, mode) for _ in range(RUNS)]
+            print(label)
+            for key in runs[0]:
+                print(f"  {key:22} {statistics.median(r[key] for r in runs) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
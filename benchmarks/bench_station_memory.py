@@ -0,0 +1,43 @@
+"""
+Memory of a full catalog held as dicts vs `Station` records.
+
+    python -m benchmarks.bench_station_memory
+"""
+import gc
+import json
+import time
+import tracemalloc
+
+from aioradios import Station
+
+from .fixtures import stations_json
+
+
+def measure(build):
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    body = stations_json()
+
+    dicts, dict_size, dict_time = measure(lambda: json.loads(body))
+    records, record_size, record_time = measure(lambda: [Station.from_dict(d) for d in json.loads(body)])
+
+    print(f"stations          {len(dicts)}")
+    print(f"dicts             {dict_size / 2**20:8.1f} MiB  {dict_time * 1000:8.1f} ms")
+    print(f"Station records   {record_size / 2**20:8.1f} MiB  {record_time * 1000:8.1f} ms")
+    print(f"ratio             {record_size / dict_size:8.2f}")
+    assert records[0].to_dict()["stationuuid"] == dicts[0]["stationuuid"]
+
+
+if __name__ == "__main__":
+    main()
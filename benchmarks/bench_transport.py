@@ -0,0 +1,53 @@
+"""
+Connection reuse and file descriptors under sustained concurrency, with
+many RadioBrowser instances sharing one pooled connector.
+
+    python -m benchmarks.bench_transport
+"""
+import asyncio
+import os
+import time
+
+from aioradios import RadioBrowser, TransportConfig, close_shared_connectors
+
+from .fixtures import synthetic_stations
+from .server import StandInServer, patch_discovery
+
+CLIENTS = 20
+CONCURRENCY = 200
+ROUNDS = 10
+
+
+def open_fds():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return -1
+
+
+async def main():
+    async with StandInServer(synthetic_stations(500)) as server:
+        patch_discovery(server.url)
+
+        transport = TransportConfig(limit=50, limit_per_host=50)
+        clients = [RadioBrowser(transport=transport, share_connector=True) for _ in range(CLIENTS)]
+        for client in clients:
+            await client.init()
+
+        print(f"{CLIENTS} clients, {CONCURRENCY} concurrent requests per round, fds at start {open_fds()}")
+        print(f"{'round':>5} {'requests':>9} {'req/s':>9} {'connections':>12} {'fds':>5}")
+        total = 0
+        for round in range(ROUNDS):
+            start = time.perf_counter()
+            await asyncio.gather(*(clients[i % CLIENTS].search(name="radio", limit=5) for i in range(CONCURRENCY)))
+            elapsed = time.perf_counter() - start
+            total += CONCURRENCY
+            print(f"{round:5} {total:9} {CONCURRENCY / elapsed:9.0f} {len(server.peers):12} {open_fds():5}")
+
+        for client in clients:
+            await client.close()
+        await close_shared_connectors()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Station fixtures for the benchmarks.
+
+A recorded dump (e.g. `curl https://de1.api.radio-browser.info/json/stations > stations.json`)
+can be passed with the AIORADIOS_FIXTURE environment variable, otherwise a
+synthetic catalog with a realistic shape is generated.
+"""
+import json
+import os
+import random
+import uuid
+
+COUNTRIES = [("Germany", "DE"), ("The United States Of America", "US"), ("France", "FR"), ("Russia", "RU"),
+             ("Brazil", "BR"), ("Spain", "ES"), ("Italy", "IT"), ("Greece", "GR"), ("Poland", "PL"), ("UK", "GB")]
+LANGUAGES = ["german", "english", "french", "russian", "portuguese", "spanish", "italian", "greek", "polish"]
+CODECS = ["MP3", "AAC", "AAC+", "OGG", "FLAC", "UNKNOWN"]
+TAGS = ["pop", "rock", "news", "jazz", "classical", "talk", "dance", "electronic", "hits", "oldies",
+        "80s", "90s", "country", "metal", "public radio", "sports", "christian", "folk", "ambient", "house"]
+WORDS = ["Radio", "FM", "Classic", "Hits", "Jazz", "Rock", "Antenne", "Nova", "Energy", "City",
+         "Public", "Deutschlandfunk", "Kiss", "Sky", "Star", "Wave", "Sound", "Live", "Love", "Retro"]
+
+
+def synthetic_stations(count=40000, seed=1):
+    rnd = random.Random(seed)
+    stations = []
+
+    for i in range(count):
+        country, code = rnd.choice(COUNTRIES)
+        host = f"stream{i}.example.com"
+        stations.append({
+            "changeuuid": str(uuid.UUID(int=rnd.getrandbits(128))),
+            "stationuuid": str(uuid.UUID(int=rnd.getrandbits(128))),
+            "serveruuid": None,
+            "name": " ".join(rnd.sample(WORDS, rnd.randint(1, 3))) + f" {i}",
+            "url": f"http://{host}/live",
+            "url_resolved": f"http://{host}/live.mp3",
+            "homepage": f"https://www.{host}/",
+            "favicon": f"https://www.{host}/favicon.ico",
+            "tags": ",".join(rnd.sample(TAGS, rnd.randint(0, 4))),
+            "country": country,
+            "countrycode": code,
+            "iso_3166_2": None,
+            "state": "",
+            "language": rnd.choice(LANGUAGES),
+            "languagecodes": "",
+            "votes": rnd.randint(0, 5000),
+            "lastchangetime": "2022-05-10 12:38:08",
+            "lastchangetime_iso8601": "2022-05-10T12:38:08Z",
+            "codec": rnd.choice(CODECS),
+            "bitrate": rnd.choice([0, 64, 96, 128, 192, 256, 320]),
+            "hls": rnd.randint(0, 1),
+            "lastcheckok": rnd.randint(0, 1),
+            "lastchecktime": "2022-05-11 04:14:11",
+            "lastchecktime_iso8601": "2022-05-11T04:14:11Z",
+            "lastcheckoktime": "2022-05-11 04:14:11",
+            "lastcheckoktime_iso8601": "2022-05-11T04:14:11Z",
+            "lastlocalchecktime": "2022-05-10 19:16:54",
+            "lastlocalchecktime_iso8601": "2022-05-10T19:16:54Z",
+            "clicktimestamp": "2022-05-10 15:09:37",
+            "clicktimestamp_iso8601": "2022-05-10T15:09:37Z",
+            "clickcount": rnd.randint(0, 20000),
+            "clicktrend": rnd.randint(-50, 50),
+            "ssl_error": 0,
+            "geo_lat": None,
+            "geo_long": None,
+            "has_extended_info": False,
+        })
+
+    return stations
+
+
+def load_stations(count=40000, path=None):
+    path = path or os.environ.get("AIORADIOS_FIXTURE")
+    if path:
+        with open(path, "rb") as f:
+            return json.load(f)
+    return synthetic_stations(count)
+
+
+def stations_json(count=40000) -> bytes:
+    return json.dumps(load_stations(count)).encode()
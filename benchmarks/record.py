@@ -0,0 +1,41 @@
+"""
+Record radio-browser responses for the stand-in server.
+
+    python -m benchmarks.record fixtures/
+
+Writes `<fmt>/<path>.<fmt>` files below the given directory, for the full
+station dump, a station search and the tags and countries listings.
+"""
+import asyncio
+import os
+import sys
+
+import aiohttp
+
+from aioradios import base_url
+
+ENDPOINTS = [
+    ("stations", {"limit": 100000}),
+    ("stations/search", {"tag": "jazz", "limit": 500}),
+    ("tags", {}),
+    ("countries", {}),
+]
+
+
+async def main(directory):
+    url = await base_url.pick_url()
+    async with aiohttp.ClientSession(headers={"User-Agent": "aioradios/dev"}) as session:
+        for fmt in ("json", "xml"):
+            for path, params in ENDPOINTS:
+                target = os.path.join(directory, fmt, *path.split("/")) + "." + fmt
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                async with session.get(f"{url}/{fmt}/{path}", params=params) as resp:
+                    resp.raise_for_status()
+                    body = await resp.read()
+                with open(target, "wb") as f:
+                    f.write(body)
+                print(f"{target}: {len(body)} bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "fixtures"))
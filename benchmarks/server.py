@@ -0,0 +1,223 @@
+"""
+A local stand-in for a radio-browser mirror, serving a station fixture.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+from collections import Counter
+from xml.sax.saxutils import quoteattr
+
+from aiohttp import web
+
+from aioradios import StationIndex, base_url
+
+
+def _xml(element, items):
+    rows = (
+        "<%s %s/>" % (element, " ".join(f"{key}={quoteattr('' if value is None else str(value))}" for key, value in item.items()))
+        for item in items
+    )
+    return '<?xml version="1.0" encoding="UTF-8"?><result>' + "".join(rows) + "</result>"
+
+
+class StandInServer:
+    """
+    Serves stations/, stations/search, stations/byuuid, stations/byurl and
+    the catalog listings in json and xml. `delay` is added to every response,
+    a share of `spike_rate` responses is delayed by `spike_delay` instead and
+    a share of `fail_rate` responses fails with a 503.
+
+    `recorded` maps (fmt, path) to a recorded response body, which is
+    replayed as is for every request to that path. With `compress` the
+    responses are compressed with an encoding the client accepts.
+
+    `changes` is the scripted list of changed stations served by
+    stations/changed, oldest first; more can be appended while serving.
+
+    The bodies of up to 256 distinct requests are kept and served again
+    without searching; `memoize=False` searches and encodes every time,
+    like a mirror does.
+    """
+
+    def __init__(self, stations, delay=0.0, spike_rate=0.0, spike_delay=0.0, fail_rate=0.0, seed=None,
+                 recorded=None, compress=False, changes=None, memoize=True):
+        self.stations = stations
+        self.recorded = recorded or {}
+        self.index = StationIndex(stations)
+        self.delay = delay
+        self.spike_rate = spike_rate
+        self.spike_delay = spike_delay
+        self.fail_rate = fail_rate
+        self.compress = compress
+        self.changes = list(changes or [])
+        self.memoize = memoize
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.peers = set()
+        self.catalogs = {
+            "countries": self._counts("country"),
+            "countrycodes": self._counts("countrycode"),
+            "codecs": self._counts("codec"),
+            "languages": self._counts("language"),
+            "states": self._counts("state"),
+            "tags": self._counts("tags", split=True),
+        }
+        self._bodies = {}
+        self._runner = None
+        self.url = None
+
+    def _counts(self, field, split=False):
+        counter = Counter()
+        for station in self.stations:
+            value = station.get(field) or ""
+            for key in (value.split(",") if split else [value]):
+                if key:
+                    counter[key] += 1
+        return [{"name": name, "stationcount": count} for name, count in sorted(counter.items())]
+
+    def _reply(self, request, element, items):
+        if request.match_info["fmt"] == "xml":
+            return web.Response(body=_xml(element, items).encode(), content_type="application/xml")
+        return web.Response(body=json.dumps(items).encode(), content_type="application/json")
+
+    async def handle(self, request):
+        response = await self._handle(request)
+        if self.compress:
+            response.enable_compression()
+        return response
+
+    async def _handle(self, request):
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        delay = self.spike_delay if self.random.random() < self.spike_rate else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+        if self.random.random() < self.fail_rate:
+            raise web.HTTPServiceUnavailable()
+
+        fmt = request.match_info["fmt"]
+        path = request.match_info["path"].strip("/")
+        query = dict(request.query)
+
+        if (fmt, path) in self.recorded:
+            return web.Response(body=self.recorded[(fmt, path)], content_type=f"application/{fmt}")
+
+        memo = (fmt, path, tuple(sorted(query.items())))
+        if memo in self._bodies:
+            return web.Response(body=self._bodies[memo], content_type=f"application/{fmt}")
+
+        if path == "stations/changed":
+            uuids = [change["changeuuid"] for change in self.changes]
+            last = query.get("lastchangeuuid")
+            start = uuids.index(last) + 1 if last in uuids else 0
+            return self._reply(request, "station", self.changes[start:start + int(query.get("limit", 100000))])
+
+        if path in ("stations", "stations/search"):
+            items = self.index.search(**query)
+        elif path == "stations/byuuid":
+            items = self.index.by_uuids(query.get("uuids", ""))
+        elif path == "stations/byurl":
+            items = self.index.by_url_match(query.get("url", ""))
+        elif path.startswith("vote/"):
+            return web.json_response({"ok": True, "message": "voted for station successfully"})
+        elif path == "stats":
+            items = {"stations": len(self.stations)}
+            return web.json_response(items)
+        elif path.split("/", 1)[0] in self.catalogs:
+            name, _, search = path.partition("/")
+            items = [item for item in self.catalogs[name] if search.lower() in item["name"].lower()]
+        else:
+            raise web.HTTPNotFound()
+
+        response = self._reply(request, "station" if path.startswith("stations") else path.split("/", 1)[0], items)
+        if self.memoize and len(self._bodies) < 256:
+            self._bodies[memo] = response.body
+        return response
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{fmt:json|xml}/{path:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+def patch_discovery(*urls):
+    """
+    Point the mirror discovery at the given stand-in servers.
+    """
+    async def get_radiobrowser_base_urls(**kwargs):
+        return list(urls)
+
+    async def pick_url(**kwargs):
+        return urls[0]
+
+    base_url.get_radiobrowser_base_urls = get_radiobrowser_base_urls
+    base_url.pick_url = pick_url
+
+
+def load_recorded(directory):
+    """
+    Load recorded responses laid out as `<directory>/<fmt>/<path>.<fmt>`,
+    e.g. `json/stations/search.json`.
+    """
+    recorded = {}
+    for fmt in ("json", "xml"):
+        root = os.path.join(directory, fmt)
+        for folder, _, files in os.walk(root):
+            for name in files:
+                if not name.endswith("." + fmt):
+                    continue
+                path = os.path.relpath(os.path.join(folder, name[:-len(fmt) - 1]), root).replace(os.sep, "/")
+                with open(os.path.join(folder, name), "rb") as f:
+                    recorded[(fmt, path)] = f.read()
+    return recorded
+
+
+def _serve(connection, stations, kwargs):
+    async def main():
+        server = StandInServer(stations, **kwargs)
+        connection.send(await server.start())
+        await asyncio.get_event_loop().run_in_executor(None, connection.recv)
+        await server.stop()
+
+    asyncio.run(main())
+
+
+class ServerProcess:
+    """
+    Runs a StandInServer in a child process, so that serving does not
+    compete with the measured client for the event loop.
+    """
+
+    def __init__(self, stations, **kwargs):
+        self._parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child, stations, kwargs), daemon=True)
+        self.url = None
+
+    def __enter__(self):
+        self._process.start()
+        self.url = self._parent.recv()
+        return self
+
+    def __exit__(self, *exc):
+        self._parent.send(None)
+        self._process.join(10)
+        if self._process.is_alive():
+            self._process.terminate()
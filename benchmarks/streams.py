@@ -0,0 +1,110 @@
+"""
+Local stand-ins for radio stream servers, for checking the stream prober.
+"""
+import asyncio
+
+from aiohttp import web
+
+# An MPEG-1 layer 3 frame header, 128 kbit/s 44.1 kHz, with an empty body.
+MP3_FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+
+KINDS = ("audio", "icy", "hls", "playlist", "html", "missing", "slow", "redirect")
+
+
+class StreamServer:
+    """
+    Serves `/<kind>/<n>` for every kind in KINDS: an endless mp3 stream with
+    ICY headers, the same over a SHOUTcast v1 'ICY 200 OK' status line, an
+    HLS playlist, a pls playlist, an html page, a 404, a response that never
+    starts, and a redirect to the mp3 stream. `delay` is added before every
+    response.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = 0
+        self._runner = None
+        self._icy = None
+        self.url = None
+
+    async def handle(self, request):
+        self.requests += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        kind, n = request.match_info["kind"], request.match_info["n"]
+        if kind == "audio":
+            response = web.StreamResponse(headers={
+                "Content-Type": "audio/mpeg", "icy-name": f"Stand-in {n}", "icy-genre": "test",
+                "icy-br": "128", "icy-metaint": "16000",
+            })
+            await response.prepare(request)
+            try:
+                while True:
+                    await response.write(MP3_FRAME * 4)
+                    await asyncio.sleep(0.05)
+            except ConnectionError:
+                return response
+        if kind == "icy":
+            raise web.HTTPFound(f"http://127.0.0.1:{self._icy.sockets[0].getsockname()[1]}/{n}")
+        if kind == "hls":
+            return web.Response(text=f"#EXTM3U\n#EXT-X-VERSION:3\n#EXT-X-TARGETDURATION:10\n#EXTINF:10,\n{n}.ts\n",
+                                content_type="application/vnd.apple.mpegurl")
+        if kind == "playlist":
+            return web.Response(text=f"[playlist]\nFile1={self.url}/audio/{n}\nNumberOfEntries=1\n",
+                                content_type="audio/x-scpls")
+        if kind == "html":
+            return web.Response(text="<!DOCTYPE html><html><body>Not a stream</body></html>",
+                                content_type="text/html")
+        if kind == "slow":
+            while request.transport is not None and not request.transport.is_closing():
+                await asyncio.sleep(0.05)
+            return web.Response()
+        if kind == "redirect":
+            raise web.HTTPFound(f"/audio/{n}")
+        raise web.HTTPNotFound()
+
+    async def _handle_icy(self, reader, writer):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"ICY 200 OK\r\nicy-name: Stand-in\r\nicy-br: 128\r\ncontent-type: audio/mpeg\r\n\r\n")
+            while True:
+                writer.write(MP3_FRAME * 4)
+                await writer.drain()
+                await asyncio.sleep(0.05)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{kind}/{n}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None, shutdown_timeout=0.1)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self._icy = await asyncio.start_server(self._handle_icy, "127.0.0.1", 0)
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self):
+        self._icy.close()
+        await self._runner.cleanup()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+def stream_stations(urls, count, kinds=KINDS):
+    """
+    `count` stations spread over the stream servers at `urls` and the kinds.
+    """
+    return [
+        {"stationuuid": f"stream-{i}", "name": f"Stream {i}", "url": f"{urls[i % len(urls)]}/{kinds[i % len(kinds)]}/{i}"}
+        for i in range(count)
+    ]
@@ -0,0 +1,140 @@
+"""
+Offline benchmark suite against a stand-in radio-browser server.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --fixtures fixtures/ --concurrency 1,16 --formats json
+
+The server runs in a child process and replays the responses recorded with
+`benchmarks.record` when `--fixtures` is given, otherwise it serves a
+synthetic catalog. For every call, format and concurrency level the suite
+measures throughput and p50/p99 latency, and in a separate pass the peak
+memory of a single call. The results are written as JSON so that runs can
+be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import aioradios
+from aioradios import RadioBrowser
+
+from .fixtures import load_stations
+from .server import ServerProcess, load_recorded, patch_discovery
+
+# name -> (call, requests relative to --requests)
+CASES = {
+    "stations": (lambda rb, uuids, i: rb.stations(limit=100000), 0.05),
+    "search": (lambda rb, uuids, i: rb.search(tag="jazz", limit=100, offset=i % 10), 1.0),
+    "search_by_uuid": (lambda rb, uuids, i: rb.search_by_uuid(",".join(uuids[i % len(uuids)])), 1.0),
+    "countries": (lambda rb, uuids, i: rb.countries(), 1.0),
+    "tags": (lambda rb, uuids, i: rb.tags(), 0.5),
+}
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def throughput(rb, call, uuids, concurrency, requests):
+    latencies = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            await call(rb, uuids, i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+async def peak_memory(rb, call, uuids):
+    tracemalloc.start()
+    try:
+        result = await call(rb, uuids, 0)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+async def run(args, url, uuids):
+    patch_discovery(url)
+    results = []
+
+    for fmt in args.formats:
+        async with RadioBrowser(fmt=fmt) as rb:
+            for name in args.cases:
+                call, share = CASES[name]
+                await call(rb, uuids, 0)  # warm up the connection
+                memory = await peak_memory(rb, call, uuids)
+
+                for concurrency in args.concurrency:
+                    requests = max(concurrency, int(args.requests * share))
+                    latencies, elapsed = await throughput(rb, call, uuids, concurrency, requests)
+                    result = {
+                        "case": name,
+                        "format": fmt,
+                        "concurrency": concurrency,
+                        "requests": requests,
+                        "throughput_rps": requests / elapsed,
+                        "p50_ms": percentile(latencies, 0.5) * 1000,
+                        "p99_ms": percentile(latencies, 0.99) * 1000,
+                        "peak_memory_bytes": memory,
+                    }
+                    results.append(result)
+                    print(f"{name:15} {fmt:4} c={concurrency:<3} {result['throughput_rps']:9.1f} req/s"
+                          f"  p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms"
+                          f"  peak {memory / 2**20:7.1f} MiB")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="directory of recorded responses")
+    parser.add_argument("--stations", type=int, default=40000, help="size of the synthetic catalog")
+    parser.add_argument("--cases", type=lambda v: v.split(","), default=list(CASES))
+    parser.add_argument("--formats", type=lambda v: v.split(","), default=["json", "xml"])
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in v.split(",")], default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per light case and level")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    recorded = {}
+    dump = None
+    if args.fixtures:
+        recorded = load_recorded(args.fixtures)
+        dump = os.path.join(args.fixtures, "json", "stations.json")
+        dump = dump if os.path.exists(dump) else None
+    stations = load_stations(args.stations, dump)
+    all_uuids = [station["stationuuid"] for station in stations]
+    uuids = [all_uuids[i:i + 10] for i in range(0, min(len(all_uuids), 1000), 10)]
+
+    with ServerProcess(stations, recorded=recorded) as server:
+        results = asyncio.run(run(args, server.url, uuids))
+
+    report = {
+        "timestamp": time.time(),
+        "aioradios": aioradios.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixtures": args.fixtures or f"synthetic:{len(stations)}",
+        "stations": len(stations),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import asyncio
+
+from aiohttp import web
+
+from aioradios import RadioBrowser, ResponseCache
+from aioradios.cache import request_key
+
+
+def test_key_normalizes_params():
+    assert request_key('JSON', 'tags', {'b': 1, 'a': 'x', 'c': None}) == ('json', 'tags', (('a', 'x'), ('b', '1')))
+
+
+def test_ttl_and_lru():
+    cache = ResponseCache(ttls={'tags': 60, 'codecs': 0}, max_entries=2)
+    assert cache.ttl_for('tags/jazz') == 60
+    assert cache.ttl_for('stations/search') == 0
+
+    cache.put(cache.key('json', 'codecs', {}), [], 10)
+    assert len(cache) == 0
+
+    first, second, third = (cache.key('json', f'tags/{name}', {}) for name in ('a', 'b', 'c'))
+    cache.put(first, ['a'], 10)
+    cache.put(second, ['b'], 10)
+    assert cache.get(first).value == ['a']
+    cache.put(third, ['c'], 10)
+    assert cache.get(second) is None
+    assert cache.get(first).value == ['a']
+    assert cache.stats() == {'entries': 2, 'bytes': 20, 'hits': 2, 'misses': 1, 'revalidations': 0,
+                             'evictions': 1}
+
+
+def test_byte_limit():
+    cache = ResponseCache(ttls={'tags': 60}, max_bytes=25)
+    cache.put(cache.key('json', 'tags/a', {}), ['a'], 30)
+    assert len(cache) == 0
+    cache.put(cache.key('json', 'tags/a', {}), ['a'], 15)
+    cache.put(cache.key('json', 'tags/b', {}), ['b'], 15)
+    assert len(cache) == 1 and cache.size == 15
+
+
+def test_stale_entry_is_revalidated():
+    requests = []
+
+    async def tags(request):
+        requests.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304, headers={'ETag': '"v1"'})
+        return web.json_response([{'name': 'jazz', 'stationcount': 3}], headers={'ETag': '"v1"'})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/json/tags/', tags)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        try:
+            cache = ResponseCache(ttls={'tags': 0.05})
+            async with RadioBrowser(mirrors=url, cache=cache) as rb:
+                first = await rb.tags()
+                assert await rb.tags() is first
+                await asyncio.sleep(0.06)
+                assert await rb.tags() is first
+            return cache
+        finally:
+            await runner.cleanup()
+
+    cache = asyncio.run(main())
+    assert requests == [None, '"v1"']
+    assert (cache.hits, cache.revalidations) == (1, 1)
@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+
+from aioradios import RadioBrowser, StationIndex
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+def changed(station, **fields):
+    return dict(station, changeuuid=str(uuid.uuid4()), **fields)
+
+
+def test_sync_and_resume_from_checkpoint(tmp_path):
+    checkpoint_file = str(tmp_path / "changes.json")
+    first, added = synthetic_stations(5), synthetic_stations(8, seed=2)[5:]
+
+    async def main():
+        async with StandInServer([], changes=first) as server:
+            local = {}
+            async with RadioBrowser(mirrors=server.url) as rb:
+                feed = rb.change_feed(checkpoint_file, page_size=2)
+                assert await feed.sync(local) == {'insert': 5, 'update': 0, 'unchanged': 0}
+                assert feed.checkpoint == first[-1]['changeuuid']
+
+            # the next run, after the server recorded more changes
+            renamed = changed(first[0], name="Renamed Radio", votes=99999, lastchangetime="2022-06-01 08:00:00",
+                              lastchangetime_iso8601="2022-06-01T08:00:00Z")
+            server.changes += [renamed] + added
+            async with RadioBrowser(mirrors=server.url) as rb:
+                feed = rb.change_feed(checkpoint_file, page_size=2)
+                assert feed.checkpoint == first[-1]['changeuuid']
+                assert await feed.sync(local) == {'insert': 3, 'update': 1, 'unchanged': 0}
+                assert feed.checkpoint == added[-1]['changeuuid']
+
+                # nothing new since the checkpoint
+                assert await feed.sync(local) == {'insert': 0, 'update': 0, 'unchanged': 0}
+
+                # replaying the feed from the start only repeats what is held
+                replay = rb.change_feed(page_size=3)
+                assert await replay.sync(local) == {'insert': 0, 'update': 0, 'unchanged': 9}
+        return local
+
+    local = asyncio.run(main())
+    assert len(local) == 8
+    index = StationIndex(local.values())
+    assert [station['name'] for station in index.search(name="Renamed Radio")] == ["Renamed Radio"]
+    assert index.search(order="votes", reverse="true", limit=1)[0]['stationuuid'] == first[0]['stationuuid']
+    assert {station['stationuuid'] for station in index.search()} == \
+        {station['stationuuid'] for station in first + added}
+
+
+def test_consumer_stopping_early_keeps_its_change(tmp_path):
+    checkpoint_file = str(tmp_path / "changes.json")
+    stations = synthetic_stations(4)
+
+    async def main():
+        async with StandInServer([], changes=stations) as server:
+            async with RadioBrowser(mirrors=server.url) as rb:
+                feed = rb.change_feed(checkpoint_file, page_size=10)
+                changes = feed.changes()
+                async for station in changes:
+                    if station['stationuuid'] == stations[2]['stationuuid']:
+                        break
+                await changes.aclose()
+
+                resumed = rb.change_feed(checkpoint_file)
+                return [station['stationuuid'] async for station in resumed.changes()]
+
+    # the change it stopped at is delivered again
+    assert asyncio.run(main()) == [station['stationuuid'] for station in stations[2:]]
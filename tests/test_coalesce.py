@@ -0,0 +1,57 @@
+import asyncio
+
+from aioradios import RadioBrowser
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+def run(test, delay=0.05):
+    async def main():
+        async with StandInServer(synthetic_stations(20), delay=delay) as server:
+            async with RadioBrowser(mirrors=server.url, coalesce=True) as rb:
+                await rb.init()
+                return await test(rb, server)
+
+    return asyncio.run(main())
+
+
+def test_concurrent_calls_share_a_request():
+    async def test(rb, server):
+        results = await asyncio.gather(*(rb.tags() for _ in range(3)), rb.tags('rock'))
+        assert results[0] is results[1] is results[2]
+        assert rb.http.coalesce_stats == {'upstream': 2, 'coalesced': 2}
+        assert server.requests == 2
+        assert rb.http._inflight == {}
+
+        await rb.tags()
+        assert rb.http.coalesce_stats == {'upstream': 3, 'coalesced': 2}
+
+    run(test)
+
+
+def test_cancelled_waiter_leaves_the_others():
+    async def test(rb, server):
+        first, second = asyncio.ensure_future(rb.tags()), asyncio.ensure_future(rb.tags())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second
+        assert first.cancelled()
+        assert server.requests == 1
+
+    run(test)
+
+
+def test_caller_after_orphaned_cancel_gets_a_new_request():
+    async def test(rb, server):
+        orphan = asyncio.ensure_future(rb.tags())
+        await asyncio.sleep(0.01)
+        orphan.cancel()
+        # joins at once, while the cancelled request is still winding down
+        later = asyncio.ensure_future(rb.tags())
+        assert await later
+        assert orphan.cancelled() and not later.cancelled()
+        assert rb.http.coalesce_stats == {'upstream': 2, 'coalesced': 0}
+        assert rb.http._inflight == {}
+
+    run(test)
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from aioradios import columns as columns_module
+from aioradios.columns import StationColumns
+
+STATIONS = [
+    {'stationuuid': 'a', 'name': 'A', 'country': 'Germany', 'codec': 'MP3', 'bitrate': 128, 'votes': 10},
+    {'stationuuid': 'b', 'name': 'B', 'country': 'Germany', 'codec': 'AAC', 'bitrate': '64', 'votes': 5},
+    {'stationuuid': 'c', 'name': 'C', 'country': 'France', 'codec': 'MP3', 'bitrate': 320, 'votes': 1},
+    {'stationuuid': 'd', 'name': 'D', 'country': None, 'codec': 'MP3', 'bitrate': None, 'votes': 0},
+    {'stationuuid': 'e', 'name': 'E', 'country': 'France', 'codec': 'OGG', 'bitrate': 192, 'votes': 4},
+]
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def columns(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(columns_module, 'numpy', None)
+    return StationColumns.from_stations(STATIONS)
+
+
+def uuids(columns):
+    return columns.column('stationuuid')
+
+
+def test_columns(columns):
+    assert len(columns) == 5
+    assert list(columns.column('bitrate')) == [128, 64, 320, 0, 192]
+    assert columns.column('country') == ['Germany', 'Germany', 'France', '', 'France']
+    assert columns.categories['codec'] == ['MP3', 'AAC', 'OGG']
+    assert columns.column('name') == ['A', 'B', 'C', 'D', 'E']
+
+
+def test_where(columns):
+    assert uuids(columns.where(codec='MP3')) == ['a', 'c', 'd']
+    assert uuids(columns.where(codec={'AAC', 'OGG'})) == ['b', 'e']
+    assert uuids(columns.where(bitrate_min=128)) == ['a', 'c', 'e']
+    assert uuids(columns.where(bitrate_min=64, bitrate_max=192)) == ['a', 'b', 'e']
+    assert uuids(columns.where(codec='MP3', country='Germany')) == ['a']
+    assert uuids(columns.where(codec='FLAC')) == []
+    assert uuids(columns.where()) == ['a', 'b', 'c', 'd', 'e']
+    with pytest.raises(KeyError):
+        columns.where(name='A')
+
+
+def test_take(columns):
+    assert uuids(columns.take([])) == []
+    subset = columns.take([2])
+    assert uuids(subset) == ['c'] and list(subset.column('votes')) == [1]
+    subset = columns.take([4, 0])
+    assert uuids(subset) == ['e', 'a']
+    assert subset.column('codec') == ['OGG', 'MP3']
+    # the subset shares the categories and keeps answering
+    assert subset.value_counts('codec') == {'OGG': 1, 'MP3': 1}
+
+
+def test_aggregations(columns):
+    assert columns.value_counts('codec') == {'MP3': 3, 'AAC': 1, 'OGG': 1}
+    assert list(columns.value_counts('codec'))[0] == 'MP3'
+    assert columns.share('country') == {'Germany': 0.4, 'France': 0.4, '': 0.2}
+    assert columns.sum_by('country', 'votes') == {'Germany': 15, 'France': 5, '': 0}
+    assert columns.mean_by('codec', 'bitrate') == {'MP3': 448 / 3, 'AAC': 64.0, 'OGG': 192.0}
+    assert columns.histogram('bitrate', [64, 128, 256]) == [1, 1, 2, 1]
+
+    subset = columns.where(country='France')
+    assert subset.value_counts('codec') == {'MP3': 1, 'OGG': 1}
+    assert subset.sum_by('codec', 'votes') == {'MP3': 1, 'OGG': 4}
+
+
+def test_empty_share():
+    assert StationColumns().share('codec') == {}
+
+
+def test_from_stream():
+    async def stations():
+        for station in STATIONS:
+            yield station
+
+    columns = asyncio.run(StationColumns.from_stream(stations()))
+    assert uuids(columns) == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_to_numpy_without_numpy(monkeypatch):
+    monkeypatch.setattr(columns_module, 'numpy', None)
+    with pytest.raises(ImportError):
+        StationColumns.from_stations(STATIONS).to_numpy()
+
+
+def test_to_numpy_shares_memory():
+    numpy = pytest.importorskip('numpy')
+    columns = StationColumns.from_stations(STATIONS)
+    arrays = columns.to_numpy()
+    assert arrays['votes'].tolist() == [10, 5, 1, 0, 4]
+    assert arrays['codec'].tolist() == [0, 1, 0, 0, 2]
+    columns.numeric['votes'][0] = 99
+    assert arrays['votes'][0] == 99
+    assert isinstance(arrays['bitrate'], numpy.ndarray)
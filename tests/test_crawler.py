@@ -0,0 +1,94 @@
+import asyncio
+
+from aioradios import RadioBrowser
+from aioradios.crawler import catalog_queries
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+def test_failed_pages_move_to_another_mirror():
+    stations = synthetic_stations(200)
+
+    async def main():
+        async with StandInServer(stations) as good, StandInServer(stations, fail_rate=1.0) as dead:
+            async with RadioBrowser(mirrors=[good.url, dead.url]) as rb:
+                crawler = rb.crawler(concurrency=4, page_size=10, attempts=2)
+                found = [station['stationuuid'] async for station in crawler.crawl(catalog_queries(200, 20))]
+            return found, crawler, dead.requests
+
+    found, crawler, dead_requests = asyncio.run(main())
+    assert sorted(found) == sorted(station['stationuuid'] for station in stations)
+    assert crawler.failed == {}
+    # every page failed at most once on the dead mirror
+    assert dead_requests <= crawler.stats()['pages']
+
+
+def test_backs_off_when_every_mirror_failed():
+    stations = synthetic_stations(20)
+
+    async def main():
+        async with StandInServer(stations, fail_rate=1.0) as server:
+            async with RadioBrowser(mirrors=server.url) as rb:
+                crawler = rb.crawler(attempts=3, retry_delay=0.05)
+                loop = asyncio.get_event_loop()
+                start = loop.time()
+                found = [station async for station in crawler.crawl([('stations/search', {'limit': 5})])]
+                return found, crawler, server.requests, loop.time() - start
+
+    found, crawler, requests, elapsed = asyncio.run(main())
+    assert found == [] and len(crawler.failed) == 1
+    assert requests == 3
+    assert elapsed >= 0.15
+
+
+def test_resumes_from_state_file(tmp_path):
+    stations = synthetic_stations(60)
+    state_file = str(tmp_path / "crawl.json")
+    queries = catalog_queries(60, 20)
+
+    async def crawl(stop_after=None):
+        async with StandInServer(stations) as server:
+            async with RadioBrowser(mirrors=server.url) as rb:
+                crawler = rb.crawler(concurrency=1, page_size=20, state_file=state_file, save_every=1)
+                found = []
+                stations_iter = crawler.crawl(queries)
+                async for station in stations_iter:
+                    found.append(station['stationuuid'])
+                    if len(found) == stop_after:
+                        break
+                await stations_iter.aclose()
+                return found
+
+    first = asyncio.run(crawl(stop_after=30))
+    rest = asyncio.run(crawl())
+    assert len(set(first) | set(rest)) == 60
+    assert not set(first) & set(rest)
+
+
+def test_resumes_paged_query_from_its_offset(tmp_path):
+    stations = synthetic_stations(60)
+    state_file = str(tmp_path / "crawl.json")
+    queries = [('stations/search', {'order': 'stationuuid'})]
+
+    async def crawl(stop_after=None):
+        async with StandInServer(stations) as server:
+            async with RadioBrowser(mirrors=server.url) as rb:
+                crawler = rb.crawler(concurrency=1, page_size=20, state_file=state_file, save_every=1)
+                found = []
+                stations_iter = crawler.crawl(queries)
+                async for station in stations_iter:
+                    found.append(station['stationuuid'])
+                    if len(found) == stop_after:
+                        break
+                await stations_iter.aclose()
+                return found, crawler, server.requests
+
+    first, crawler, _ = asyncio.run(crawl(stop_after=25))
+    # stopped within the second page, which is fetched again
+    assert list(crawler.offsets.values()) == [20]
+    rest, crawler, requests = asyncio.run(crawl())
+    assert len(set(first) | set(rest)) == 60
+    # the pages at offsets 20, 40 and 60, not the whole query again
+    assert requests == 3
+    assert crawler.offsets == {} and len(crawler.completed) == 1
@@ -0,0 +1,22 @@
+from aioradios.decoders import decode_xml
+from aioradios.stream import XMLListParser
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import _xml
+
+NUMERIC = ('votes', 'bitrate', 'hls', 'lastcheckok', 'clickcount', 'clicktrend', 'ssl_error', 'has_extended_info')
+
+
+def test_xml_numbers_match_json():
+    stations = synthetic_stations(20)
+    body = _xml("station", stations).encode()
+
+    for decoded in (decode_xml(body), XMLListParser().feed(body)):
+        assert len(decoded) == len(stations)
+        for station, item in zip(stations, decoded):
+            assert {key: item[key] for key in NUMERIC} == {key: station[key] for key in NUMERIC}
+            assert item['name'] == station['name']
+            assert item['geo_lat'] is None
+
+    tags = decode_xml(b'<result><tag name="jazz" stationcount="12"/><tag name="pop" stationcount=""/></result>')
+    assert tags == [{'name': 'jazz', 'stationcount': 12}, {'name': 'pop', 'stationcount': 0}]
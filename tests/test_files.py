@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from aioradios.files import _atomic_write
+from aioradios.snapshot import write_snapshot
+
+from benchmarks.fixtures import synthetic_stations
+
+
+def test_replaces_file_at_once(tmp_path):
+    path = str(tmp_path / "state.json")
+    with open(path, 'w') as f:
+        f.write('old')
+    with _atomic_write(path) as tmp, open(tmp, 'w') as f:
+        f.write('new')
+        with open(path) as old:
+            assert old.read() == 'old'
+    with open(path) as f:
+        assert f.read() == 'new'
+    assert os.listdir(tmp_path) == ['state.json']
+
+
+def test_removes_temporary_file_on_error(tmp_path):
+    path = str(tmp_path / "state.json")
+    with pytest.raises(OSError):
+        with _atomic_write(path) as tmp, open(tmp, 'w') as f:
+            f.write('partial')
+            raise OSError("disk full")
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_snapshot_leaves_nothing_behind(tmp_path):
+    path = str(tmp_path / "stations.db")
+
+    def stations():
+        yield from synthetic_stations(10)
+        raise OSError("connection lost")
+
+    with pytest.raises(OSError):
+        write_snapshot(path, stations())
+    assert os.listdir(tmp_path) == []
+    assert write_snapshot(path, synthetic_stations(10)) == 10
+    assert os.listdir(tmp_path) == ['stations.db']
@@ -0,0 +1,53 @@
+from aioradios import FuzzyIndex
+from aioradios.fuzzy import edit_distance, normalize
+
+
+def station(name, tags='', votes=0, clickcount=0):
+    return {'stationuuid': name, 'name': name, 'tags': tags, 'votes': votes, 'clickcount': clickcount}
+
+
+STATIONS = [
+    station('Radio Paradise', 'eclectic,rock', votes=9000),
+    station('Paradise Jazz', 'jazz'),
+    station('Jazz Radio', 'jazz,smooth jazz', votes=500),
+    station('Café del Mar', 'chillout,lounge', votes=300),
+    station('Radio Swiss Jazz', 'jazz', votes=2000, clickcount=500),
+    station('Rock Antenne', 'rock,classic rock', votes=100),
+]
+
+
+def names(results):
+    return [result['name'] for result in results]
+
+
+def test_edit_distance():
+    assert edit_distance('jazz', 'jazz', 1) == 0
+    assert edit_distance('jzaz', 'jazz', 1) == 1
+    assert edit_distance('paradis', 'paradise', 2) == 1
+    assert edit_distance('rock', 'jazz', 1) == 2
+    assert normalize('Café') == 'cafe'
+
+
+def test_typos_and_prefixes():
+    index = FuzzyIndex(STATIONS)
+    assert names(index.search('radio paradis')) == ['Radio Paradise']
+    assert names(index.search('raido paradise', prefix=False)) == ['Radio Paradise']
+    assert set(names(index.search('jzaz'))) == {'Paradise Jazz', 'Jazz Radio', 'Radio Swiss Jazz'}
+    assert names(index.search('cafe del')) == ['Café del Mar']
+    assert index.search('xyzzy') == []
+    assert index.search('') == []
+
+
+def test_ranking():
+    index = FuzzyIndex(STATIONS)
+    # popularity orders the stations matching alike
+    assert names(index.search('jazz', prefix=False)) == ['Radio Swiss Jazz', 'Jazz Radio', 'Paradise Jazz']
+    # a name match beats a tag match of a more popular station
+    assert names(index.search('rock', prefix=False)) == ['Rock Antenne', 'Radio Paradise']
+    assert names(index.search('jazz', limit=1, prefix=False)) == ['Radio Swiss Jazz']
+
+
+def test_complete():
+    index = FuzzyIndex(STATIONS)
+    assert index.complete('smooth ja')[0] == 'jazz'
+    assert 'paradise' in index.complete('para')
@@ -0,0 +1,67 @@
+import asyncio
+
+from aioradios import Metrics, RadioBrowser, RetryPolicy
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+def counted(metrics):
+    started, ended = [], []
+    metrics.on_request_start.append(started.append)
+    metrics.on_request_end.append(ended.append)
+    return started, ended
+
+
+def test_timed_out_call_ends_with_its_error():
+    async def main():
+        metrics = Metrics()
+        started, ended = counted(metrics)
+        async with StandInServer(synthetic_stations(10), delay=0.2) as server:
+            async with RadioBrowser(mirrors=server.url, metrics=metrics) as rb:
+                await rb.init()
+                try:
+                    await rb.tags(timeout=0.05)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    raise AssertionError("did not time out")
+        assert len(started) == len(ended) == 1
+        assert isinstance(ended[0]['error'], asyncio.CancelledError)
+        assert sum(metrics.errors.values()) == 1
+
+    asyncio.run(main())
+
+
+def test_hedged_requests_all_end():
+    async def main():
+        metrics = Metrics()
+        started, ended = counted(metrics)
+        stations = synthetic_stations(10)
+        servers = [StandInServer(stations, delay=0.005, spike_rate=0.3, spike_delay=0.1, seed=i) for i in range(2)]
+        async with servers[0], servers[1]:
+            retry = RetryPolicy(hedge_percentile=0.5, min_samples=5)
+            async with RadioBrowser(mirrors=[s.url for s in servers], metrics=metrics, retry=retry) as rb:
+                for _ in range(30):
+                    await rb.tags()
+        assert retry.hedged > 0
+        assert len(started) == len(ended)
+        assert sum(metrics.errors.values()) == len([info for info in ended if info['error'] is not None]) > 0
+
+    asyncio.run(main())
+
+
+def test_stream_closed_early_ends():
+    async def main():
+        metrics = Metrics()
+        started, ended = counted(metrics)
+        async with StandInServer(synthetic_stations(50)) as server:
+            async with RadioBrowser(mirrors=server.url, metrics=metrics) as rb:
+                stations = rb.stream_stations()
+                async for _ in stations:
+                    break
+                await stations.aclose()
+        assert len(started) == len(ended) == 1
+        assert isinstance(ended[0]['error'], GeneratorExit)
+
+    asyncio.run(main())
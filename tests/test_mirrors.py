@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import aiohttp
+
+from aioradios import RadioBrowser
+from aioradios.mirrors import MirrorPool
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+def test_ranking_and_ejection():
+    pool = MirrorPool(['a', 'b', 'c'], failure_threshold=2, cooldown=60)
+    pool.record_success('a', 0.2)
+    pool.record_success('b', 0.1)
+    pool.record_success('c', 0.05)
+    assert [m.url for m in pool.ranked()] == ['c', 'b', 'a']
+
+    pool.record_failure('c')
+    assert pool.best().url == 'b'
+    pool.record_failure('c')
+    assert [m.url for m in pool.ranked()] == ['b', 'a', 'c']
+    assert not pool.mirrors['c'].available(time.monotonic())
+
+
+def test_half_open_mirror_is_readmitted():
+    async def main():
+        stations = synthetic_stations(10)
+        async with StandInServer(stations) as good, StandInServer(stations, delay=0.01) as flaky:
+            flaky.fail_rate = 1.0
+            pool = MirrorPool([good.url, flaky.url], failure_threshold=1, cooldown=0.1, reprobe_interval=None)
+            async with aiohttp.ClientSession() as session:
+                await pool.probe(session)
+                assert pool.best().url == good.url
+                mirror = pool.mirrors[flaky.url]
+                assert mirror.ejected_until > 0
+
+                # the trial after the cooldown fails, ejected again
+                await asyncio.sleep(0.1)
+                pool.refresh(session)
+                await pool._refresh
+                assert mirror.ejected_until > time.monotonic()
+                assert flaky.requests == 2
+
+                # nothing to try during the cooldown
+                pool.refresh(session)
+                assert pool._refresh.done()
+
+                flaky.fail_rate = 0.0
+                await asyncio.sleep(0.1)
+                pool.refresh(session)
+                await pool._refresh
+                assert mirror.available(time.monotonic())
+                assert mirror.error_rate == 0.0
+                assert all(m.available(time.monotonic()) for m in pool.ranked())
+
+    asyncio.run(main())
+
+
+def test_client_reprobes_and_fails_over():
+    async def main():
+        stations = synthetic_stations(10)
+        async with StandInServer(stations) as first, StandInServer(stations) as second:
+            async with RadioBrowser(mirrors=[first.url, second.url], mirror_pool=True) as rb:
+                await rb.init()
+                pool = rb.http.pool
+                pool.reprobe_interval = 0.05
+                pool.failure_threshold = 1
+
+                best = pool.best().url
+                other = second if best == first.url else first
+                (first if best == first.url else second).delay = 0.1
+                await asyncio.sleep(0.05)
+                await rb.tags()
+                await pool._refresh
+                assert pool.best().url == other.url
+
+                other.fail_rate = 1.0
+                for _ in range(3):
+                    try:
+                        await rb.tags()
+                    except aiohttp.ClientError:
+                        pass
+                assert pool.best().url == best
+
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from aioradios import DecodePool, RadioBrowser, Station
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_compressed_dump_is_decompressed_in_pool(mode):
+    async def main():
+        stations = synthetic_stations(300)
+        async with StandInServer(stations, compress=True) as server:
+            pool = DecodePool(mode, threshold=16 * 1024)
+            async with RadioBrowser(mirrors=server.url, offload=pool, typed=True) as rb:
+                result = await rb.stations()
+                assert pool.offloaded == 1
+                assert all(isinstance(station, Station) for station in result)
+                assert {station.stationuuid for station in result} == {s["stationuuid"] for s in stations}
+                transfer = rb.http.transfer
+                assert transfer['wire_bytes'] < transfer['decoded_bytes']
+
+    asyncio.run(main())
+
+
+def test_wants_scales_compressed_bodies():
+    pool = DecodePool(threshold=800)
+    assert not pool.wants(b"x" * 200)
+    assert pool.wants(b"x" * 200, "gzip")
+    assert not pool.wants(b"x" * 200, "identity")
@@ -0,0 +1,82 @@
+import asyncio
+
+from aioradios import StreamProber
+from aioradios.prober import classify
+
+from benchmarks.streams import MP3_FRAME, StreamServer
+
+
+def test_classify():
+    assert classify(200, 'audio/mpeg', MP3_FRAME) == 'audio'
+    assert classify(200, '', MP3_FRAME) == 'audio'
+    assert classify(200, 'application/octet-stream', b'OggS\x00') == 'audio'
+    assert classify(200, 'text/plain', b'#EXTM3U\n#EXT-X-VERSION:3\n') == 'hls'
+    assert classify(200, 'text/plain', b'#EXTM3U\n#EXTINF:-1,Radio\nhttp://a/b\n') == 'playlist'
+    assert classify(200, 'audio/x-scpls', b'[playlist]') == 'playlist'
+    assert classify(200, 'text/html', b'<!DOCTYPE html>') == 'html'
+    assert classify(404, 'audio/mpeg', b'') == 'error'
+
+
+def test_probe_kinds():
+    async def main():
+        async with StreamServer() as server, StreamProber(timeout=0.5) as prober:
+            kinds = ("audio", "icy", "hls", "playlist", "html", "missing", "slow", "redirect")
+            results = dict(zip(kinds, await asyncio.gather(*(prober.probe(f"{server.url}/{kind}/1") for kind in kinds))))
+
+            audio = results["audio"]
+            assert (audio.kind, audio.ok, audio.status) == ("audio", True, 200)
+            assert audio.icy["icy-name"] == "Stand-in 1"
+            assert audio.bitrate == 128
+
+            assert results["icy"].kind == "audio" and results["icy"].ok
+            assert results["hls"].kind == "hls" and results["hls"].ok
+            assert results["playlist"].kind == "playlist" and results["playlist"].ok
+            assert results["html"].kind == "html" and not results["html"].ok
+            assert (results["missing"].kind, results["missing"].status) == ("error", 404)
+            assert (results["slow"].kind, results["slow"].error) == ("error", "timeout")
+
+            redirect = results["redirect"]
+            assert redirect.kind == "audio" and redirect.ok
+            assert redirect.final_url == f"{server.url}/audio/1"
+
+    asyncio.run(main())
+
+
+def test_results_are_cached_and_shared():
+    async def main():
+        async with StreamServer() as server, StreamProber(failure_ttl=0) as prober:
+            stations = [{"url": f"{server.url}/hls/1"}, {"url_resolved": f"{server.url}/hls/1"},
+                        {"url": f"{server.url}/missing/2"}, {"name": "no url"}]
+            results = await prober.probe_stations(stations)
+            assert [result and result.kind for result in results] == ["hls", "hls", "error", None]
+            assert server.requests == 2
+
+            healthy = await prober.healthy(stations)
+            assert healthy == stations[:2]
+            # the failure expired at once, the success came from the cache
+            assert server.requests == 3
+            assert prober.hits == 1
+
+    asyncio.run(main())
+
+
+def test_per_host_limit():
+    async def main():
+        server = StreamServer(delay=0.05)
+        handle, active, peak = server.handle, 0, 0
+
+        async def counting(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                return await handle(request)
+            finally:
+                active -= 1
+
+        server.handle = counting
+        async with server, StreamProber(per_host=2) as prober:
+            await prober.probe_stations([{"url": f"{server.url}/hls/{n}"} for n in range(8)])
+        return peak
+
+    assert asyncio.run(main()) == 2
@@ -0,0 +1,158 @@
+import asyncio
+import random
+import time
+from email.utils import formatdate
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from aioradios import Metrics, RadioBrowser, RetryPolicy
+from aioradios.retry import is_retryable, retry_after
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+class ThrottledServer(StandInServer):
+    """
+    Answers the first `throttled` requests with a 429 and a Retry-After header.
+    """
+
+    throttled = 1
+    retry_after = '0.2'
+
+    async def _handle(self, request):
+        if self.throttled:
+            self.throttled -= 1
+            self.requests += 1
+            raise web.HTTPTooManyRequests(headers={'Retry-After': self.retry_after})
+        return await super()._handle(request)
+
+
+def _response_error(status, retry_after=None):
+    headers = {'Retry-After': retry_after} if retry_after is not None else {}
+    return aiohttp.ClientResponseError(None, (), status=status, headers=headers)
+
+
+def test_backoff_grows_with_jitter_up_to_the_cap():
+    random.seed(1)
+    retry = RetryPolicy(backoff=0.1, max_backoff=0.3)
+    for attempt, bound in enumerate((0.1, 0.2, 0.3, 0.3)):
+        delays = [retry.delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        assert max(delays) > bound * 0.8
+
+
+def test_retryable_errors():
+    assert is_retryable(_response_error(503))
+    assert is_retryable(_response_error(429))
+    assert not is_retryable(_response_error(404))
+    assert is_retryable(asyncio.TimeoutError())
+    assert is_retryable(aiohttp.ClientConnectionError())
+    assert not is_retryable(ValueError())
+
+
+def test_retry_after_seconds_and_dates():
+    assert retry_after(_response_error(429, '3')) == 3.0
+    assert retry_after(_response_error(503, '-1')) == 0.0
+    assert 55 < retry_after(_response_error(503, formatdate(time.time() + 60, usegmt=True))) <= 60
+    assert retry_after(_response_error(429, 'soon')) is None
+    assert retry_after(_response_error(429)) is None
+    # only throttling responses carry it
+    assert retry_after(_response_error(500, '3')) is None
+
+    retry = RetryPolicy(backoff=0.001, max_retry_after=5.0)
+    assert retry.delay(0, _response_error(429, '2')) == 2.0
+    assert retry.delay(0, _response_error(429, '600')) == 5.0
+
+
+def test_failed_request_moves_to_another_mirror():
+    stations = synthetic_stations(10)
+
+    async def main():
+        async with StandInServer(stations, fail_rate=1.0) as dead, StandInServer(stations) as good:
+            retry = RetryPolicy(retries=2, backoff=0.01)
+            async with RadioBrowser(mirrors=[dead.url, good.url], retry=retry) as rb:
+                await rb.init()
+                tags = await rb.http.request('tags', route=dead.url)
+            return tags, dead.requests, good.requests
+
+    tags, dead_requests, good_requests = asyncio.run(main())
+    assert tags
+    assert dead_requests == 1 and good_requests >= 1
+
+
+def test_gives_up_after_the_retries():
+    async def main():
+        async with StandInServer(synthetic_stations(10), fail_rate=1.0) as server:
+            retry = RetryPolicy(retries=2, backoff=0.01)
+            async with RadioBrowser(mirrors=server.url, retry=retry) as rb:
+                await rb.init()
+                with pytest.raises(aiohttp.ClientResponseError) as raised:
+                    await rb.http.request('tags')
+                assert raised.value.status == 503
+            return server.requests
+
+    assert asyncio.run(main()) == 3
+
+
+def test_waits_as_long_as_retry_after_asks():
+    async def main():
+        async with ThrottledServer(synthetic_stations(10)) as server:
+            retry = RetryPolicy(retries=1, backoff=0.001)
+            async with RadioBrowser(mirrors=server.url, retry=retry) as rb:
+                await rb.init()
+                start = time.perf_counter()
+                tags = await rb.http.request('tags')
+                return tags, time.perf_counter() - start, server.requests
+
+    tags, elapsed, requests = asyncio.run(main())
+    assert tags
+    assert requests == 2
+    assert elapsed >= 0.2
+
+
+def test_hedge_wins_and_slow_request_is_cancelled():
+    stations = synthetic_stations(10)
+
+    async def main():
+        metrics = Metrics()
+        ended = []
+        metrics.on_request_end.append(ended.append)
+        async with StandInServer(stations, delay=1.0) as slow, StandInServer(stations) as fast:
+            retry = RetryPolicy(hedge_percentile=0.5, min_samples=1)
+            async with RadioBrowser(mirrors=[slow.url, fast.url], retry=retry, metrics=metrics) as rb:
+                await rb.init()
+                ended.clear()
+                retry.record('tags', 0.02)
+                start = time.perf_counter()
+                tags = await rb.http.request('tags', route=slow.url)
+                elapsed = time.perf_counter() - start
+                # give the cancelled loser a moment to end
+                await asyncio.sleep(0.05)
+            return tags, elapsed, retry, ended, slow.url, fast.url
+
+    tags, elapsed, retry, ended, slow_url, fast_url = asyncio.run(main())
+    assert tags
+    assert elapsed < 0.5
+    assert retry.hedged == 1 and retry.hedges_won == 1
+    errors = {info['mirror']: info['error'] for info in ended}
+    assert errors[fast_url] is None
+    assert isinstance(errors[slow_url], asyncio.CancelledError)
+
+
+def test_fast_first_answer_is_not_hedged():
+    async def main():
+        stations = synthetic_stations(10)
+        async with StandInServer(stations) as first, StandInServer(stations) as second:
+            retry = RetryPolicy(hedge_percentile=0.5, min_samples=1)
+            async with RadioBrowser(mirrors=[first.url, second.url], retry=retry) as rb:
+                await rb.init()
+                retry.record('tags', 0.5)
+                await rb.http.request('tags', route=first.url)
+            return retry, second.requests
+
+    retry, second_requests = asyncio.run(main())
+    assert retry.hedged == 0 and retry.hedges_won == 0
+    assert second_requests == 0
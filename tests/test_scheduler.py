@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from aioradios import RadioBrowser, Scheduler
+from aioradios.scheduler import BACKGROUND, INTERACTIVE, NORMAL, TokenBucket
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+def test_priority_for():
+    scheduler = Scheduler()
+    assert scheduler.priority_for('stations/search') == INTERACTIVE
+    assert scheduler.priority_for('vote/abc') == INTERACTIVE
+    assert scheduler.priority_for('stations/') == BACKGROUND
+    assert scheduler.priority_for('tags/jazz') == NORMAL
+
+
+def test_waiters_run_by_priority():
+    async def main():
+        scheduler = Scheduler(concurrency=1)
+        order = []
+
+        async def request(name, priority):
+            async with scheduler.slot('mirror', priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        first = asyncio.ensure_future(request('first', BACKGROUND))
+        await asyncio.sleep(0)
+        waiting = [asyncio.ensure_future(request(name, priority))
+                   for name, priority in (('crawl', BACKGROUND), ('tags', NORMAL), ('search', INTERACTIVE))]
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(request('cancelled', INTERACTIVE))
+        await asyncio.sleep(0)
+        assert scheduler.stats()['queued'] == 4
+        cancelled.cancel()
+        await asyncio.gather(first, *waiting)
+
+        assert order == ['first', 'search', 'tags', 'crawl']
+        stats = scheduler.stats()
+        assert (stats['active'], stats['queued']) == (0, 0)
+        assert stats['wait']['background']['count'] == 2
+        assert stats['wait']['interactive']['count'] == 1
+        assert stats['wait']['background']['max'] >= 0.03
+
+    asyncio.run(main())
+
+
+def test_token_bucket():
+    async def main():
+        bucket = TokenBucket(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # the burst goes at once, the other 4 at 50 per second
+    assert 0.07 <= asyncio.run(main()) < 0.3
+
+
+def test_rate_is_per_mirror():
+    async def main():
+        scheduler = Scheduler(rate=10, burst=1)
+        start = time.monotonic()
+        for route in ('a', 'b', 'c'):
+            async with scheduler.slot(route):
+                pass
+        fast = time.monotonic() - start
+        async with scheduler.slot('a'):
+            pass
+        return fast, time.monotonic() - start - fast
+
+    fast, again = asyncio.run(main())
+    assert fast < 0.05 and again >= 0.05
+
+
+def test_votes():
+    async def main():
+        async with StandInServer(synthetic_stations(5), fail_rate=1.0) as server:
+            scheduler = Scheduler()
+            async with RadioBrowser(mirrors=server.url, scheduler=scheduler) as rb:
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await rb.vote_for_station('abc')
+
+                # the failed vote did not count
+                server.fail_rate = 0.0
+                assert (await rb.vote_for_station('abc'))['ok']
+                assert (await rb.vote_for_station('other'))['ok']
+
+                refused = await rb.vote_for_station('abc')
+                assert not refused['ok'] and 'too often' in refused['message']
+                assert server.requests == 3
+                assert scheduler.stats()['dropped_votes'] == 1
+
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+import asyncio
+import random
+from urllib.parse import quote
+
+from aioradios import RadioBrowser
+from aioradios.client import MAX_UUID_QUERY
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+class RecordingServer(StandInServer):
+    """
+    Keeps the uuids param of every byuuid request and the most requests at once.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = []
+        self.active = self.most_active = 0
+
+    async def _handle(self, request):
+        if request.match_info["path"].strip("/") != "stations/byuuid":
+            return await super()._handle(request)
+        self.lookups.append(request.query["uuids"])
+        self.active += 1
+        self.most_active = max(self.most_active, self.active)
+        try:
+            await asyncio.sleep(0.005)
+            return await super()._handle(request)
+        finally:
+            self.active -= 1
+
+
+def test_chunks_and_keeps_order():
+    stations = synthetic_stations(3000)
+    rnd = random.Random(3)
+    wanted = [station['stationuuid'] for station in rnd.sample(stations, 2000)]
+    known = {uuid: {'stationuuid': uuid, 'name': 'known'} for uuid in wanted[:50]}
+    unknown = ['00000000-0000-0000-0000-000000000000', 'not-a-uuid']
+    uuids = wanted + unknown + rnd.sample(wanted, 300)
+    rnd.shuffle(uuids)
+
+    async def main():
+        async with RecordingServer(stations) as server:
+            async with RadioBrowser(mirrors=server.url) as rb:
+                found = await rb.search_by_uuids(uuids, known=known, concurrency=3)
+            return found, server
+
+    found, server = asyncio.run(main())
+
+    # first occurrences, in order, without the unknown ones
+    assert list(found) == [uuid for uuid in dict.fromkeys(uuids) if uuid not in unknown]
+    assert all(found[uuid]['stationuuid'] == uuid for uuid in found)
+    assert all(found[uuid]['name'] == 'known' for uuid in known)
+
+    assert len(server.lookups) > 1
+    assert all(len(quote(lookup, safe='')) <= MAX_UUID_QUERY for lookup in server.lookups)
+    requested = [uuid for lookup in server.lookups for uuid in lookup.split(',')]
+    # every missing uuid once, none of the known ones
+    assert sorted(requested) == sorted(set(wanted[50:]) | set(unknown))
+    assert server.most_active <= 3
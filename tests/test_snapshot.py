@@ -0,0 +1,46 @@
+import itertools
+
+from aioradios.index import StationIndex
+from aioradios.snapshot import StationSnapshot, write_snapshot
+
+from benchmarks.fixtures import synthetic_stations
+
+ORDERS = ('name', 'votes', 'bitrate', 'clickcount', 'codec', 'country', 'language', 'lastcheckok', 'clicktrend')
+FILTERS = (
+    {},
+    {'countrycode': 'de'},
+    {'codec': 'AAC'},
+    {'tag': 'rock'},
+    {'tag': 'jazz', 'tag_exact': 'true'},
+    {'tag_list': 'pop,hits'},
+    {'name': 'radio'},
+    {'country': 'united'},
+    {'language': 'german', 'language_exact': 'true'},
+    {'bitrate_min': 128, 'bitrate_max': 256},
+    {'hidebroken': 'true', 'countrycode': 'FR'},
+)
+PAGES = ({}, {'offset': 7, 'limit': 15})
+
+
+def _fixture():
+    stations = synthetic_stations(600)
+    # ties on the name and stations without a codec
+    for station in stations[::50]:
+        station['name'] = 'Radio Tie'
+    for station in stations[::70]:
+        station['codec'] = None
+    return stations
+
+
+def test_search_matches_index(tmp_path):
+    stations = _fixture()
+    path = str(tmp_path / "stations.db")
+    write_snapshot(path, stations)
+    index = StationIndex(stations)
+
+    with StationSnapshot(path) as snapshot:
+        for order, reverse, filters, page in itertools.product(ORDERS, (False, True), FILTERS, PAGES):
+            params = dict(filters, order=order, reverse=str(reverse).lower(), **page)
+            expected = [station['stationuuid'] for station in index.search(**params)]
+            found = [station['stationuuid'] for station in snapshot.search(**params)]
+            assert found == expected, params
@@ -0,0 +1,64 @@
+import pickle
+
+import pytest
+
+from aioradios import Station
+from aioradios.station import format_time, parse_time
+
+from benchmarks.fixtures import synthetic_stations
+
+
+def test_round_trip():
+    for data in synthetic_stations(20):
+        station = Station.from_dict(data)
+        expected = {key: value for key, value in data.items() if value is not None}
+        assert station.to_dict() == expected
+        assert pickle.loads(pickle.dumps(station)) == station
+        assert station == Station(**data)
+
+
+def test_fields_are_converted():
+    station = Station(stationuuid='a', name='A', votes='12', hls='true', tags='jazz, smooth,', country='Germany',
+                      lastchangetime='2022-05-10 12:38:08', lastchangetime_iso8601='2022-05-10T12:38:08Z',
+                      clicktimestamp='2022-05-10 15:09:37', clicktimestamp_iso8601='2022-05-10T15:09:38Z',
+                      unknown=1)
+    assert (station.votes, station.hls, station.tags) == (12, 1, ('jazz', 'smooth'))
+    assert station['country'] is Station(country='Germany').country
+    assert station.extra == {'unknown': 1}
+    assert station.get('state', '') == ''
+    with pytest.raises(AttributeError):
+        station.name = 'B'
+
+    assert station.lastchangetime == '2022-05-10 12:38:08'
+    assert station['lastchangetime_iso8601'] == '2022-05-10T12:38:08Z'
+    # held once for both twins
+    assert station._lastchangetime is station._lastchangetime_iso8601
+    assert station.clicktimestamp_iso8601 == '2022-05-10T15:09:38Z'
+    assert station.lastchecktime is None
+
+
+def test_pickle_keeps_the_converted_values(monkeypatch):
+    stations = [Station.from_dict(data) for data in synthetic_stations(5)]
+    body = pickle.dumps(stations)
+
+    def rebuilt(self, fields):
+        raise AssertionError("converted again")
+
+    monkeypatch.setattr(Station, '_fill', rebuilt)
+    loaded = pickle.loads(body)
+    assert loaded == stations
+    assert loaded[0].country is stations[0].country
+    assert loaded[0]._lastchangetime is loaded[0]._lastchangetime_iso8601
+    assert loaded[0].tags == stations[0].tags
+
+
+@pytest.mark.parametrize('value', ['2022-02-30 10:00:00', '2022-05-10 24:00:00', '2022-05-10', '', 'never'])
+def test_unexpected_timestamps_are_kept(value):
+    assert parse_time(value) == value
+    assert Station(lastchecktime=value).lastchecktime == value
+
+
+def test_time_format():
+    assert parse_time('1970-01-02 00:00:01') == 86401
+    assert format_time(86401) == '1970-01-02 00:00:01'
+    assert format_time(86401, iso=True) == '1970-01-02T00:00:01Z'
@@ -0,0 +1,75 @@
+import json
+from xml.etree.ElementTree import ParseError
+
+import pytest
+
+from aioradios.decoders import decode_xml
+from aioradios.stream import JSONArrayParser, XMLListParser
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import _xml
+
+ITEMS = [
+    {"name": "Radio \"Quote\" \\ Backslash", "tags": "rock,pop", "votes": 12},
+    {"name": "Ünïcödé ラジオ 🎵", "bitrate": 128, "nested": {"a": [1, 2, {"b": None}], "c": "]},["}},
+    "a string, with ] and [",
+    -12.5e3,
+    True,
+    None,
+    [],
+    {"escape": "é\n\t "},
+]
+
+
+def _feed(parser, body: bytes, size: int):
+    items = []
+    for start in range(0, len(body), size):
+        items.extend(parser.feed(body[start:start + size]))
+    return items + parser.close()
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 100000])
+def test_json_any_chunk_split(size):
+    body = json.dumps(ITEMS, ensure_ascii=False).encode()
+    assert _feed(JSONArrayParser(), body, size) == ITEMS
+
+
+def test_json_items_as_soon_as_complete():
+    parser = JSONArrayParser()
+    assert parser.feed(b' [ {"name": "a"}, {"na') == [{'name': 'a'}]
+    assert parser.feed(b'me": "b"}, 12') == [{'name': 'b'}]
+    # the number might go on
+    assert parser.feed(b'3') == []
+    assert parser.feed(b', "\xc3') == [123]
+    assert parser.feed(b'\xa9"]') == ['é']
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize('body', [b'{"a": 1}', b'[{"a": 1}, ', b'[1, {bad}]', b'[1, 2', b''])
+def test_json_malformed(body):
+    parser = JSONArrayParser()
+    with pytest.raises(ValueError):
+        parser.feed(body)
+        parser.close()
+
+
+@pytest.mark.parametrize('size', [1, 5, 4096])
+def test_xml_any_chunk_split(size):
+    stations = synthetic_stations(20)
+    stations[0]['name'] = 'Ünïcödé & <ラジオ> "🎵"'
+    body = _xml('station', stations).encode()
+    assert _feed(XMLListParser(), body, size) == decode_xml(body)
+
+
+def test_xml_malformed():
+    parser = XMLListParser()
+    with pytest.raises(ParseError):
+        parser.feed(b'<result><station name="a"/><station name=b/></result>')
+        parser.close()
+
+
+def test_xml_truncated():
+    parser = XMLListParser()
+    assert parser.feed(b'<result><station name="a"/><sta') == [{'name': 'a'}]
+    with pytest.raises(ParseError):
+        parser.close()
@@ -0,0 +1,82 @@
+import asyncio
+
+from aioradios import AdaptiveTimeouts, RadioBrowser, RetryPolicy
+
+from benchmarks.fixtures import synthetic_stations
+from benchmarks.server import StandInServer
+
+
+def test_limit_follows_latencies():
+    timeouts = AdaptiveTimeouts(percentile=0.5, multiplier=2.0, min_timeout=0.01, min_samples=3, initial=5.0)
+    assert timeouts.timeout_for('tags') == 5.0
+    for latency in (0.1, 0.2, 0.3):
+        timeouts.record('tags', latency)
+    assert timeouts.timeout_for('tags') == 0.4
+    assert timeouts.timeout_for('codecs') == 5.0
+
+
+def test_timeouts_are_censored_samples():
+    timeouts = AdaptiveTimeouts(min_timeout=0.01, min_samples=5)
+    for _ in range(20):
+        timeouts.record('tags', 0.02)
+    limit = timeouts.timeout_for('tags')
+    timeouts.timed_out('tags', limit)
+    assert timeouts.timeouts == 1
+    assert timeouts.timeout_for('tags') > limit
+
+
+def test_recovers_when_endpoint_gets_slower():
+    async def main():
+        async with StandInServer(synthetic_stations(20), delay=0.02) as server:
+            timeouts = AdaptiveTimeouts(min_timeout=0.05, min_samples=5)
+            async with RadioBrowser(mirrors=server.url, adaptive_timeouts=timeouts) as rb:
+                for _ in range(10):
+                    await rb.tags()
+                assert timeouts.timeout_for('tags') < 0.3
+
+                # well beyond the limit, however noisy the first latencies were
+                server.delay = 0.3
+                ok = 0
+                for _ in range(10):
+                    try:
+                        await rb.tags()
+                        ok += 1
+                    except asyncio.TimeoutError:
+                        pass
+                assert timeouts.timeouts >= 1
+                assert ok >= 7
+                assert timeouts.timeout_for('tags') > 0.3
+
+    asyncio.run(main())
+
+
+def test_shares_latencies_with_hedging():
+    async def main():
+        async with StandInServer(synthetic_stations(20), delay=0.01) as server:
+            retry = RetryPolicy(hedge_percentile=0.9, min_samples=5)
+            timeouts = AdaptiveTimeouts(min_timeout=0.01, min_samples=5)
+            async with RadioBrowser(mirrors=server.url, retry=retry, adaptive_timeouts=timeouts) as rb:
+                for _ in range(8):
+                    await rb.tags()
+            assert timeouts.latencies is retry.latencies
+            # one sample per request, not one for each of the two
+            assert retry.latencies.count('tags') == 8
+            hedge = retry.hedge_delay('tags')
+            assert hedge is not None
+            assert timeouts.timeout_for('tags') >= hedge
+
+    asyncio.run(main())
+
+
+def test_generator_timeout_applies_per_item():
+    async def main():
+        async with StandInServer(synthetic_stations(30), delay=0.01) as server:
+            async with RadioBrowser(mirrors=server.url, timeout=0.5) as rb:
+                count = 0
+                async for _ in rb.iter_stations(page_size=10):
+                    # longer than the timeout in total, but not for any one item
+                    await asyncio.sleep(0.03)
+                    count += 1
+                assert count == 30
+
+    asyncio.run(main())